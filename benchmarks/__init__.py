@@ -0,0 +1 @@
+"""Benchmarks that measure the performance of the compiler and the robot movement without any hardware"""
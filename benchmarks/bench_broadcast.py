@@ -0,0 +1,192 @@
+"""
+Load test of the messages to the clients, runs a program that prints to the console and moves the TestRobot
+with many simulated clients: with every line broadcast on the execution thread, with every line sent through
+the broadcaster and with the lines batched by the console stream; reports the execution time
+and what the fast and the slow clients received
+
+run with: python -m benchmarks.bench_broadcast
+"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from flaskr.broadcaster import Broadcaster
+from flaskr.console import ConsoleStream
+from flaskr.compiler.blocks.block import walk_blocks
+from flaskr.compiler.context import Context
+from flaskr.compiler.interpreter import Interpreter
+from flaskr.compiler.loader import Loader
+from flaskr.robot_movement.test_robot import TestRobot
+from benchmarks.programs import ProgramBuilder
+from benchmarks.suite import NullConsole, NullSocket
+
+CLIENTS: int = 100
+# every tenth client is on a slow connection, e.g. a phone on a bad wifi
+SLOW_EVERY: int = 10
+FAST_RATE: float = 100000.0
+SLOW_RATE: float = 200.0
+# packets a connection buffers before a send blocks
+BUFFER: int = 256
+ITERATIONS: int = 2000
+
+
+class SimulatedClient:
+    """a connection that takes packets at a fixed rate, a send blocks while its buffer is full"""
+
+    def __init__(self, rate: float) -> None:
+        self.rate: float = rate
+        self.messages: int = 0
+        self.lines: int = 0
+        self.__fill: float = 0.0
+        self.__updated: float = time.perf_counter()
+
+    def backlog(self) -> int:
+        now: float = time.perf_counter()
+        self.__fill = max(0.0, self.__fill - (now - self.__updated) * self.rate)
+        self.__updated = now
+        return int(self.__fill)
+
+    def send(self, lines: int) -> None:
+        if self.backlog() >= BUFFER:
+            time.sleep((self.__fill - BUFFER + 1) / self.rate)
+            self.backlog()
+        self.__fill += 1
+        self.messages += 1
+        self.lines += lines
+
+
+class SimulatedSocket:
+    """
+    takes the place of the SocketIO, a message to a room or to everybody is sent to the clients one after another,
+    so a client with a full buffer blocks the sender
+    """
+
+    def __init__(self, clients: int) -> None:
+        self.clients: dict[str, SimulatedClient] = {
+            f"client-{i}": SimulatedClient(SLOW_RATE if i % SLOW_EVERY == 0 else FAST_RATE) for i in range(clients)
+        }
+        self.rooms: dict[str, set[str]] = {}
+        # the broadcaster manages the rooms through the server of the SocketIO
+        self.server: SimulatedSocket = self
+
+    def enter_room(self, sid: str, room: str, namespace: str = None) -> None:
+        self.rooms.setdefault(room, set()).add(sid)
+
+    def leave_room(self, sid: str, room: str, namespace: str = None) -> None:
+        self.rooms.get(room, set()).discard(sid)
+
+    def emit(self, event: str, data: dict, to: str = None, namespace: str = None, skip_sid: list[str] = None) -> None:
+        if to in self.clients:
+            receivers: list[str] = [to]
+        else:
+            receivers = [sid for sid in self.clients if to is None or sid in self.rooms.get(to, set())]
+        lines: int = len(data.get("lines", []))
+        for sid in receivers:
+            if not skip_sid or sid not in skip_sid:
+                self.clients[sid].send(lines)
+
+    def backlog(self, sid: str) -> int:
+        return self.clients[sid].backlog()
+
+
+class DirectConsole:
+    """sends every line as its own message, like the debug block did before there was the console stream"""
+
+    def __init__(self, socket) -> None:
+        self.__socket = socket
+        self.__next: int = 0
+
+    def write(self, line: str) -> None:
+        self.__socket.emit("console", {"stream": "direct", "first": self.__next, "lines": [line]})
+        self.__next += 1
+
+
+def printing_program() -> list[dict]:
+    """a loop that moves back and forth and prints the counter, every print is one emit on the execution thread"""
+    builder: ProgramBuilder = ProgramBuilder()
+    return [
+        builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(ITERATIONS), [
+            builder.move("x", builder.literal(-1)),
+            builder.move("x", builder.literal(1)),
+            builder.debug([builder.variable("i")]),
+        ])
+    ]
+
+
+def run(socket, console, position_path: str) -> float:
+    """
+    args:
+        socket: what the robot emits its position on
+        console: what the debug blocks write to
+        position_path (str): file in which the TestRobot stores its position
+    returns:
+        float: the execution time in seconds
+    """
+    for path in (position_path, os.path.splitext(position_path)[0] + ".journal"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader: Loader = Loader(printing_program())
+        robot: TestRobot = TestRobot(False, socket, position_path)
+        context: Context = Context(loader.variables, robot, None, console)
+        for block in walk_blocks(loader.blocks):
+            block.compile(context)
+
+        start: float = time.perf_counter()
+        Interpreter(loader.blocks, context).run()
+        context.flush_moves()
+        return time.perf_counter() - start
+
+
+def fewest(socket: SimulatedSocket, slow: bool, attribute: str) -> int:
+    """returns: int: the fewest messages or lines one of the fast or of the slow clients received"""
+    return min(getattr(client, attribute) for client in socket.clients.values() if (client.rate == SLOW_RATE) == slow)
+
+
+def report(setup: str, execution: float, socket: SimulatedSocket, dropped: int | str) -> None:
+    print(
+        f"{setup:>30} | {execution:>13.3f} | {fewest(socket, False, 'messages'):>13} | "
+        f"{fewest(socket, False, 'lines'):>10} | {fewest(socket, True, 'lines'):>10} | {dropped:>7}"
+    )
+
+
+def broadcaster_for(socket: SimulatedSocket) -> Broadcaster:
+    broadcaster: Broadcaster = Broadcaster(socket, socket.backlog)
+    for sid in socket.clients:
+        broadcaster.add_client(sid)
+    return broadcaster
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        position_path: str = os.path.join(directory, "position.json")
+        print(
+            f"{'setup':>30} | {'execution [s]':>13} | {'fast messages':>13} | {'fast lines':>10} | "
+            f"{'slow lines':>10} | {'dropped':>7}"
+        )
+        print(f"{'no clients':>30} | {run(NullSocket(), NullConsole(), position_path):>13.3f} |")
+
+        socket: SimulatedSocket = SimulatedSocket(CLIENTS)
+        report(f"{CLIENTS} clients, broadcast", run(socket, DirectConsole(socket), position_path), socket, "-")
+
+        socket = SimulatedSocket(CLIENTS)
+        broadcaster: Broadcaster = broadcaster_for(socket)
+        execution: float = run(broadcaster, DirectConsole(broadcaster), position_path)
+        # the fast clients get the rest of their messages after the program
+        time.sleep(0.5)
+        report(f"{CLIENTS} clients, broadcaster", execution, socket, broadcaster.stats["dropped"])
+
+        socket = SimulatedSocket(CLIENTS)
+        broadcaster = broadcaster_for(socket)
+        console: ConsoleStream = ConsoleStream(broadcaster, echo=False)
+        execution = run(broadcaster, console, position_path)
+        console.flush()
+        time.sleep(0.5)
+        report(f"{CLIENTS} clients, console stream", execution, socket, broadcaster.stats["dropped"])
+
+
+if __name__ == "__main__":
+    main()
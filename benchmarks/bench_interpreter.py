@@ -0,0 +1,134 @@
+"""
+Benchmark of the execution, compares how many blocks per second the interpreter with its own frame stack
+and a recursive execution manage, and how deeply the programs can be nested
+
+run with: python -m benchmarks.bench_interpreter
+"""
+import sys
+import time
+
+from flaskr.compiler.blocks.block import Block, walk_blocks
+from flaskr.compiler.blocks.loop_blocks import LoopBlock, LoopBreak
+from flaskr.compiler.dry_run import DryRunContext
+from flaskr.compiler.interpreter import Interpreter
+from flaskr.compiler.loader import Loader
+from flaskr.robot_movement.virtual_robot import VirtualRobot
+from benchmarks.programs import ProgramBuilder
+
+ITERATIONS: int = 20000
+DEPTHS: list[int] = [10, 100, 900, 5000]
+REPEAT: int = 5
+
+
+def loop_program(iterations: int) -> list[dict]:
+    """
+    a for loop with calculations and a condition inside, and a while loop that counts down and breaks
+    args:
+        iterations (int): number of iterations of each loop
+    returns:
+        list[dict]: the program
+    """
+    builder: ProgramBuilder = ProgramBuilder()
+    return [
+        builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(iterations), [
+            builder.calculation(builder.variable("sum"), builder.variable("sum"), "{", builder.variable("i")),
+            builder.condition(builder.variable("i"), ">", builder.literal(iterations // 2), [
+                builder.calculation(builder.variable("big"), builder.variable("big"), "{", builder.literal(1)),
+            ]),
+        ]),
+        builder.calculation(builder.variable("n"), builder.literal(iterations), "{", builder.literal(0)),
+        builder.while_loop([
+            builder.calculation(builder.variable("n"), builder.variable("n"), "}", builder.literal(1)),
+            builder.condition(builder.variable("n"), "==", builder.literal(0), [builder.breaks()]),
+        ]),
+    ]
+
+
+def nested_program(depth: int) -> list[dict]:
+    """
+    conditions nested into each other, with a calculation in the innermost one
+    args:
+        depth (int): number of nested conditions
+    returns:
+        list[dict]: the program
+    """
+    builder: ProgramBuilder = ProgramBuilder()
+    block: dict = builder.calculation(builder.variable("a"), builder.variable("a"), "{", builder.literal(1))
+    for _ in range(depth):
+        block = builder.condition(builder.literal(0), "==", builder.literal(0), [block])
+    return [block]
+
+
+def execute_blocks(blocks: list[Block], context: DryRunContext) -> None:
+    """
+    the reference for the interpreter: it follows Block.enter and Block.repeat like the interpreter,
+    but every level of the program is one Python call, like the execution before the interpreter
+    """
+    for block in blocks:
+        context.checkpoint()
+        try:
+            entered: list[Block] | None = block.enter(context)
+            while entered is not None:
+                execute_blocks(entered, context)
+                entered = block.repeat(context)
+        except LoopBreak:
+            if not isinstance(block, LoopBlock):
+                raise
+
+
+def execute_recursive(loader: Loader, context: DryRunContext) -> None:
+    execute_blocks(loader.blocks, context)
+
+
+def execute_interpreter(loader: Loader, context: DryRunContext) -> None:
+    Interpreter(loader.blocks, context).run()
+
+
+def measure(program: list[dict], execute) -> tuple[float, int]:
+    """
+    executes the program a few times
+    args:
+        program (list[dict]): the program
+        execute (Callable[[Loader, DryRunContext], None]): the kind of execution
+    returns:
+        tuple[float, int]: best time in seconds and the number of executed blocks
+    """
+    loader: Loader = Loader(program)
+    best: float = float("inf")
+    blocks: int = 0
+    for _ in range(REPEAT):
+        loader.reset()
+        context: DryRunContext = DryRunContext(loader, VirtualRobot(), sys.maxsize)
+        for block in walk_blocks(loader.blocks):
+            block.compile(context)
+
+        start: float = time.perf_counter()
+        execute(loader, context)
+        best = min(best, time.perf_counter() - start)
+        blocks = context.executed_blocks
+    return best, blocks
+
+
+def main() -> None:
+    program: list[dict] = loop_program(ITERATIONS)
+    print(f"{'engine':>12} | {'blocks':>8} | {'time [ms]':>9} | {'blocks/s':>10}")
+    for name, execute in (("recursive", execute_recursive), ("interpreter", execute_interpreter)):
+        best, blocks = measure(program, execute)
+        print(f"{name:>12} | {blocks:>8} | {best * 1000:>9.1f} | {blocks / best:>10,.0f}")
+
+    print()
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    print(f"{'depth':>6} | {'recursive':>16} | {'interpreter':>16}")
+    for depth in DEPTHS:
+        results: list[str] = []
+        for execute in (execute_recursive, execute_interpreter):
+            try:
+                best, _ = measure(nested_program(depth), execute)
+                results.append(f"{best * 1e6:.0f} us")
+            except RecursionError:
+                results.append("RecursionError")
+        print(f"{depth:>6} | {results[0]:>16} | {results[1]:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark for loading programs, reports how many blocks per second the loader creates
+
+run with: python -m benchmarks.bench_loader
+"""
+import time
+
+from flaskr.compiler.loader import Loader
+from benchmarks.programs import mixed_program
+
+NODES: int = 10000
+REPEAT: int = 5
+
+
+def count_nodes(raw_blocks: list[dict]) -> int:
+    """counts all blocks of a program, including the children"""
+    count: int = 0
+    stack: list[dict] = list(raw_blocks)
+    while stack:
+        raw_block: dict = stack.pop()
+        count += 1
+        stack.extend(raw_block["children"])
+    return count
+
+
+def main() -> None:
+    program: list[dict] = mixed_program(NODES)
+    nodes: int = count_nodes(program)
+
+    best: float = float("inf")
+    for _ in range(REPEAT):
+        start: float = time.perf_counter()
+        Loader(program)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"nodes: {nodes}, load time: {best * 1000:.1f} ms, {nodes / best:,.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of the step timing of the motor controller on the GPIO emulator,
+reports the achieved steps per second, the percentiles of the step periods and pulse widths and the homing time,
+so a change of the motion code can be checked for timing regressions without a Raspberry Pi
+
+run with: python -m benchmarks.bench_motion
+"""
+import contextlib
+import io
+import math
+import time
+from typing import Callable
+
+from flaskr.robot_movement.gpio_emulator import GpioEmulator
+from flaskr.robot_movement.motion_profile import plan_move
+from flaskr.robot_movement.motor_controller import MotorController
+from flaskr.robot_movement.virtual_robot import VirtualRobot
+
+# distance of every axis from its endstop at the start of a scenario
+DISTANCES: dict[str, int] = {"X": 40000, "Y": 40000, "Z": 40000}
+
+
+def step_motor(controller: MotorController) -> dict[str, int]:
+    """one axis, long enough to reach the maximum speed"""
+    controller.step_motor(20000, "X", MotorController.DIR_BACK)
+    return {"X": 20000}
+
+
+def multi_axis_move(controller: MotorController) -> dict[str, int]:
+    """all axes at the same time, the shorter axes get their pulses in between those of the longest"""
+    moves: dict[str, int] = {"X": 20000, "Y": 10000, "Z": 5000}
+    controller.move_axes({axis: (steps, MotorController.DIR_BACK) for axis, steps in moves.items()})
+    return moves
+
+
+def homing_one_axis(controller: MotorController) -> dict[str, int]:
+    controller.drive_all_to_endstops(["X"])
+    return {}
+
+
+def homing_all_axes(controller: MotorController) -> dict[str, int]:
+    controller.drive_all_to_endstops(["X", "Y", "Z"])
+    return {}
+
+
+SCENARIOS: dict[str, Callable[[MotorController], dict[str, int]]] = {
+    "step_motor": step_motor,
+    "multi_axis_move": multi_axis_move,
+    "homing_one_axis": homing_one_axis,
+    "homing_all_axes": homing_all_axes,
+}
+
+
+def planned_time(name: str, moves: dict[str, int]) -> float:
+    """
+    returns:
+        float: the time the scenario should take according to the motion profiles
+    """
+    if name == "homing_all_axes":
+        robot: VirtualRobot = VirtualRobot(*(-DISTANCES[axis] for axis in ("X", "Y", "Z")))
+        robot.reset_pos()
+        return robot.motion_time
+    if not moves:
+        return math.nan
+    periods, profile = plan_move(moves)
+    return profile.duration(periods)
+
+
+def run_scenario(name: str) -> dict:
+    """
+    runs one scenario on a fresh emulator
+    returns:
+        dict: the measured time, the planned time and the timing of the pulses of the X axis
+    """
+    emulator: GpioEmulator = GpioEmulator(DISTANCES)
+    controller: MotorController = MotorController(emulator)
+
+    start: float = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        moves: dict[str, int] = SCENARIOS[name](controller)
+    elapsed: float = time.perf_counter() - start
+
+    timing: dict = emulator.timing(controller.motors["X"]["PUL"])
+    return {
+        "time": elapsed,
+        "planned": planned_time(name, moves),
+        "steps_per_second": timing["pulses"] / elapsed,
+        **timing,
+    }
+
+
+def main() -> None:
+    print(
+        f"{'scenario':>16} | {'time [s]':>8} | {'planned [s]':>11} | {'X steps/s':>9} | "
+        f"{'period p50/p99 [us]':>19} | {'width p50/p99 [us]':>18}"
+    )
+    for name in SCENARIOS:
+        result: dict = run_scenario(name)
+        periods: str = f"{result['period_p50'] * 1e6:.1f}/{result['period_p99'] * 1e6:.1f}"
+        widths: str = f"{result['width_p50'] * 1e6:.1f}/{result['width_p99'] * 1e6:.1f}"
+        planned: str = "-" if math.isnan(result["planned"]) else f"{result['planned']:.3f}"
+        print(
+            f"{name:>16} | {result['time']:>8.3f} | {planned:>11} | {result['steps_per_second']:>9.0f} | "
+            f"{periods:>19} | {widths:>18}"
+        )
+
+
+if __name__ == "__main__":
+    main()
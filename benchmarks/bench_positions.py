@@ -0,0 +1,75 @@
+"""
+Benchmark of the position storage, measures how many moves per second the TestRobot manages
+when every move saves its position, with the JSON file that was rewritten on every save and with the journal
+
+run with: python -m benchmarks.bench_positions
+"""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Callable
+
+from flaskr.robot_movement.positions_manager import PositionManager
+from flaskr.robot_movement.test_robot import TestRobot
+from benchmarks.suite import NullSocket
+
+MOVES: int = 5000
+
+
+class RewritingPositionManager(PositionManager):
+    """the storage like it was done before, the JSON file is rewritten on every save"""
+
+    def __init__(self, filepath: str) -> None:
+        self.path: str = filepath
+        super().__init__(filepath)
+
+    def save(self) -> None:
+        data = {"X": self.x, "Y": self.y, "Z": self.z}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+
+def measure(position_manager: PositionManager, position_path: str) -> float:
+    """
+    args:
+        position_manager (PositionManager): the storage the robot uses
+        position_path (str): the JSON file of the robot
+    returns:
+        float: moves per second
+    """
+    # the TestRobot prints every move
+    with contextlib.redirect_stdout(io.StringIO()):
+        robot: TestRobot = TestRobot(False, NullSocket(), position_path)
+        robot._position_manager.close()
+        robot._position_manager = position_manager
+
+        start: float = time.perf_counter()
+        for i in range(MOVES):
+            robot.move_on_axis("X", -1 if i % 2 == 0 else 1)
+        robot.sync_position()
+        elapsed: float = time.perf_counter() - start
+    position_manager.close()
+    return MOVES / elapsed
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        position_path: str = os.path.join(directory, "position.json")
+        storages: dict[str, Callable[[], PositionManager]] = {
+            "rewrite JSON file": lambda: RewritingPositionManager(position_path),
+            "journal, sync every save": lambda: PositionManager(position_path, sync_interval=0),
+            f"journal, sync every {PositionManager.SYNC_INTERVAL} s": lambda: PositionManager(position_path),
+        }
+
+        print(f"{'storage':>28} | {'moves/s':>10}")
+        for name, create in storages.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                position_manager: PositionManager = create()
+            print(f"{name:>28} | {measure(position_manager, position_path):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Microbenchmark for the variable access,
+shows that the cost of an access stays the same no matter how many variables a program has
+
+run with: python -m benchmarks.bench_variables
+"""
+import random
+import timeit
+
+from flaskr.compiler.blocks.variables import Variable, VariableTable
+
+PROGRAM_SIZES: list[int] = [10, 100, 1000, 10000]
+ACCESSES: int = 20000
+
+
+def linear_lookup(variables: list[Variable], name: str) -> Variable:
+    """the lookup like it was done before, by comparing the names one after another"""
+    for var in variables:
+        if var.name == name:
+            return var
+    return None
+
+
+def measure(size: int) -> tuple[float, float]:
+    """
+    measures the cost of one access with a table of the given size
+    args:
+        size (int): number of variables in the program
+    returns:
+        tuple[float, float]: nanoseconds per access of the linear search and of the slot table
+    """
+    # the same naming as run.js uses for literal inputs
+    names: list[str] = [f"var{1761750550405 + i}" for i in range(size)]
+    variables: list[Variable] = [Variable(name, i) for i, name in enumerate(names)]
+
+    table: VariableTable = VariableTable()
+    for var in variables:
+        table.add(var)
+
+    lookups: list[str] = random.Random(size).choices(names, k=ACCESSES)
+
+    linear: float = timeit.timeit(lambda: [linear_lookup(variables, name) for name in lookups], number=1)
+    slots: float = timeit.timeit(lambda: [table.get(name) for name in lookups], number=1)
+    return linear / ACCESSES * 1e9, slots / ACCESSES * 1e9
+
+
+def main() -> None:
+    print(f"{'variables':>10} | {'linear [ns]':>12} | {'slots [ns]':>10}")
+    for size in PROGRAM_SIZES:
+        linear, slots = measure(size)
+        print(f"{size:>10} | {linear:>12.1f} | {slots:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
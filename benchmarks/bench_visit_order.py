@@ -0,0 +1,38 @@
+"""
+Benchmark of the visit order planning, shows how long the planning takes for a growing number of positions
+and how much motion time the planned order saves compared to a random order
+
+run with: python -m benchmarks.bench_visit_order
+"""
+import random
+import time
+
+from flaskr.robot_movement.robot import Robot
+from flaskr.robot_movement.visit_order import plan_visit_order, path_time
+
+POSITION_COUNTS: list[int] = [10, 50, 100, 300, 500]
+
+
+def random_positions(count: int) -> list[tuple[int, int, int]]:
+    """positions spread evenly over the whole range of the robot"""
+    rnd: random.Random = random.Random(count)
+    return [
+        tuple(rnd.randint(*Robot.LIMITS[axis]) for axis in ("X", "Y", "Z"))
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    start: tuple[int, int, int] = (0, 0, 0)
+    print(f"{'positions':>10} | {'planning [ms]':>13} | {'given order [s]':>15} | {'planned [s]':>11}")
+    for count in POSITION_COUNTS:
+        positions: list[tuple[int, int, int]] = random_positions(count)
+        begin: float = time.perf_counter()
+        order: list[int] = plan_visit_order(start, positions)
+        planning: float = time.perf_counter() - begin
+        given: float = path_time(start, positions, list(range(count)))
+        print(f"{count:>10} | {planning * 1000:>13.1f} | {given:>15.1f} | {path_time(start, positions, order):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Builds synthetic programs in the same JSON shape as run.js produces them"""
+import itertools
+
+
+class ProgramBuilder:
+    """
+    creates the JSON of the single blocks, the ids and the names of the typed-in numbers
+    are generated like run.js does it (palette id or "var" plus a timestamp)
+    """
+
+    def __init__(self, timestamp: int = 1761750550405) -> None:
+        self.__counter: itertools.count = itertools.count(timestamp)
+
+    def __block(self, palette_id: str, block_type: str, text: str, variables: list[dict], children: list[dict]) -> dict:
+        return {
+            "id": f"{palette_id}-{next(self.__counter)}",
+            "type": block_type,
+            "text": text,
+            "variables": variables,
+            "children": children,
+        }
+
+    def literal(self, value: int) -> dict:
+        """a number typed directly into a slot"""
+        name: str = f"var{next(self.__counter)}"
+        return {"id": f"block-get-{name}-pos-{next(self.__counter)}", "text": name, "type": "block-variable", "value": str(value)}
+
+    def variable(self, name: str, value: int | None = 0) -> dict:
+        """a variable dragged from the palette, X, Y and Z have no value"""
+        return {
+            "id": f"block-get-{name}-pos-{next(self.__counter)}",
+            "text": name,
+            "type": "block-variable",
+            "value": None if value is None else str(value),
+        }
+
+    def move(self, axis: str, steps: dict) -> dict:
+        return self.__block("block-steps", "block-move", f"Go  steps on the  axis {axis}", [steps], [])
+
+    def go_to(self, name: str, x: dict, y: dict, z: dict) -> dict:
+        position: dict = self.__block("block-get-" + name + "-pos", "block-pos", name + ":", [x, y, z], [])
+        return self.__block("block-go-to-pos", "block-move", "Goto position:", [x, y, z], [position])
+
+    def reset(self) -> dict:
+        return self.__block("block-reset-pos", "block-move", "Reset position", [], [])
+
+    def for_loop(self, counter: dict, start: dict, stop: dict, children: list[dict]) -> dict:
+        return self.__block("block-for", "block-control", "for  range:  to", [counter, start, stop], children)
+
+    def while_loop(self, children: list[dict]) -> dict:
+        return self.__block("block-while", "block-control", "while true", [], children)
+
+    def condition(self, left: dict, operator: str, right: dict, children: list[dict]) -> dict:
+        return self.__block("block-condition", "block-control", f"if  {operator}", [left, right], children)
+
+    def visit(self, children: list[dict]) -> dict:
+        return self.__block("block-visit", "block-control", "visit in shortest order", [], children)
+
+    def breaks(self) -> dict:
+        return self.__block("block-break", "block-event", "Break", [], [])
+
+    def calculation(self, target: dict, left: dict, operator: str, right: dict) -> dict:
+        return self.__block("block-calculations", "block-calc", f"=  {operator}", [target, left, right], [])
+
+    def wait(self, seconds: dict) -> dict:
+        return self.__block("block-time-seconds", "block-time", "Wait  seconds", [seconds], [])
+
+    def debug(self, variables: list[dict]) -> dict:
+        return self.__block("block-debug-print", "block-debug", "print in console", variables, [])
+
+    def measure(self) -> dict:
+        return self.__block("block-measurement", "block-measure", "Measure", [], [])
+
+
+def mixed_program(nodes: int) -> list[dict]:
+    """
+    a flat sequence of small loops with calculations, conditions and moves
+    args:
+        nodes (int): approximate number of blocks in the program
+    returns:
+        list[dict]: the program
+    """
+    builder: ProgramBuilder = ProgramBuilder()
+    program: list[dict] = []
+    count: int = 0
+    while count < nodes:
+        program.append(builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(2), [
+            builder.calculation(builder.variable("sum"), builder.variable("sum"), "{", builder.variable("i")),
+            builder.condition(builder.variable("i"), "==", builder.literal(1), [
+                builder.move("x", builder.literal(-1)),
+                builder.breaks(),
+            ]),
+            builder.debug([builder.variable("sum")]),
+        ]))
+        count += 6
+    return program
@@ -0,0 +1,235 @@
+"""
+Benchmark suite of the interpreter, runs synthetic programs in the JSON shape of run.js against the TestRobot
+and reports load time, blocks per second and the memory high-water mark of every scenario.
+It needs neither GPIO nor a GoDirect device.
+
+The results are stored as JSON, so that two commits can be compared.
+
+run with: python -m benchmarks.suite [--output results.json] [--compare older_results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from flaskr.compiler.blocks.block import walk_blocks
+from flaskr.compiler.context import Context
+from flaskr.compiler.interpreter import Interpreter
+from flaskr.compiler.loader import Loader
+from flaskr.robot_movement.test_robot import TestRobot
+from benchmarks.programs import ProgramBuilder
+
+REPEAT: int = 3
+RESULTS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class NullSocket:
+    """takes the place of the SocketIO, the messages to the frontend are dropped"""
+
+    def emit(self, event: str, data: dict) -> None:
+        pass
+
+
+class NullConsole:
+    """takes the place of the console stream, the lines are dropped"""
+
+    def write(self, line: str) -> None:
+        pass
+
+
+class CountingContext(Context):
+    """context that counts the executed blocks, the checkpoint is called before every block and loop iteration"""
+
+    def __init__(self, loader: Loader, robot: TestRobot) -> None:
+        super().__init__(loader.variables, robot, None, NullConsole())
+        self.executed_blocks: int = 0
+
+    def checkpoint(self) -> None:
+        self.executed_blocks += 1
+        super().checkpoint()
+
+
+def deep_nesting(depth: int = 2000) -> list[dict]:
+    """conditions nested into each other, with a calculation in the innermost one"""
+    builder: ProgramBuilder = ProgramBuilder()
+    block: dict = builder.calculation(builder.variable("a"), builder.variable("a"), "{", builder.literal(1))
+    for _ in range(depth):
+        block = builder.condition(builder.literal(0), "==", builder.literal(0), [block])
+    return [block]
+
+
+def wide_for_sweep(iterations: int = 50000) -> list[dict]:
+    """one for loop over a wide range, its body consists of calculations"""
+    builder: ProgramBuilder = ProgramBuilder()
+    return [
+        builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(iterations), [
+            builder.calculation(builder.variable("sum"), builder.variable("sum"), "{", builder.variable("i")),
+            builder.calculation(builder.variable("square"), builder.variable("i"), "[", builder.variable("i")),
+            builder.calculation(builder.variable("rest"), builder.variable("square"), "mod", builder.literal(7)),
+            builder.calculation(builder.variable("sum"), builder.variable("sum"), "}", builder.variable("rest")),
+        ])
+    ]
+
+
+def many_variables(count: int = 5000) -> list[dict]:
+    """a flat program in which every calculation uses its own variables"""
+    builder: ProgramBuilder = ProgramBuilder()
+    return [
+        builder.calculation(builder.variable(f"v{i}"), builder.variable(f"w{i}", i), "{", builder.literal(i))
+        for i in range(count)
+    ]
+
+
+def many_moves(count: int = 2000) -> list[dict]:
+    """moves back and forth on all axes, the robot starts at 0, which is the upper limit"""
+    builder: ProgramBuilder = ProgramBuilder()
+    program: list[dict] = []
+    for i in range(count):
+        axis: str = "xyz"[i % 3]
+        program.append(builder.move(axis, builder.literal(-1 if (i // 3) % 2 == 0 else 1)))
+    return program
+
+
+SCENARIOS: dict[str, Callable[[], list[dict]]] = {
+    "deep_nesting": deep_nesting,
+    "wide_for_sweep": wide_for_sweep,
+    "many_variables": many_variables,
+    "many_moves": many_moves,
+}
+
+
+def run_once(program: list[dict], position_path: str) -> tuple[float, float, int]:
+    """
+    loads and executes the program one time
+    args:
+        program (list[dict]): the program
+        position_path (str): file in which the TestRobot stores its position
+    returns:
+        tuple[float, float, int]: load time and execution time in seconds, number of executed blocks
+    """
+    # the robot starts at 0, the journal next to the position file would restore the position of the last run
+    for path in (position_path, os.path.splitext(position_path)[0] + ".journal"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    start: float = time.perf_counter()
+    loader: Loader = Loader(program)
+    load_time: float = time.perf_counter() - start
+
+    robot: TestRobot = TestRobot(False, NullSocket(), position_path)
+    context: CountingContext = CountingContext(loader, robot)
+    for block in walk_blocks(loader.blocks):
+        block.compile(context)
+
+    start = time.perf_counter()
+    Interpreter(loader.blocks, context).run()
+    context.flush_moves()
+    execution_time: float = time.perf_counter() - start
+    return load_time, execution_time, context.executed_blocks
+
+
+def run_scenario(program: list[dict], position_path: str) -> dict:
+    """
+    measures one scenario, the memory is traced in an own run, because tracing slows down the execution
+    args:
+        program (list[dict]): the program
+        position_path (str): file in which the TestRobot stores its position
+    returns:
+        dict: the results of the scenario
+    """
+    load_time: float = float("inf")
+    execution_time: float = float("inf")
+    blocks: int = 0
+    for _ in range(REPEAT):
+        load, execution, blocks = run_once(program, position_path)
+        load_time = min(load_time, load)
+        execution_time = min(execution_time, execution)
+
+    tracemalloc.start()
+    run_once(program, position_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "executed_blocks": blocks,
+        "load_time_ms": round(load_time * 1000, 3),
+        "execution_time_ms": round(execution_time * 1000, 3),
+        "blocks_per_second": round(blocks / execution_time),
+        "memory_peak_kb": round(peak / 1024, 1),
+    }
+
+
+def current_commit() -> str | None:
+    """returns the short hash of the checked out commit, None outside of a git repository"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, older: dict) -> None:
+    """prints the change of every scenario compared to older results"""
+    print(f"\ncompared to {older.get('commit')}:")
+    for name, scenario in results["scenarios"].items():
+        previous: dict | None = older.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        speed: float = scenario["blocks_per_second"] / previous["blocks_per_second"] - 1
+        memory: float = scenario["memory_peak_kb"] / previous["memory_peak_kb"] - 1
+        print(f"{name:>16} | blocks/s {speed:+7.1%} | memory {memory:+7.1%}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help="file for the results, default: benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    args: argparse.Namespace = parser.parse_args()
+
+    results: dict = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':>16} | {'blocks':>8} | {'load [ms]':>9} | {'run [ms]':>9} | {'blocks/s':>10} | {'peak [KiB]':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        position_path: str = os.path.join(directory, "position.json")
+        for name, build in SCENARIOS.items():
+            program: list[dict] = build()
+            # the TestRobot and the interpreter print every move and variable, that is not part of the measurement
+            with contextlib.redirect_stdout(io.StringIO()):
+                scenario: dict = run_scenario(program, position_path)
+            results["scenarios"][name] = scenario
+            print(
+                f"{name:>16} | {scenario['executed_blocks']:>8} | {scenario['load_time_ms']:>9.1f} | "
+                f"{scenario['execution_time_ms']:>9.1f} | {scenario['blocks_per_second']:>10,} | "
+                f"{scenario['memory_peak_kb']:>10,.0f}"
+            )
+
+    # high-water mark of the whole process, in KiB on Linux
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    output: str = args.output or os.path.join(RESULTS_DIR, f"{results['commit'] or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nresults written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
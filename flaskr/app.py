@@ -1,18 +1,24 @@
 """This module provides the entry point for the entire program; everything comes together here."""
 
 import os
-import json
 import threading
 import markdown
 from flask import Flask, jsonify, render_template, request
 from flask_socketio import SocketIO
 from markupsafe import Markup
 
-from flaskr.compiler.blocks.block import Block
+from flaskr.compiler.blocks.block import MeasurementBlock, walk_blocks
 from flaskr.compiler.loader import Loader
 from flaskr.compiler.context import Context
+from flaskr.compiler.interpreter import Interpreter
+from flaskr.compiler.dry_run import DryRun
+from flaskr.compiler.program_cache import ProgramCache
 from flaskr.measurement import GoDirectDataCollector
-from flaskr.server_error import ErrorManager, ServerError, ExecutionStartedError, NoDeviceConnected
+from flaskr.server_error import ErrorManager, ServerError, NoDeviceConnected, ExecutionCancelledError, MalformedProgramError
+from flaskr.job_queue import Job, JobQueue
+from flaskr.jog import JogWorker
+from flaskr.broadcaster import Broadcaster
+from flaskr.console import ConsoleStream
 from flaskr.robot_movement.test_robot import TestRobot
 
 # Try to import real Robot (works only on Raspberry Pi with GPIO)
@@ -29,22 +35,29 @@ class App:
     Flask application, SocketIO, and robot execution logic.
     """
 
-    def __init__(self) -> None:
-        """Initializes the Flask app, SocketIO, robot, and application constants."""
+    def __init__(self, console_echo: bool = True) -> None:
+        """
+        Initializes the Flask app, SocketIO, robot, and application constants.
+
+        Args:
+            console_echo (bool): whether the console output of the programs is printed on the server as well
+        """
         self.__app: Flask = Flask(__name__)
         self.__app.config["SECRET_KEY"] = "sec,msdfgnß04835,mnvkmliouzh32409ß854309##.ret!"
         self.__socket_io: SocketIO = SocketIO(self.__app, async_mode="threading")
+        # everything that emits while a program runs goes through the broadcaster, so slow clients can not stall the robot
+        self.__broadcaster: Broadcaster = Broadcaster(self.__socket_io)
 
-        ErrorManager.init(self.__socket_io)
+        ErrorManager.init(self.__broadcaster)
 
         self.__base_dir: str = os.path.dirname(os.path.abspath(__file__))
         self.__position_path: str = os.path.join(self.__base_dir, "robot_movement", "position.json")
 
         # Robot initialization
         if GPIO_AVAILABLE:
-            self.__robot: Robot = Robot(GPIO_AVAILABLE, self.__socket_io, self.__position_path)
+            self.__robot: Robot = Robot(GPIO_AVAILABLE, self.__broadcaster, self.__position_path)
         else:
-            self.__robot: TestRobot = TestRobot(GPIO_AVAILABLE, self.__socket_io, self.__position_path)
+            self.__robot: TestRobot = TestRobot(GPIO_AVAILABLE, self.__broadcaster, self.__position_path)
 
         # Constants
         self.__axles: list[str] = ["x", "y", "z"]
@@ -57,9 +70,17 @@ class App:
         ]
         self.__if_operators: list[str] = ["==","<=",">=","<",">","!="]
         self.__clipboards: int = 3
-
-        self.__is_running: bool = False
-        self.__lock: threading.Lock = threading.Lock()
+        self.__console_echo: bool = console_echo
+
+        self.__program_cache: ProgramCache = ProgramCache()
+        # the output of the debug blocks, clients that connect during a program get its last lines
+        self.__console: ConsoleStream = ConsoleStream(self.__broadcaster, self.__console_echo)
+        # one worker executes the submitted programs one after another
+        self.__job_queue: JobQueue = JobQueue(self.__execute)
+        # the manual control moves the robot without a job, the lock keeps it apart from the programs
+        self.__motion_lock: threading.Lock = threading.Lock()
+        # the worker only answers the client that sent a jog command, so it emits directly
+        self.__jog_worker: JogWorker = JogWorker(self.__robot, self.__motion_lock, self.__socket_io)
 
         # Register routes and socket events
         self.__register_routes()
@@ -68,27 +89,9 @@ class App:
     def __register_routes(self) -> None:
         """Registers all Flask routes."""
 
-        @self.__app.route("/", methods=["GET", "POST"])
+        @self.__app.route("/")
         def start() -> str:
-            """Handles GET and POST requests to start block execution."""
-            with self.__lock:
-                if request.method == "POST":
-                    try:
-                        if not self.__is_running:
-                            self.__is_running = True
-                            command = request.get_json()
-
-                            json_path: str = os.path.join(self.__base_dir, "compiler", "from_server.json")
-                            with open(json_path, "w", encoding="utf-8") as file:
-                                file.write(json.dumps(command))
-
-                            thread = threading.Thread(target=self.__execute, args=(json_path,), daemon=True)
-                            thread.start()
-                        else:
-                            raise ExecutionStartedError("The program already started")
-                    except ServerError as e:
-                        ErrorManager.report(e)
-
+            """Renders the page, the programs are submitted to /jobs."""
             return render_template(
                 "index.html",
                 axles=self.__axles,
@@ -97,6 +100,85 @@ class App:
                 if_operators=self.__if_operators
             )
 
+        @self.__app.route("/jobs", methods=["POST"])
+        def submit_job():
+            """Queues a program, manual control jobs run before the other programs."""
+            data: dict = request.get_json()
+            if not isinstance(data, dict) or not isinstance(data.get("program"), list):
+                return jsonify({"error": "expected an object with a 'program' list"}), 400
+
+            priority: int = JobQueue.PRIORITY_MANUAL if data.get("priority") == "manual" else JobQueue.PRIORITY_PROGRAM
+            job: Job = self.__job_queue.submit(data["program"], priority)
+            return jsonify(job.to_dict()), 202
+
+        @self.__app.route("/jobs")
+        def list_jobs():
+            """Returns the status of all jobs that are known."""
+            return jsonify([job.to_dict() for job in self.__job_queue.jobs])
+
+        @self.__app.route("/jobs/<int:job_id>")
+        def get_job(job_id: int):
+            """Returns the status of one job."""
+            job: Job = self.__job_queue.get(job_id)
+            if job is None:
+                return jsonify({"error": "job not found"}), 404
+            return jsonify(job.to_dict())
+
+        @self.__app.route("/jobs/<int:job_id>", methods=["DELETE"])
+        def cancel_job(job_id: int):
+            """Cancels a job, a running job stops within milliseconds."""
+            job: Job = self.__job_queue.cancel(job_id)
+            if job is None:
+                return jsonify({"error": "job not found"}), 404
+            return jsonify(job.to_dict())
+
+        @self.__app.route("/jobs/<int:job_id>/pause", methods=["POST"])
+        def pause_job(job_id: int):
+            """Pauses a running job, it keeps its state."""
+            job: Job = self.__job_queue.pause(job_id)
+            if job is None:
+                return jsonify({"error": "job not found"}), 404
+            return jsonify(job.to_dict())
+
+        @self.__app.route("/jobs/<int:job_id>/resume", methods=["POST"])
+        def resume_job(job_id: int):
+            """Resumes a paused job."""
+            job: Job = self.__job_queue.resume(job_id)
+            if job is None:
+                return jsonify({"error": "job not found"}), 404
+            return jsonify(job.to_dict())
+
+        @self.__app.route("/dry-run", methods=["POST"])
+        def dry_run():
+            """Executes the program against a virtual robot and returns limit violations, steps and the estimated time."""
+            data: list = request.get_json(silent=True)
+            if not isinstance(data, list):
+                return jsonify({"error": "expected a 'program' list"}), 400
+
+            try:
+                try:
+                    key, loader = self.__program_cache.checkout(data)
+                except (KeyError, TypeError, AttributeError) as e:
+                    # e.g. a block without a type or id, the loader expects the blocks in the shape run.js sends them
+                    raise MalformedProgramError(f"The program is malformed ({e.__class__.__name__}: {e})") from e
+            except ServerError as e:
+                return jsonify({"error": {"error": e.message, "block_id": e.block_id, "error_code": e.error_code}}), 400
+
+            try:
+                return jsonify(DryRun(loader, self.__robot).run())
+            finally:
+                self.__program_cache.checkin(key, loader)
+
+        @self.__app.route("/metrics")
+        def metrics():
+            """Returns counters of the server, e.g. the hits and misses of the program cache and the sent position updates."""
+            return jsonify({
+                "program_cache": self.__program_cache.stats,
+                "telemetry": self.__robot.telemetry_stats,
+                "broadcast": self.__broadcaster.stats,
+                "console": self.__console.stats
+            })
+
         @self.__app.route("/info-md/<page>")
         def info_md_page(page: str):
             """Loads various Markdown files safely."""
@@ -127,21 +209,87 @@ class App:
         def handle_connect():
             """Handles new client connections and sends the current robot coordinates."""
             print("[DEBUG] New client connected")
+            self.__socket_io.emit("console", self.__console.replay(), to=request.sid)
+            self.__broadcaster.add_client(request.sid)
             self.__robot.inform_about_move()
 
-    def __execute(self, json_path: str) -> None:
+        @self.__socket_io.on("disconnect")
+        def handle_disconnect():
+            """Stops the jog button the client holds, it can no longer release it; other clients keep theirs."""
+            self.__broadcaster.remove_client(request.sid)
+            self.__jog_worker.stop(request.sid)
+
+        @self.__socket_io.on("subscribe")
+        def handle_subscribe(data: dict):
+            """Sets the rooms of the client: 'console' for the console output, 'coords' for the position."""
+            if isinstance(data, dict) and isinstance(data.get("rooms"), list):
+                self.__broadcaster.subscribe(request.sid, data["rooms"])
+
+        @self.__socket_io.on("jog")
+        def handle_jog(data: dict):
+            """Moves one axis by the given steps, sent by a click on a manual control button."""
+            axis, delta, speed = self.__parse_jog(data, "delta")
+            if axis is not None and not self.__jog_worker.jog(axis, delta, speed, request.sid):
+                print("[DEBUG] jog: too many clicks are waiting, the click is dropped")
+
+        @self.__socket_io.on("jog_start")
+        def handle_jog_start(data: dict):
+            """Moves one axis until jog_stop, the client repeats it while the button is held."""
+            axis, direction, speed = self.__parse_jog(data, "direction")
+            if axis is not None:
+                self.__jog_worker.start(axis, direction, speed, request.sid)
+
+        @self.__socket_io.on("jog_stop")
+        def handle_jog_stop(data: dict = None):
+            """Stops the held axis, sent when the button is released; any client can stop the robot."""
+            self.__jog_worker.stop()
+
+    def __parse_jog(self, data: dict, key: str) -> tuple[str, int, float]:
+        """
+        Reads the axis, an integer value and the speed of a jog message.
+
+        Args:
+            data (dict): the message of the client
+            key (str): the name of the integer value
+        Returns:
+            tuple[str, int, float]: the axis in upper case, the value and the speed in percent,
+            (None, None, None) if the message is invalid
+        """
+        if not isinstance(data, dict) or str(data.get("axis")).lower() not in self.__axles:
+            return None, None, None
+        try:
+            speed: float = float(data.get("speed", 100))
+            if not 0 < speed <= 100:
+                return None, None, None
+            return data["axis"].upper(), int(data[key]), speed
+        except (KeyError, TypeError, ValueError):
+            return None, None, None
+
+    def __execute(self, job: Job) -> None:
+        """
+        Executes the instructions sent by the client.
+        This is called by the worker of the job queue for every job.
+
+        Args:
+            job (Job): the job with the parsed JSON containing the client's instructions
+        """
+        with self.__motion_lock:
+            self.__execute_program(job)
+
+    def __execute_program(self, job: Job) -> None:
         """
-        Executes the instructions from a JSON file.
-        This is the first function executed by the thread system.
+        Executes the program of a job, called while the job holds the motion lock.
 
         Args:
-            json_path (str): path of the JSON file containing the client's instructions
+            job (Job): the job with the parsed JSON containing the client's instructions
         """
+        loader: Loader = None
+        go_direct_data_collector: GoDirectDataCollector = None
+        self.__robot.control = job.control
         try:
-            loader: Loader = Loader(json_path)
+            key, loader = self.__program_cache.checkout(job.program)
 
-            is_measurement_block: bool = any(self.__check_measurement_block(block) for block in loader.blocks)
-            go_direct_data_collector: GoDirectDataCollector = None
+            is_measurement_block: bool = any(isinstance(block, MeasurementBlock) for block in walk_blocks(loader.blocks))
 
             if is_measurement_block:
                 try:
@@ -152,42 +300,53 @@ class App:
                         "There is no GoDirect device - either connect one or remove the measurement block."
                     ) from e
 
-            context: Context = Context(loader.blocks, loader.variables, self.__robot, go_direct_data_collector, self.__socket_io)
-            print("[DEBUG] thread started")
+            context: Context = Context(loader.variables, self.__robot, go_direct_data_collector, self.__console, job.control)
+            print(f"[DEBUG] job {job.job_id} started")
 
-            for block in loader.blocks:
-                block.execute(context)
+            # binds every block to its variables once, so the execution itself no longer has to look them up
+            for block in walk_blocks(loader.blocks):
+                block.compile(context)
 
-            if is_measurement_block:
-                go_direct_data_collector.stop()
+            Interpreter(loader.blocks, context).run()
+            context.flush_moves()
+            self.__console.flush()
+            print(f"[DEBUG] motion planner: {context.robot.stats}")
 
+        except ExecutionCancelledError:
+            print(f"[DEBUG] job {job.job_id} cancelled")
+            raise
         except ServerError as e:
             ErrorManager.report(e)
+            raise
         finally:
-            with self.__lock:
-                self.__is_running = False
-                print("[DEBUG] thread finished")
-
-    def __check_measurement_block(self, block: Block) -> bool:
-        """
-        Recursively checks if a block or its children is a measurement block.
-
-        Args:
-            block (Block): block to check
-
-        Returns:
-            bool: True if measurement block exists, False otherwise
-        """
-        if "measurement" in block.block_id:
-            return True
-        if block.has_children():
-            return any(self.__check_measurement_block(child) for child in block.children)
-        return False
+            self.__robot.control = None
+            self.__robot.sync_position()
+            if go_direct_data_collector is not None:
+                go_direct_data_collector.stop()
+            if loader is not None:
+                self.__program_cache.checkin(key, loader)
+            print(f"[DEBUG] job {job.job_id} finished")
 
     def run(self, host:str = "0.0.0.0", port:int = 5000, debug:bool = True) -> None:
         """Runs the Flask-SocketIO server."""
         self.__socket_io.run(self.__app, host=host, port=port, debug=debug)
 
+    @property
+    def flask_app(self) -> Flask:
+        return self.__app
+
+
+def create_app(console_echo: bool = True) -> Flask:
+    """
+    creates the app for a WSGI server, e.g. gunicorn -k gthread -w 1 --threads 100 'flaskr.app:create_app()';
+    the app needs real threads and a single worker, because the robot, the job queue and the broadcaster exist only once
+    args:
+        console_echo (bool): whether the console output of the programs is printed on the server as well
+    returns:
+        Flask: the Flask app, the Socket.IO server is attached to it
+    """
+    return App(console_echo).flask_app
+
 
 if __name__ == "__main__":
     robot_app = App()
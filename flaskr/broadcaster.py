@@ -0,0 +1,193 @@
+"""A module that sends the messages of the server to the clients on its own thread, so slow clients can not stall the robot"""
+
+import threading
+from collections import deque
+from typing import Callable
+
+from flask_socketio import SocketIO
+
+
+def engineio_backlog(socket_io: SocketIO) -> Callable[[str], int]:
+    """
+    args:
+        socket_io (SocketIO): the socket of the app
+    returns:
+        Callable[[str], int]: returns the number of packets that wait in the connection of a client
+    """
+    server = socket_io.server
+
+    def backlog(sid: str) -> int:
+        try:
+            return server.eio.sockets[server.manager.eio_sid_from_sid(sid, "/")].queue.qsize()
+        except (AttributeError, KeyError, TypeError):
+            return 0
+
+    return backlog
+
+
+class ClientQueue:
+    """
+    the messages that wait for one client, both queues are bounded and drop their oldest message when they are full
+    """
+    def __init__(self, rooms: set[str]) -> None:
+        self.rooms: set[str] = rooms
+        # only the newest positions are worth sending
+        self.telemetry: deque = deque(maxlen=Broadcaster.TELEMETRY_QUEUE)
+        self.messages: deque = deque(maxlen=Broadcaster.MESSAGE_QUEUE)
+        self.dropped: int = 0
+
+    def push(self, event: str, data: dict) -> None:
+        queue: deque = self.telemetry if event in Broadcaster.TELEMETRY_EVENTS else self.messages
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append((event, data))
+
+    def pop(self) -> tuple[str, dict] | None:
+        """
+        returns:
+            tuple[str, dict] | None: the next event and its data, None if nothing waits
+        """
+        if self.messages:
+            return self.messages.popleft()
+        if self.telemetry:
+            return self.telemetry.popleft()
+        return None
+
+
+class Broadcaster:
+    """
+    takes the place of the SocketIO for everything that emits while a program runs.
+    emit only appends the message to an outbox, a thread sends it to the room of its event, encoded once for all clients.
+    A client whose connection still holds more than MAX_BACKLOG packets is skipped and gets the messages in its own
+    queues instead, which drop their oldest messages when they are full; once it caught up, the queues are sent to it
+    """
+    TELEMETRY_EVENTS: set[str] = {"coords"}
+    # the room of an event, the other events, e.g. the errors, go to every client
+    EVENT_ROOMS: dict[str, str] = {"coords": "coords", "console": "console"}
+    ROOMS: tuple[str, ...] = ("console", "coords")
+    NAMESPACE: str = "/"
+
+    TELEMETRY_QUEUE: int = 4
+    MESSAGE_QUEUE: int = 1000
+    MAX_BACKLOG: int = 64
+    # how often a client that is behind is looked at again
+    RETRY_INTERVAL: float = 0.05
+
+    def __init__(self, socket_io: SocketIO, backlog: Callable[[str], int] = None) -> None:
+        """
+        args:
+            socket_io (SocketIO): the socket of the app
+            backlog (Callable[[str], int]): returns the packets that wait in the connection of a client,
+                                            read from engineio if none is given
+        """
+        self.__socket_io: SocketIO = socket_io
+        self.__backlog: Callable[[str], int] = backlog or engineio_backlog(socket_io)
+
+        self.__outbox: deque = deque()
+        self.__clients: dict[str, ClientQueue] = {}
+        self.__condition: threading.Condition = threading.Condition()
+        self.__emitted: int = 0
+        self.__sent: int = 0
+
+        threading.Thread(target=self.__run, daemon=True).start()
+
+    def emit(self, event: str, data: dict) -> None:
+        """
+        queues a message for every client in the room of the event, it returns at once
+        args:
+            event (str): the name of the event
+            data (dict): the data of the event
+        """
+        with self.__condition:
+            self.__outbox.append((event, data))
+            self.__emitted += 1
+            self.__condition.notify()
+
+    def add_client(self, sid: str, rooms: tuple[str, ...] = ROOMS) -> None:
+        """
+        args:
+            sid (str): the session id of a client that connected
+            rooms (tuple[str, ...]): the rooms the client is in, all rooms by default
+        """
+        with self.__condition:
+            self.__clients[sid] = ClientQueue(set())
+        self.subscribe(sid, list(rooms))
+
+    def remove_client(self, sid: str) -> None:
+        with self.__condition:
+            self.__clients.pop(sid, None)
+
+    def subscribe(self, sid: str, rooms: list[str]) -> None:
+        """
+        sets the rooms of a client, e.g. only 'console' for a client that does not show the position
+        args:
+            sid (str): the session id of the client
+            rooms (list[str]): the rooms, unknown rooms are ignored
+        """
+        with self.__condition:
+            client: ClientQueue = self.__clients.get(sid)
+            if client is None:
+                return
+            client.rooms = set(rooms) & set(Broadcaster.ROOMS)
+            server = self.__socket_io.server
+            for room in Broadcaster.ROOMS:
+                if room in client.rooms:
+                    server.enter_room(sid, room, namespace=Broadcaster.NAMESPACE)
+                else:
+                    server.leave_room(sid, room, namespace=Broadcaster.NAMESPACE)
+
+    @property
+    def stats(self) -> dict:
+        """
+        returns:
+            dict: the number of clients, the emitted messages, the messages sent to single clients that were behind
+                  and the dropped ones
+        """
+        with self.__condition:
+            clients: list[ClientQueue] = list(self.__clients.values())
+        return {
+            "clients": len(clients),
+            "emitted": self.__emitted,
+            "sent_to_late_clients": self.__sent,
+            "dropped": sum(client.dropped for client in clients),
+        }
+
+    def __run(self) -> None:
+        """
+        the loop of the thread; the client queues are only touched by this thread
+        """
+        behind: bool = False
+        while True:
+            with self.__condition:
+                if not self.__outbox:
+                    self.__condition.wait(Broadcaster.RETRY_INTERVAL if behind else None)
+                # at most MAX_BACKLOG per round, so a client gets at most twice as many before it counts as behind
+                packets: list[tuple[str, dict]] = [
+                    self.__outbox.popleft() for _ in range(min(len(self.__outbox), Broadcaster.MAX_BACKLOG))
+                ]
+                clients: list[tuple[str, ClientQueue]] = list(self.__clients.items())
+
+            # a client that is behind or still has messages in its queues gets no new ones directly, to keep the order
+            late: list[tuple[str, ClientQueue]] = [
+                (sid, client) for sid, client in clients
+                if client.messages or client.telemetry or self.__backlog(sid) > Broadcaster.MAX_BACKLOG
+            ]
+            for event, data in packets:
+                room: str = Broadcaster.EVENT_ROOMS.get(event)
+                skipped: list[str] = []
+                for sid, client in late:
+                    if room is None or room in client.rooms:
+                        client.push(event, data)
+                        skipped.append(sid)
+                self.__socket_io.emit(event, data, to=room, namespace=Broadcaster.NAMESPACE, skip_sid=skipped or None)
+
+            behind = False
+            for sid, client in late:
+                budget: int = Broadcaster.MAX_BACKLOG - self.__backlog(sid)
+                while budget > 0 and (client.messages or client.telemetry):
+                    event, data = client.pop()
+                    self.__socket_io.emit(event, data, to=sid, namespace=Broadcaster.NAMESPACE)
+                    self.__sent += 1
+                    budget -= 1
+                if client.messages or client.telemetry:
+                    behind = True
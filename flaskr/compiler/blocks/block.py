@@ -1,9 +1,47 @@
 """Module which includes the parent block and all other blocks"""
 
-import time
+import operator
+from typing import Callable, Iterator
 from flaskr.compiler.context import Context
+from flaskr.compiler.blocks.registry import register_block
 from flaskr.compiler.blocks.variables import Variable
-from flaskr.server_error import ExpectVariableError, BlockNotImpelentedError
+from flaskr.server_error import ExpectVariableError, BlockNotImpelentedError, FalseTypeError
+
+def resolve_operator(text: str, operators: dict) -> Callable | None:
+    """
+    resolves the operator which was selected in the frontend from the text of a block,
+    the selected value is always appended as the last word of the text
+    args:
+        text (str): the text of the block
+        operators (dict): all possible operators, in the order in which they are searched
+    returns:
+        Callable | None: the function of the operator, None if no operator was found
+    """
+    words: list[str] = text.split()
+    if words and words[-1] in operators:
+        return operators[words[-1]]
+
+    for symbol, function in operators.items():
+        if symbol in text:
+            return function
+    return None
+
+
+def walk_blocks(blocks: list) -> Iterator:
+    """
+    iterates over the blocks and all blocks nested in them, in the order in which they appear in the program;
+    it uses its own stack, so a deeply nested program does not hit the recursion limit
+    args:
+        blocks (list[Block]): the blocks at the top of the tree
+    returns:
+        Iterator[Block]: every block of the tree
+    """
+    stack: list = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
+        yield block
+        stack.extend(reversed(block.sub_blocks))
+
 
 class Block:
     """
@@ -15,12 +53,15 @@ class Block:
     with __ are private,
     the rest is public
     """
+    # whether all variables of the block have to be numbers, checked while loading
+    NUMERIC_VARIABLES: bool = True
 
     def __init__(self, block_id: str, text: str, variables: list[str], children: list, expected_vars: int) -> None:
         self._block_id: str = block_id
         self._text: str = text
         self._variables: list[str] = variables
         self._children: list[Block] = children
+        self._bound_variables: list[Variable] = []
         self.__validate_vars(expected_vars)
 
     def __validate_vars(self, expected_vars: int) -> None:
@@ -36,22 +77,54 @@ class Block:
                 "Expected variables but got none", block_id=self._block_id
             )
 
-    def execute(self, context: Context) -> None:
+    def compile(self, context: Context) -> None:
         """
-        raises a NotImplementedError, meant to be overridden by subclasses
+        binds the block to the context once before the execution,
+        so that the variables do not have to be searched by name on every execution;
+        the children are compiled on their own (see walk_blocks)
         args:
-            context (Context): the context to be passed when the method is implemented
+            context (Context): the context which provides the variables
         """
-        raise BlockNotImpelentedError(message="block is defined (not as a standalone block)", block_id=self._block_id)
+        self._bound_variables = [context.get_variable(name) for name in self._variables]
+
+    def reset(self) -> None:
+        """
+        resets the state the block keeps between executions, the children are reset on their own (see walk_blocks)
+        """
+
+    def enter(self, context: Context) -> list | None:
+        """
+        called by the interpreter when it reaches the block;
+        a block without children does all of its work here
+        args:
+            context (Context): the context of the execution
+        returns:
+            list | None: the blocks the interpreter executes next, None to continue after this block
+        """
+        self.execute(context)
+        return None
 
-    def _execute_children(self, context: Context) -> None:
+    def repeat(self, context: Context) -> list | None:
         """
-        executes the execute method for each child in the _children list
+        called by the interpreter when the blocks returned by enter or repeat have been executed,
+        loops return their children again here
         args:
-            context (Context): the context to pass to each child's execute method
+            context (Context): the context of the execution
+        returns:
+            list | None: the blocks the interpreter executes next, None to continue after this block
         """
-        for child in self._children:
-            child.execute(context)
+        return None
+
+    def execute(self, context: Context) -> None:
+        """
+        the work of a block without children, called by enter; meant to be overridden by subclasses,
+        blocks with children override enter and repeat instead
+        args:
+            context (Context): the context to be passed when the method is implemented
+        raises:
+            BlockNotImpelentedError: if the subclass does not implement it
+        """
+        raise BlockNotImpelentedError(message="block is defined (not as a standalone block)", block_id=self._block_id)
 
     def has_children(self) -> bool:
         """a kind of getter, who checks if there are children
@@ -71,6 +144,11 @@ class Block:
     def children(self) -> list:
         return self._children
 
+    @property
+    def sub_blocks(self) -> list:
+        """all blocks that are nested directly in this block, e.g. also the else branch"""
+        return self._children
+
     @property
     def block_id(self) -> str:
         return self._block_id
@@ -79,36 +157,31 @@ class Block:
         return str(self._block_id)
 
 
+@register_block("block-debug-print")
 class DebugPrintBlock(Block):
     """
     Block for outputting arbitrary values to the client's console
     """
+    NUMERIC_VARIABLES: bool = False
+
+    def __init__(self, block_id: str, text: str, variables: list[str], children: list) -> None:
+        # any number of variables can be printed
+        super().__init__(block_id, text, variables, children, len(variables))
 
     def execute(self, context: Context) -> None:
         """
-        sends data to the frontend, which is to be output in the console there,
-        with the corresponding variable values
+        writes the values of the variables to the console of the frontend, they are sent in batches
         args:
-            context (Context): the context used to retrieve variable values and interact with
-                               the socket io
+            context (Context): the context used to retrieve variable values and the console
         """
         if not self._variables == []:
-            send_str: str = "[DEBUG] "
-            for var in self._variables:
-                send_str += context.get_variable(var).value + " | "
-
-            if len(self._variables) == 1:
-                send_str = send_str.replace("|", "")
-
-            context.socket_io.emit(
-                "update",
-                {
-                    "data": send_str
-                },
-            )
-            print(send_str)
+            # the output appears after the moves before it
+            context.flush_moves()
+            context.console.write("[DEBUG] " + " | ".join(str(var) for var in self._bound_variables))
 
 
+@register_block("block-time-seconds", time_multiplier=1)
+@register_block("block-time-minutes", time_multiplier=60)
 class TimerBlock(Block):
     """
     block for stopping the program at a specific time;
@@ -126,11 +199,41 @@ class TimerBlock(Block):
         args:
             context (Context): the context used to retrieve the variable value
         """
-        time.sleep(
-            context.get_variable(self._variables[0]).to_int() * self.__time_multiplier
+        # the robot stands still during the wait, not the moves before it
+        context.flush_moves()
+        context.wait(
+            self._bound_variables[0].to_number() * self.__time_multiplier
         )
 
 
+# other characters, besides those shown, that can still be used in variable naming
+# + --> {
+# - --> }
+# * --> [
+CALCULATION_OPERATORS: dict[str, Callable[[int, int], int]] = {
+    "{": operator.add,
+    "}": operator.sub,
+    "[": operator.mul,
+    # integers keep the integer division towards zero, as soon as a float is involved the result stays a float
+    "/": lambda arg1, arg2: arg1 / arg2 if isinstance(arg1, float) or isinstance(arg2, float) else int(arg1 / arg2),
+    "pow": operator.pow,
+    "sqrt": lambda arg1, arg2: int(arg2 ** (1/arg1)),
+    "mod": operator.mod,
+    "and": operator.and_,
+    "or": operator.or_,
+    "xor": operator.xor,
+    # Yes, this is a special case,
+    # because theoretically you have to specify two variable values here,
+    # but you only need one
+    # --> which makes it a little cumbersome,
+    # because you can simply give it a random value, since arg1 doesn't matter
+    "not": lambda arg1, arg2: ~arg2,
+    "<<": operator.lshift,
+    ">>": operator.rshift,
+}
+
+
+@register_block("block-calculations")
 class CalculationBlock(Block):
     """
     Block for calculating with variables;
@@ -140,59 +243,26 @@ class CalculationBlock(Block):
 
     def __init__(self, block_id: str, text: str, variables: list[str], children: list) -> None:
         super().__init__(block_id, text, variables, children, 3)
+        self.__operation: Callable[[int, int], int] | None = resolve_operator(text, CALCULATION_OPERATORS)
 
     def execute(self, context:Context) -> None:
         """
-        performs a calculation based on the operator in _text and updates the first variable's value
+        performs the calculation resolved from _text and updates the first variable's value
         args:
             context (Context): the context used to retrieve and update variable values
         """
-        calc_var: Variable = context.get_variable(self._variables[0])
-        value: int = calc_var.to_int()
-
-        arg1: int = context.get_variable(self._variables[1]).to_int()
-        arg2: int = context.get_variable(self._variables[2]).to_int()
-
-        # other characters, besides those shown, that can still be used in variable naming
-        # + --> {
-        # - --> }
-        # * --> [
-
-        if "{" in self._text:
-            value = arg1 + arg2
-        elif "}" in self._text:
-            value = arg1 - arg2
-        elif "[" in self._text:
-            value = arg1 * arg2
-        elif "/" in self._text:
-            value = int(arg1 / arg2)
-        elif "pow" in self._text:
-            value = arg1 ** arg2
-        elif "sqrt" in self._text:
-            value = int(arg2 ** (1/arg1))
-        elif "mod" in self._text:
-            value = arg1 % arg2
-        elif "and" in self._text:
-            value = arg1 & arg2
-        elif "or" in self._text:
-            value = arg1 | arg2
-        elif "xor" in self._text:
-            value = arg1 ^ arg2
-        elif "not" in self._text:
-            # Yes, this is a special case,
-            # because theoretically you have to specify two variable values here,
-            # but you only need one
-            # --> which makes it a little cumbersome,
-            # because you can simply give it a random value, since arg1 doesn't matter
-            value = ~arg2
-        elif "<<" in self._text:
-            value = arg1 << arg2
-        elif "<<" in self._text:
-            value = arg1 >> arg2
-
-        calc_var.value = str(value)
+        if self.__operation is None:
+            return
+
+        calc_var, arg1, arg2 = self._bound_variables
+        try:
+            calc_var.value = self.__operation(arg1.to_number(), arg2.to_number())
+        except TypeError as e:
+            # bitwise operations are only defined for integers
+            raise FalseTypeError("This operation can only be used with integers", block_id=self._block_id) from e
 
 
+@register_block("block-measurement")
 class MeasurementBlock(Block):
     """
     block for recording measurement data
@@ -207,5 +277,6 @@ class MeasurementBlock(Block):
         args:n
             context (Context): this is to get the GoDirectDataCollector
         """
+        context.flush_moves()
         position:tuple = (context.robot.x, context.robot.y, context.robot.z)
         context.go_direct_data_collector.run(position)
@@ -1,9 +1,22 @@
 """A module containing the blocks that branch the program flow"""
 
-from flaskr.compiler.blocks.block import Block
+import operator
+from typing import Callable
+from flaskr.compiler.blocks.block import Block, resolve_operator
 from flaskr.compiler.context import Context
+from flaskr.compiler.blocks.registry import register_block
 
+COMPARISON_OPERATORS: dict[str, Callable[[int, int], bool]] = {
+    "==": operator.eq,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+    "!=": operator.ne,
+}
 
+
+@register_block("block-condition")
 class IfBlock(Block):
     """
     Block for controlling the program flow, classic if condition
@@ -11,12 +24,10 @@ class IfBlock(Block):
 
     def __init__(self, block_id: str, text: str, variables: list[str], children: list):
         super().__init__(block_id, text, variables, children, 2)
+        self.__comparison: Callable[[int, int], bool] | None = resolve_operator(text, COMPARISON_OPERATORS)
 
-    def execute(self, context: Context) -> None:
-        execute_bool: bool = self._get_execute_bool(context=context)
-
-        if execute_bool:
-            self._execute_children(context)
+    def enter(self, context: Context) -> list | None:
+        return self._children if self._get_execute_bool(context=context) else None
 
     def _get_execute_bool(self, context: Context) -> bool:
         """
@@ -26,21 +37,10 @@ class IfBlock(Block):
         returns:
             bool: true if the condition is met, false otherwise
         """
-        execute_bool: bool = False
-        if "==" in self._text:
-            execute_bool = (context.get_variable(self._variables[0]).to_int() == context.get_variable(self._variables[1]).to_int())
-        elif "<=" in self._text:
-            execute_bool = (context.get_variable(self._variables[0]).to_int() <= context.get_variable(self._variables[1]).to_int())
-        elif ">=" in self._text:
-            execute_bool = (context.get_variable(self._variables[0]).to_int() >= context.get_variable(self._variables[1]).to_int())
-        elif "<" in self._text:
-            execute_bool = (context.get_variable(self._variables[0]).to_int() < context.get_variable(self._variables[1]).to_int())
-        elif ">" in self._text:
-            execute_bool = (context.get_variable(self._variables[0]).to_int() > context.get_variable(self._variables[1]).to_int())
-        elif "!=" in self._text:
-            execute_bool = not (context.get_variable(self._variables[0]).to_int() == context.get_variable(self._variables[1]).to_int())
-
-        return execute_bool
+        if self.__comparison is None:
+            return False
+
+        return self.__comparison(self._bound_variables[0].to_number(), self._bound_variables[1].to_number())
 
 
 class IfElseBlock(IfBlock):
@@ -53,11 +53,9 @@ class IfElseBlock(IfBlock):
         super().__init__(block_id, text, variables, children)
         self.__children_else = children_else
 
-    def execute(self, context: Context) -> None:
-        execute_bool: bool = self._get_execute_bool(context=context)
+    def enter(self, context: Context) -> list | None:
+        return self._children if self._get_execute_bool(context=context) else self.__children_else
 
-        if execute_bool:
-            self._execute_children(context)
-        else:
-            self._children = self.__children_else
-            self._execute_children(context)
+    @property
+    def sub_blocks(self) -> list:
+        return self._children + self.__children_else
@@ -2,7 +2,11 @@
 
 from flaskr.compiler.blocks.block import Block
 from flaskr.compiler.context import Context
+from flaskr.compiler.blocks.registry import register_block
+from flaskr.robot_movement.visit_order import plan_visit_order, path_time
+from flaskr.server_error import RobotPositionError, SpeedOutOfRangeError, VariableNoneTyeError
 
+@register_block("block-steps")
 class MoveBlock(Block):
     """
     moves the robot on three axes around a specific point
@@ -10,22 +14,21 @@ class MoveBlock(Block):
     def __init__(self, block_id:str, text:str, variables:list[str], children:list) -> None:
         super().__init__(block_id, text, variables, children, 1) # the last number defines the exact number of expected variables
 
+        # the selected axis is always the last character of the text
+        self.__axis:str | None = self._text[-1:].upper() if self._text[-1:] in ("x", "y", "z") else None
+
     def execute(self, context:Context) -> None:
-        if self._text.endswith("x"):
+        if self.__axis is not None:
             # since it is specified in advance that each block has an exact number of expected variables,
             # one can therefore directly access the respective variable from the list
-            x = context.get_variable(self._variables[0]).to_int()
-            context.robot.move_on_axis("X",x)
-
-        if self._text.endswith("y"):
-            y = context.get_variable(self._variables[0]).to_int()
-            context.robot.move_on_axis("Y",y)
-
-        if self._text.endswith("z"):
-            z = context.get_variable(self._variables[0]).to_int()
-            context.robot.move_on_axis("Z",z)
+            try:
+                context.robot.move_on_axis(self.__axis, self._bound_variables[0].to_int(), context.speed)
+            except RobotPositionError as e:
+                e.block_id = self._block_id
+                raise
 
 
+@register_block("block-reset-pos")
 class ResetPositionBlock(Block):
     """
     resets the position to the predefined starting position
@@ -37,6 +40,25 @@ class ResetPositionBlock(Block):
         context.robot.reset_pos()
 
 
+@register_block("block-speed")
+class SpeedBlock(Block):
+    """
+    sets the speed of all following moves, as a percentage of the maximum speed of the axes;
+    the motors always accelerate and brake, the speed only limits how fast they get
+    """
+    def __init__(self, block_id:str, text:str, variables:list[str], children:list) -> None:
+        super().__init__(block_id, text, variables, children, 1)
+
+    def execute(self, context:Context) -> None:
+        speed:float = self._bound_variables[0].to_number()
+        if not 0 < speed <= 100:
+            raise SpeedOutOfRangeError(
+                f"The speed has to be a percentage between 0 and 100, not {speed}", block_id=self._block_id
+            )
+        context.speed = speed
+
+
+@register_block("block-go-to-pos")
 class MoveToPositionBlock(Block):
     """
     allows you to move all three axes directly
@@ -52,10 +74,19 @@ class MoveToPositionBlock(Block):
         self.__p_z:int = None
 
     def execute(self, context:Context):
-        self._execute_children(context)
-        context.robot.move_to_position(self.__p_x, self.__p_y, self.__p_z)
-
-    def _execute_children(self, context:Context):
+        self._read_position(context)
+        try:
+            context.robot.move_to_position(self.__p_x, self.__p_y, self.__p_z, context.speed)
+        except RobotPositionError as e:
+            e.block_id = self._block_id
+            raise
+
+    def _read_position(self, context:Context):
+        """
+        reads the coordinates of the position block, the position block is not entered by the interpreter
+        args:
+            context (Context): the context of the execution
+        """
         child:PositionBlock = self._children[0] #this block only have one children
         child.execute(context)
 
@@ -63,7 +94,24 @@ class MoveToPositionBlock(Block):
         self.__p_y = child.p_y
         self.__p_z = child.p_z
 
-
+    def target(self, context:Context) -> tuple[int, int, int]:
+        """
+        reads the position the block moves to, without moving
+        args:
+            context (Context): the context of the execution
+        raises:
+            VariableNoneTyeError: if a coordinate is not defined
+        returns:
+            tuple[int, int, int]: X, Y and Z of the position
+        """
+        self._read_position(context)
+        position:tuple[int, int, int] = (self.__p_x, self.__p_y, self.__p_z)
+        if None in position:
+            raise VariableNoneTyeError("Variable is not defined, it's None", block_id=self._block_id)
+        return position
+
+
+@register_block("block-pos")
 class PositionBlock(Block):
     """
     includes the three values for the respective axes in one
@@ -75,9 +123,9 @@ class PositionBlock(Block):
         self.__p_z:int = None
 
     def execute(self, context: Context) -> None:
-        self.__p_x:int = context.get_variable(self._variables[0]).to_int()
-        self.__p_y:int = context.get_variable(self._variables[1]).to_int()
-        self.__p_z:int = context.get_variable(self._variables[2]).to_int()
+        self.__p_x:int = self._bound_variables[0].to_int()
+        self.__p_y:int = self._bound_variables[1].to_int()
+        self.__p_z:int = self._bound_variables[2].to_int()
 
     @property
     def p_x(self)-> int:
@@ -90,3 +138,58 @@ class PositionBlock(Block):
     @property
     def p_z(self)-> int:
         return self.__p_z
+
+
+@register_block("block-visit")
+class VisitBlock(Block):
+    """
+    visits a set of positions in a short order instead of the order in which they were dragged in.
+    Every Goto position block inside starts a stop, the blocks after it up to the next Goto position block belong to
+    the stop (e.g. a measurement); blocks in front of the first Goto position block run first.
+    Then the positions are read and the order is planned from where the robot is (see visit_order)
+    """
+    def __init__(self, block_id:str, text:str, variables:list[str], children:list) -> None:
+        super().__init__(block_id, text, variables, children, 0)
+        # the blocks in front of the first stop and the blocks of every stop, starting with its Goto position block
+        self.__leading:list[Block] = []
+        self.__stops:list[list[Block]] = []
+        for child in children:
+            if isinstance(child, MoveToPositionBlock):
+                self.__stops.append([child])
+            elif self.__stops:
+                self.__stops[-1].append(child)
+            else:
+                self.__leading.append(child)
+        # whether the interpreter has got the stops already
+        self.__planned:bool = False
+
+    def enter(self, context:Context) -> list | None:
+        self.__planned = not self.__leading
+        return self.__leading or self.__plan(context)
+
+    def repeat(self, context:Context) -> list | None:
+        if self.__planned:
+            self.__planned = False
+            return None
+        self.__planned = True
+        return self.__plan(context)
+
+    def reset(self) -> None:
+        self.__planned = False
+
+    def __plan(self, context:Context) -> list[Block]:
+        """
+        returns:
+            list[Block]: the blocks of all stops, the stops in the planned order
+        """
+        if len(self.__stops) < 2:
+            return [child for stop in self.__stops for child in stop]
+
+        positions:list[tuple[int, int, int]] = [stop[0].target(context) for stop in self.__stops]
+        start:tuple[int, int, int] = (context.robot.x, context.robot.y, context.robot.z)
+        order:list[int] = plan_visit_order(start, positions)
+        print(
+            f"[DEBUG] visit {len(positions)} positions, estimated motion time {path_time(start, positions, order):.1f} s"
+            f" instead of {path_time(start, positions, list(range(len(positions)))):.1f} s"
+        )
+        return [child for i in order for child in self.__stops[i]]
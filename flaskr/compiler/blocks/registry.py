@@ -0,0 +1,38 @@
+"""Module with the registry of all block classes, the loader looks up the class of every block here"""
+# run.js gives every block that is dragged from the palette the id of the palette block plus "-" + Date.now(),
+# the ids in the palette never end with a digit or "-"
+ID_SUFFIX_CHARS: str = "0123456789-"
+
+# the types whose id is chosen by the user, so only the type tells what kind of block it is
+TYPE_KINDS: tuple[str, ...] = ("block-pos",)
+
+BLOCK_REGISTRY: dict[str, tuple[type, dict]] = {}
+
+
+def register_block(kind: str, **arguments):
+    """
+    class decorator that registers a block class for a kind of block
+    args:
+        kind (str): the normalized kind, which is the id of the block in the palette
+        arguments: additional arguments which are passed to the constructor for this kind
+    returns:
+        the decorator, which returns the class unchanged
+    """
+    def decorator(block_class: type) -> type:
+        BLOCK_REGISTRY[kind] = (block_class, arguments)
+        return block_class
+    return decorator
+
+
+def block_kind(raw_block: dict) -> str:
+    """
+    normalizes a block coming from the client to its kind
+    args:
+        raw_block (dict): dictionary representing the block data from json
+    returns:
+        str: the kind under which the block class is registered
+    """
+    block_type: str = raw_block["type"].split(" ")[0]
+    if block_type in TYPE_KINDS:
+        return block_type
+    return raw_block["id"].rstrip(ID_SUFFIX_CHARS)
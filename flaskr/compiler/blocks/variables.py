@@ -1,52 +1,199 @@
 """Module that provides the internal variables"""
-from flaskr.server_error import FalseTypeError
+import math
+from typing import Iterator
+from flaskr.server_error import FalseTypeError, VariableNoneTyeError
 
 class Variable():
     """
     This represents the variables
-    The variables can be either a string or an integer; 
-    other data types are not possible
+    The value is parsed once when the variable is created and then stored as int or float;
+    values that are not a number stay a string, which can only be printed
     """
 
-    def __init__(self, name:str, value:str) -> None:
+    def __init__(self, name:str, value:int | float | str | None) -> None:
         self.__name:str = name
-        self.__value:str = str(value)
+        self.__value:int | float | str | None = Variable.parse(value)
+        self.__initial_value:int | float | str | None = self.__value
+
+    @staticmethod
+    def parse(value:int | float | str | None) -> int | float | str | None:
+        """
+        converts a value coming from the client into the type in which it is stored
+        args:
+            value (int | float | str | None): the raw value
+        returns:
+            int | float | str | None: int or float if the value is a finite number, otherwise the unchanged value
+        """
+        # Python also reads "1_000", "inf" and "nan" as numbers, the robot can not move by them
+        if not isinstance(value, str) or "_" in value:
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            number:float = float(value)
+        except ValueError:
+            return value
+        return number if math.isfinite(number) else value
 
     @property
-    def value(self) -> str:
+    def value(self) -> int | float | str | None:
         return self.__value
 
     @value.setter
-    def value(self, value: str) -> None:
+    def value(self, value: int | float) -> None:
         self.__value = value
 
     @property
     def name(self) -> str:
         return self.__name
 
+    def reset(self) -> None:
+        """
+        sets the variable back to the value it was created with
+        """
+        self.__value = self.__initial_value
+
+    def is_number(self) -> bool:
+        """
+        returns:
+            bool: true if the variable can be used for calculations (or is undefined), false if it is a string
+        """
+        return not isinstance(self.__value, str)
+
     def to_int(self) -> int:
         """
         returns:
-            int: int-value of the variable 
-                 (because the variable value is actually stored as a string)
+            int: int-value of the variable, a float is truncated
+        raises:
+            FalseTypeError: if the variable is not a number
         """
-        return self.__check_validation(self.__value)
+        value = self.to_number()
+        if type(value) is int:
+            return value
+        return int(value)
 
-    def __check_validation(self, value:str) -> int:
+    def to_number(self) -> int | float:
         """
-        checks whether a variable can be converted to an int at all, 
-        and whether it is negative or positive
-        args:
-            value (str): the sting value of the variable
+        returns:
+            int | float: the stored number without any conversion
         raises:
-            FalseTypeError: if the variable cant convert to a int
+            VariableNoneTyeError: if the variable has no value
+            FalseTypeError: if the variable is not a number
+        """
+        value = self.__value
+        if isinstance(value, str):
+            raise FalseTypeError(f"The variable '{self.__name}' is not a number: {value}")
+        if value is None:
+            raise VariableNoneTyeError(f"The variable '{self.__name}' is not defined, it's None")
+        return value
+
+    def __str__(self) -> str:
+        return str(self.__value)
+
+
+class AxisVariable(Variable):
+    """
+    Read-only variable which is bound to one axis of the robot,
+    reading it always returns the current position on that axis
+    """
+
+    def __init__(self, name:str, robot, axis:str) -> None:
+        super().__init__(name, None)
+        self.__robot = robot
+        self.__axis:str = axis.lower()
+
+    @property
+    def value(self) -> int:
+        return getattr(self.__robot, self.__axis)
+
+    @value.setter
+    def value(self, value: int) -> None:
+        # the position of the robot can only be changed by moving it
+        pass
+
+    def reset(self) -> None:
+        pass
+
+    def to_int(self) -> int:
+        return getattr(self.__robot, self.__axis)
+
+    def to_number(self) -> int:
+        return getattr(self.__robot, self.__axis)
+
+    def __str__(self) -> str:
+        return str(getattr(self.__robot, self.__axis))
+
+
+class VariableTable():
+    """
+    Stores all variables of a program in one list, every variable name is resolved to a fixed slot
+    (the index in that list) when the program is loaded, so an access costs the same
+    no matter how many variables the program has.
+    The first three slots are reserved for the axes X, Y and Z
+    """
+    AXES: tuple[str, ...] = ("X", "Y", "Z")
+
+    def __init__(self) -> None:
+        self.__slots:dict[str, int] = {}
+        self.__variables:list[Variable] = []
+
+        for axis in VariableTable.AXES:
+            self.add(Variable(axis, None))
+
+    def add(self, variable:Variable) -> int:
+        """
+        adds a variable to the table, a variable with the same name replaces the old one
+        args:
+            variable (Variable): the variable to add
+        returns:
+            int: the slot of the variable
+        """
+        slot:int | None = self.__slots.get(variable.name)
+        if slot is None:
+            slot = len(self.__variables)
+            self.__slots[variable.name] = slot
+            self.__variables.append(variable)
+        elif variable.name not in VariableTable.AXES:
+            self.__variables[slot] = variable
+        return slot
+
+    def bind_axes(self, robot) -> None:
+        """
+        binds the reserved slots of X, Y and Z to the robot, so they always return the current position
+        args:
+            robot (Robot): the robot whose position is read
+        """
+        for axis in VariableTable.AXES:
+            self.__variables[self.__slots[axis]] = AxisVariable(axis, robot, axis)
+
+    def reset(self) -> None:
+        """
+        sets all variables back to the values they were loaded with
+        """
+        for variable in self.__variables:
+            variable.reset()
+
+    def get(self, name:str) -> Variable | None:
+        """
         returns:
-            int: the final int value        
-        """
-        if not value is None:
-            if value.startswith("-") and value[1:].isnumeric():
-                return int(value[1:]) *-1
-            elif value.isnumeric():
-                return int(value)
-            else:
-                raise FalseTypeError
+            Variable | None: the variable with the given name, None if there is none
+        """
+        slot:int | None = self.__slots.get(name)
+        if slot is None:
+            return None
+        return self.__variables[slot]
+
+    def __getitem__(self, slot:int) -> Variable:
+        return self.__variables[slot]
+
+    def __len__(self) -> int:
+        return len(self.__variables)
+
+    def __iter__(self) -> Iterator[Variable]:
+        return iter(self.__variables)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.__slots)
@@ -1,55 +1,33 @@
 """A module that provides all the necessary information, such as variables. It essentially gives the context for the blocks."""
 
-from socket import SocketIO
-from typing import TYPE_CHECKING
-from flaskr.compiler.blocks.variables import Variable
+from flaskr.compiler.blocks.variables import Variable, VariableTable
 from flaskr.robot_movement.robot import Robot
+from flaskr.robot_movement.motion_planner import MotionPlanner
 from flaskr.measurement import GoDirectDataCollector
+from flaskr.execution_control import ExecutionControl
+from flaskr.console import ConsoleStream
 
-if TYPE_CHECKING:
-    from flaskr.compiler.blocks.block import Block
 class Context():
     """
     provides all the necessary information
     """
-    def __init__(self, blocks:list, variables:list[Variable], robot: Robot, go_direct_data_collector: GoDirectDataCollector, socket_io: SocketIO):
-        self.__variables:list[Variable] = variables
-        self.__variables = self.__organize_all_variables(blocks, self.__variables)
+    def __init__(self, variables:VariableTable, robot: Robot, go_direct_data_collector: GoDirectDataCollector, console: ConsoleStream,
+                 control: ExecutionControl = None, merge_axes: bool = False):
+        self.__variables:VariableTable = variables
+        self.__control: ExecutionControl = control or ExecutionControl()
 
         self.__go_direct_data_collector: GoDirectDataCollector = go_direct_data_collector
-        self.__robot: Robot = robot
+        # the blocks move the robot through the planner, which merges consecutive moves (see MotionPlanner for merge_axes)
+        self.__robot: MotionPlanner = MotionPlanner(robot, merge_axes)
+        # X, Y and Z are bound to the planner, so they drive the pending move and return the current position
+        self.__variables.bind_axes(self.__robot)
 
-        self.__socket_io = socket_io
+        # the output of the debug blocks
+        self.__console: ConsoleStream = console
+        # percentage of the maximum speed of the following moves, set by the speed block
+        self.__speed:float = 100
 
-        var_names:list = []
-        for var in self.__variables:
-            var_names.append(var.name)
-        print(f"[DEBUG] variables: {var_names}")
-
-    def __organize_all_variables(self, blocks: list["Block"], variables: list[Variable]) -> list[Variable]:
-        """
-        organizes variables from blocks and ensures unique variable names
-        args:
-            blocks (list[Block]): list of blocks to extract variables from
-            variables (list[Variable]): list of existing variables to update
-        returns:
-            list[Variable]: updated list of unique variables
-        """
-        # Create a dictionary to ensure unique variable names
-        unique_vars = {var.name: var for var in variables}
-
-        for block in blocks:
-            if block.children:
-                self.__organize_all_variables(block.children, variables)
-
-            for var in block.variables_names:
-                if isinstance(var, Variable):
-                    unique_vars[var.name] = var
-
-        # Update the original list in-place
-        variables.clear()
-        variables.extend(unique_vars.values())
-        return variables
+        print(f"[DEBUG] variables: {self.__variables.names}")
 
     def get_variable(self, name:str) -> Variable:
         """
@@ -60,24 +38,52 @@ class Context():
         returns:
             Variable: the variable object corresponding to the given name
         """
-        for var in self.__variables:
-            if var.name == name:
-                match name:
-                    case "X":
-                        return Variable("X", self.__robot.x)
-                    case "Y":
-                        return Variable("Y", self.__robot.y)
-                    case "Z":
-                        return Variable("Z", self.__robot.z)
-                return var
+        return self.__variables.get(name)
+
+    def wait(self, seconds: float) -> None:
+        """
+        pauses the execution, used by the timer blocks, a cancel ends the wait immediately
+        args:
+            seconds (float): duration of the pause in seconds
+        """
+        self.__control.wait(seconds)
+
+    def flush_moves(self) -> None:
+        """
+        drives the moves the planner still holds back, called before a block observes the robot and when the program ends
+        """
+        self.__robot.flush()
+
+    def checkpoint(self) -> None:
+        """
+        called before every block and every loop iteration,
+        this is where a paused program waits and a cancelled program stops
+        """
+        self.__control.checkpoint()
+
+    @property
+    def variables(self) -> VariableTable:
+        return self.__variables
+
+    @property
+    def control(self) -> ExecutionControl:
+        return self.__control
+
+    @property
+    def speed(self) -> float:
+        return self.__speed
+
+    @speed.setter
+    def speed(self, speed:float) -> None:
+        self.__speed = speed
 
     @property
-    def robot(self) -> Robot:
+    def robot(self) -> MotionPlanner:
         return self.__robot
     
     @property
-    def socket_io(self) -> SocketIO:
-        return self.__socket_io
+    def console(self) -> ConsoleStream:
+        return self.__console
     
     @property
     def go_direct_data_collector(self) -> GoDirectDataCollector:
@@ -0,0 +1,115 @@
+"""A module that executes a program without hardware to check it before it runs on the robot"""
+
+from flaskr.compiler.blocks.block import walk_blocks
+from flaskr.compiler.context import Context
+from flaskr.compiler.interpreter import Interpreter
+from flaskr.compiler.loader import Loader
+from flaskr.robot_movement.robot import Robot
+from flaskr.robot_movement.virtual_robot import VirtualRobot, VirtualClock
+from flaskr.server_error import ServerError, DryRunLimitError
+
+
+class MeasurementCounter:
+    """
+    takes the place of the GoDirectDataCollector and only remembers where measurements would be taken
+    """
+    def __init__(self, robot: VirtualRobot) -> None:
+        self.positions:list[tuple] = []
+        self.__robot:VirtualRobot = robot
+
+    def run(self, positions:tuple) -> None:
+        self.positions.append(positions)
+        self.__robot.measure()
+
+
+class ConsoleRecorder:
+    """
+    takes the place of the console stream and keeps the first lines the program would print to the console
+    """
+    MAX_LINES:int = 100
+
+    def __init__(self) -> None:
+        self.lines:list[str] = []
+
+    def write(self, line:str) -> None:
+        if len(self.lines) < ConsoleRecorder.MAX_LINES:
+            self.lines.append(line)
+
+
+class DryRunContext(Context):
+    """
+    context of a dry run, the timers only advance the clock of the virtual robot and the number of executed blocks is limited
+    """
+    def __init__(self, loader: Loader, robot: VirtualRobot, max_blocks: int) -> None:
+        super().__init__(loader.variables, robot, MeasurementCounter(robot), ConsoleRecorder())
+        self.__clock:VirtualClock = robot.clock
+        self.__max_blocks:int = max_blocks
+        self.__executed_blocks:int = 0
+        self.__wait_time:float = 0.0
+
+    def wait(self, seconds: float) -> None:
+        self.__wait_time += seconds
+        self.__clock.advance(seconds)
+
+    def checkpoint(self) -> None:
+        # called before every block and every loop iteration
+        self.__executed_blocks += 1
+        if self.__executed_blocks > self.__max_blocks:
+            raise DryRunLimitError(
+                f"The program executes more than {self.__max_blocks} blocks, does every loop end?"
+            )
+
+    @property
+    def executed_blocks(self) -> int:
+        return self.__executed_blocks
+
+    @property
+    def wait_time(self) -> float:
+        return self.__wait_time
+
+
+class DryRun:
+    """
+    executes all control flow and calculations of a program against a virtual robot, which starts at the
+    position of the real robot; the result tells whether the program stays within the limits,
+    how many steps it drives, how long it will take and where the robot will be when (the timeline).
+    Moves and timers only advance a virtual clock, so hours of a program are simulated in milliseconds
+    """
+    MAX_BLOCKS:int = 1000000
+
+    def __init__(self, loader: Loader, robot: Robot, max_blocks: int = MAX_BLOCKS) -> None:
+        self.__loader:Loader = loader
+        self.__robot:VirtualRobot = VirtualRobot(robot.x, robot.y, robot.z)
+        self.__context:DryRunContext = DryRunContext(loader, self.__robot, max_blocks)
+
+    def run(self) -> dict:
+        """
+        executes the program
+        returns:
+            dict: summary of the run, 'error' is None if the program ran through
+        """
+        error:dict = None
+        try:
+            for block in walk_blocks(self.__loader.blocks):
+                block.compile(self.__context)
+
+            Interpreter(self.__loader.blocks, self.__context).run()
+            self.__context.flush_moves()
+        except ServerError as e:
+            error = {"error": e.message, "block_id": e.block_id, "error_code": e.error_code}
+
+        return {
+            "error": error,
+            "steps": self.__robot.steps,
+            "moves": self.__robot.moves,
+            "moves_saved": self.__context.robot.stats["moves_saved"],
+            "steps_saved": self.__context.robot.stats["steps_saved"],
+            "executed_blocks": self.__context.executed_blocks,
+            "measurements": len(self.__context.go_direct_data_collector.positions),
+            "motion_time": self.__robot.motion_time,
+            "wait_time": self.__context.wait_time,
+            "estimated_time": self.__robot.clock.now,
+            "final_position": {"X": self.__robot.x, "Y": self.__robot.y, "Z": self.__robot.z},
+            "console": self.__context.console.lines,
+            "timeline": self.__robot.timeline.to_dict(),
+        }
@@ -0,0 +1,121 @@
+"""Module that executes a loaded program on an explicit stack instead of recursing through the blocks"""
+
+from flaskr.compiler.blocks.block import Block
+from flaskr.compiler.blocks.loop_blocks import LoopBlock, LoopBreak
+from flaskr.compiler.context import Context
+
+
+class Frame:
+    """
+    one level of the program that is being executed: the blocks of this level and the position of the next one
+    """
+    __slots__ = ("block", "blocks", "pc")
+
+    def __init__(self, block: Block | None, blocks: list[Block]) -> None:
+        # the block whose children are executed, None for the top level of the program
+        self.block: Block | None = block
+        self.blocks: list[Block] = blocks
+        # program counter, index of the next block in blocks
+        self.pc: int = 0
+
+
+class Interpreter:
+    """
+    executes the blocks of a program one after another with a stack of frames and a program counter.
+    A nested block returns the blocks to be executed next (see Block.enter and Block.repeat) instead of
+    executing them itself, so the depth of a program is not limited by Python's recursion limit and the
+    execution can be stopped after every single block and continued later
+    """
+
+    def __init__(self, blocks: list[Block], context: Context) -> None:
+        """
+        args:
+            blocks (list[Block]): the compiled blocks of the program
+            context (Context): the context of the execution
+        """
+        self.__context: Context = context
+        self.__stack: list[Frame] = [Frame(None, blocks)]
+
+    def run(self) -> None:
+        """
+        executes the program until it has ended
+        """
+        self.__execute(None)
+
+    def step(self) -> bool:
+        """
+        executes the next block of the program, a block with children is only entered
+        returns:
+            bool: False if the program has ended
+        """
+        return self.__execute(1)
+
+    def __execute(self, max_blocks: int | None) -> bool:
+        """
+        the loop of the interpreter, it runs until the program has ended or the given number of blocks was entered
+        args:
+            max_blocks (int | None): number of blocks after which the execution is interrupted, None for no limit
+        returns:
+            bool: False if the program has ended
+        """
+        stack: list[Frame] = self.__stack
+        context: Context = self.__context
+        checkpoint = context.checkpoint
+        while stack:
+            frame: Frame = stack[-1]
+            blocks: list[Block] = frame.blocks
+            # the blocks of the frame are executed until a block is entered that has children of its own
+            while frame.pc < len(blocks):
+                block: Block = blocks[frame.pc]
+                frame.pc += 1
+                checkpoint()
+                try:
+                    entered: list[Block] | None = block.enter(context)
+                except LoopBreak:
+                    self.__break()
+                    break
+                if entered is not None:
+                    stack.append(Frame(block, entered))
+                    break
+                if max_blocks is not None:
+                    max_blocks -= 1
+                    if max_blocks == 0:
+                        return True
+            else:
+                # all blocks of this level are executed, a loop may run them again
+                if frame.block is not None:
+                    entered = frame.block.repeat(context)
+                    if entered is not None:
+                        frame.blocks = entered
+                        frame.pc = 0
+                        continue
+                stack.pop()
+                continue
+
+            if max_blocks is not None:
+                max_blocks -= 1
+                if max_blocks == 0:
+                    return True
+        return False
+
+    def __break(self) -> None:
+        """
+        ends the nearest loop, all frames up to and including the loop are removed
+        """
+        stack: list[Frame] = self.__stack
+        while len(stack) > 1:
+            frame: Frame = stack.pop()
+            if isinstance(frame.block, LoopBlock):
+                return
+        # the loader only accepts a break inside of a loop
+        raise LoopBreak()
+
+    @property
+    def current_block(self) -> Block | None:
+        """the block whose children are executed at the moment, None at the top level"""
+        return self.__stack[-1].block if self.__stack else None
+
+    @property
+    def depth(self) -> int:
+        """number of nested blocks that are executed at the moment"""
+        return max(len(self.__stack) - 1, 0)
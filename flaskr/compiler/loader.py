@@ -1,157 +1,117 @@
 """Module that offers block assignment"""
-import json
-from flaskr.compiler.blocks.block import Block, DebugPrintBlock, TimerBlock, CalculationBlock, MeasurementBlock
-from flaskr.compiler.blocks.condition_blocks import IfBlock
-from flaskr.compiler.blocks.loop_blocks import ForBlock, WhileBlock, BreakBlock
-from flaskr.compiler.blocks.move_blocks import MoveBlock, ResetPositionBlock, MoveToPositionBlock, PositionBlock
-from flaskr.compiler.blocks.variables import Variable
+from flaskr.compiler.blocks.block import Block, walk_blocks
+from flaskr.compiler.blocks.registry import BLOCK_REGISTRY, block_kind
+# the block modules register their classes when they are imported
+from flaskr.compiler.blocks import condition_blocks, move_blocks
+from flaskr.compiler.blocks.loop_blocks import LoopBlock, BreakBlock
+from flaskr.compiler.blocks.variables import Variable, VariableTable
+from flaskr.server_error import FalseTypeError, BreakOutsideLoopError
 
 
 class Loader:
     """
-    it reads the JSON file coming from the server and assigns a block and the corresponding information to each relevant element
+    it reads the program coming from the server and assigns a block and the corresponding information to each relevant element
     """
-    def __init__(self, file_path: str) -> None:
-        """Loader class reads JSON, validates schema, creates concrete block objects"""
-        raw_blocks: dict = self.__get_dict_from_json(file_path)
+    def __init__(self, raw_blocks: list[dict]) -> None:
+        """
+        Loader class takes the parsed JSON, validates schema, creates concrete block objects
+        args:
+            raw_blocks (list[dict]): the program, as it was sent by the client
+        """
         self.__blocks: list = []
 
-        self.__variable_list: list[Variable] = []
+        # every variable name gets its slot while loading
+        self.__variable_table: VariableTable = VariableTable()
 
-        # recursive approach, since a certain block can have any number of sub-blocks or also called children
-        for raw_block in raw_blocks:
-            self.__blocks.append(self.__factory(raw_block))
+        self.__blocks = self.__factory(raw_blocks)
+
+    def reset(self) -> None:
+        """
+        restores the state right after loading, so that the same blocks can be executed again
+        """
+        self.__variable_table.reset()
+        for block in walk_blocks(self.__blocks):
+            block.reset()
 
-    def __get_dict_from_json(self, file_path: str) -> dict:
+    def __factory(self, raw_blocks: list[dict]) -> list[Block]:
         """
-        loads and returns a dictionary from a json file
+        creates the block objects from raw json dictionaries, including their children and variables;
+        a certain block can have any number of sub-blocks (children), they are handled with an own stack
+        instead of recursion, so that deeply nested programs do not hit the recursion limit
         args:
-            file_path (str): path to the json file
+            raw_blocks (list[dict]): dictionaries representing the block data from json
+        raises:
+            BreakOutsideLoopError: if a break block is not inside of a loop
         returns:
-            dict: dictionary loaded from the json file
+            list[Block]: instances of the appropriate block types based on the block data
         """
-        with open(file_path, "r", encoding="utf-8") as json_file:
-            return json.load(json_file)
-        return {}
+        blocks: list[Block] = []
+        # (raw block, whether it is inside of a loop, list the created block is appended to, its created children)
+        # the children list is None until the children of the block have been scheduled
+        stack: list[tuple] = [(raw_block, False, blocks, None) for raw_block in reversed(raw_blocks)]
+        while stack:
+            raw_block, in_loop, siblings, children = stack.pop()
+            registered: tuple[type, dict] | None = BLOCK_REGISTRY.get(block_kind(raw_block))
 
-    def __factory(self, raw_block: dict) -> Block:
+            if children is None:
+                block_class: type = registered[0] if registered is not None else Block
+                if block_class is BreakBlock and not in_loop:
+                    raise BreakOutsideLoopError("A break can only be used inside of a loop", block_id=raw_block["id"])
+                in_loop = in_loop or issubclass(block_class, LoopBlock)
+
+                # the block itself is created after all of its children
+                children = []
+                stack.append((raw_block, in_loop, siblings, children))
+                for child in reversed(raw_block.get("children", [])):
+                    stack.append((child, in_loop, children, None))
+                continue
+
+            siblings.append(self.__create_checked_block(raw_block, registered, children))
+        return blocks
+
+    def __create_checked_block(self, raw_block: dict, registered: tuple[type, dict] | None, children: list) -> Block:
         """
-        creates a block object from a raw json dictionary, including its children and variables
+        adds the variables of a block to the variable table and creates the block
         args:
             raw_block (dict): dictionary representing the block data from json
+            registered (tuple[type, dict] | None): the registered class and its arguments, None if the kind is unknown
+            children (list): the already created children of the block
+        raises:
+            FalseTypeError: if the block only accepts numbers, but a variable is not a number
         returns:
             Block: an instance of the appropriate block type based on the block data
         """
-        block_type: str = raw_block["type"]
-
-        children: list = []
-        for child in raw_block.get("children", []):
-            children.append(self.__factory(child))
-
         variable_name_list: list[str] = []
+        block_variables: list[Variable] = []
         if not raw_block["variables"] == []:
             for variable in raw_block["variables"]:
                 variable_name_list.append(variable["text"])
-                self.__variable_list.append(
-                    Variable(variable["text"], variable["value"])
-                )
+                # the value is parsed only once, here
+                block_variables.append(Variable(variable["text"], variable["value"]))
+                self.__variable_table.add(block_variables[-1])
 
-        # gets the blocktype based on typical properties from the JSON dict
-        if block_type == "block-event" and "break" in raw_block["id"]:
-            return BreakBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-control" and "for" in raw_block["id"]:
-            return ForBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-control" and "while" in raw_block["id"]:
-            return WhileBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-control" and "if" in raw_block["text"]:
-            return IfBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type.startswith("block-move") and "steps" in raw_block["id"]:
-            return MoveBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type.startswith("block-move") and "reset" in raw_block["id"]:
-            return ResetPositionBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-debug" and "print" in raw_block["id"]:
-            return DebugPrintBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-                expected_vars=len(variable_name_list),
-            )
-        elif block_type == "block-time" and "seconds" in raw_block["id"]:
-            return TimerBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-                time_multiplier=1,
-            )
-        elif block_type == "block-time" and "minutes" in raw_block["id"]:
-            return TimerBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-                time_multiplier=60,
-            )
-        elif block_type.startswith("block-move") and "to-pos" in raw_block["id"]:
-            return MoveToPositionBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-pos":
-            return PositionBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-calc":
-            return CalculationBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        elif block_type == "block-measure":
-            return MeasurementBlock(
-                block_id=raw_block["id"],
-                text=raw_block["text"],
-                variables=variable_name_list,
-                children=children,
-            )
-        else:
+        block: Block = self.__create_block(raw_block, registered, variable_name_list, children)
+
+        if block.NUMERIC_VARIABLES:
+            for variable in block_variables:
+                if not variable.is_number():
+                    raise FalseTypeError(
+                        f"The variable '{variable.name}' is not a number: {variable.value}", block_id=block.block_id
+                    )
+        return block
+
+    def __create_block(self, raw_block: dict, registered: tuple[type, dict] | None, variable_name_list: list[str], children: list) -> Block:
+        """
+        creates the concrete block object of the class that is registered for the kind of the block
+        args:
+            raw_block (dict): dictionary representing the block data from json
+            registered (tuple[type, dict] | None): the registered class and its arguments, None if the kind is unknown
+            variable_name_list (list[str]): names of the variables of the block
+            children (list): the already created children of the block
+        returns:
+            Block: an instance of the appropriate block type based on the block data
+        """
+        if registered is None:
             return Block(
                 block_id=raw_block["id"],
                 text=raw_block["text"],
@@ -160,10 +120,19 @@ class Loader:
                 expected_vars=0,
             )
 
+        block_class, arguments = registered
+        return block_class(
+            block_id=raw_block["id"],
+            text=raw_block["text"],
+            variables=variable_name_list,
+            children=children,
+            **arguments,
+        )
+
     @property
     def blocks(self) -> list[Block]:
         return self.__blocks
 
     @property
-    def variables(self) -> list[Variable]:
-        return self.__variable_list
+    def variables(self) -> VariableTable:
+        return self.__variable_table
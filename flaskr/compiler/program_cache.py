@@ -0,0 +1,111 @@
+"""Module that keeps loaded programs in memory, so that a program which is sent again does not have to be loaded again"""
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from flaskr.compiler.loader import Loader
+
+
+class ProgramCache:
+    """
+    bounded LRU cache of loaded programs, the key is a hash of the canonicalized program.
+    A loaded program keeps the state of its blocks and variables, so it is checked out while it is executed
+    and checked in (and reset) afterwards; a program that is checked out at the moment is loaded again
+    """
+    # run.js gives every number typed into a block a new variable named "var" + Date.now()
+    LITERAL_NAME: re.Pattern = re.compile(r"^var\d+$")
+
+    def __init__(self, max_size: int = 32) -> None:
+        self.__max_size: int = max_size
+        self.__entries: OrderedDict[str, Loader] = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    @staticmethod
+    def canonicalize(raw_blocks: list[dict]) -> list[dict]:
+        """
+        renames the generated variables in the order in which they appear,
+        so the same program gets the same form each time it is sent
+        args:
+            raw_blocks (list[dict]): the program, as it was sent by the client
+        returns:
+            list[dict]: a copy of the program with the renamed variables
+        """
+        names: dict[str, str] = {}
+        renamed: list[dict] = []
+
+        # the blocks are copied in the order in which they appear, with an own stack instead of recursion
+        stack: list[tuple[dict, list[dict]]] = [(raw_block, renamed) for raw_block in reversed(raw_blocks)]
+        while stack:
+            raw_block, siblings = stack.pop()
+            variables: list[dict] = []
+            for variable in raw_block.get("variables", []):
+                variable = dict(variable)
+                if ProgramCache.LITERAL_NAME.match(variable["text"] or ""):
+                    # a dot can not be used in the names of the variables in the frontend
+                    name: str = names.setdefault(variable["text"], f"literal.{len(names)}")
+                    variable["text"] = name
+                    variable["id"] = f"block-get-{name}-pos"
+                variables.append(variable)
+
+            copy: dict = dict(raw_block, variables=variables, children=[])
+            siblings.append(copy)
+            for child in reversed(raw_block.get("children", [])):
+                stack.append((child, copy["children"]))
+        return renamed
+
+    @staticmethod
+    def key(raw_blocks: list[dict]) -> str:
+        """
+        returns:
+            str: the hash of an already canonicalized program
+        """
+        dump: str = json.dumps(raw_blocks, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(dump.encode("utf-8")).hexdigest()
+
+    def checkout(self, raw_blocks: list[dict]) -> tuple[str, Loader]:
+        """
+        returns the loaded program from the cache or loads it
+        args:
+            raw_blocks (list[dict]): the program, as it was sent by the client
+        returns:
+            tuple[str, Loader]: the key of the program, which is needed to check it in again, and the loaded program
+        """
+        canonical: list[dict] = ProgramCache.canonicalize(raw_blocks)
+        key: str = ProgramCache.key(canonical)
+
+        with self.__lock:
+            loader: Loader | None = self.__entries.pop(key, None)
+            if loader is not None:
+                self.__hits += 1
+                return key, loader
+            self.__misses += 1
+
+        return key, Loader(canonical)
+
+    def checkin(self, key: str, loader: Loader) -> None:
+        """
+        puts an executed program back into the cache, the least recently used program is removed if the cache is full
+        args:
+            key (str): the key returned by checkout
+            loader (Loader): the program returned by checkout
+        """
+        loader.reset()
+        with self.__lock:
+            self.__entries[key] = loader
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "size": len(self.__entries),
+                "max_size": self.__max_size,
+            }
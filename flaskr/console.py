@@ -0,0 +1,119 @@
+"""A module with the console output of the programs, it is kept in a ring buffer and sent to the clients in batches"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import islice
+
+from flask_socketio import SocketIO
+
+
+class ConsoleStream:
+    """
+    the lines are numbered, the newest ones stay in a ring buffer for the clients that connect later.
+    A thread sends the new lines at most every FLUSH_INTERVAL as one message, so a loop that prints in every iteration
+    costs one message per interval instead of one per iteration; after MAX_BATCH lines they are sent at once,
+    so no line leaves the ring buffer before it was sent.
+    A message is {"stream": id, "first": number of its first line, "lines": [...]}; a client skips the lines
+    it already has, the id changes when the server restarts and the numbers start at 0 again
+    """
+    REPLAY_LINES: int = 500
+    FLUSH_INTERVAL: float = 0.1
+    MAX_BATCH: int = 200
+
+    def __init__(self, socket_io: SocketIO, echo: bool = True, replay_lines: int = REPLAY_LINES,
+                 flush_interval: float = FLUSH_INTERVAL) -> None:
+        """
+        args:
+            socket_io (SocketIO): the batches are emitted on it
+            echo (bool): whether the lines are printed on the server as well
+            replay_lines (int): the number of lines a client gets when it connects, at least MAX_BATCH
+            flush_interval (float): the time in seconds the lines are collected before they are sent
+        """
+        self.__socket_io: SocketIO = socket_io
+        self.__echo: bool = echo
+        self.__flush_interval: float = flush_interval
+        self.__stream: str = uuid.uuid4().hex
+
+        self.__lines: deque = deque(maxlen=max(replay_lines, ConsoleStream.MAX_BATCH))
+        # the number of the next line and of the first line that was not sent yet
+        self.__next: int = 0
+        self.__flushed: int = 0
+        self.__condition: threading.Condition = threading.Condition()
+        self.__batches: int = 0
+
+        threading.Thread(target=self.__run, daemon=True).start()
+
+    def write(self, line: str) -> None:
+        """
+        adds a line, it is sent with the next batch
+        args:
+            line (str): the text of the line
+        """
+        with self.__condition:
+            self.__lines.append(line)
+            self.__next += 1
+            if self.__next - self.__flushed >= ConsoleStream.MAX_BATCH:
+                self.__send()
+            else:
+                self.__condition.notify()
+        if self.__echo:
+            print(line)
+
+    def replay(self) -> dict:
+        """
+        returns:
+            dict: a message with all lines in the ring buffer, for a client that just connected
+        """
+        with self.__condition:
+            return self.__batch(self.__next - len(self.__lines))
+
+    def flush(self) -> None:
+        """
+        sends the lines that were not sent yet
+        """
+        with self.__condition:
+            self.__send()
+
+    @property
+    def stats(self) -> dict:
+        """
+        returns:
+            dict: the number of lines that were written and of the batches they were sent in
+        """
+        return {"lines": self.__next, "batches": self.__batches}
+
+    def __send(self) -> None:
+        """
+        called with the condition held, so two batches can not overtake each other;
+        the socket is the broadcaster, its emit returns at once
+        """
+        batch: dict = self.__batch(self.__flushed)
+        self.__flushed = self.__next
+        if batch["lines"]:
+            self.__socket_io.emit("console", batch)
+            self.__batches += 1
+
+    def __batch(self, first: int) -> dict:
+        """
+        called with the condition held
+        args:
+            first (int): the number of the first line, lines that already left the ring buffer are left out
+        returns:
+            dict: the message with the lines from first on
+        """
+        oldest: int = self.__next - len(self.__lines)
+        first = max(first, oldest)
+        return {"stream": self.__stream, "first": first, "lines": list(islice(self.__lines, first - oldest, None))}
+
+    def __run(self) -> None:
+        """
+        the loop of the thread, it waits for a line and sends it together with the lines of the following interval
+        """
+        while True:
+            with self.__condition:
+                while self.__flushed == self.__next:
+                    self.__condition.wait()
+            time.sleep(self.__flush_interval)
+            self.flush()
@@ -0,0 +1,97 @@
+"""A module that allows a running program to be cancelled, paused and resumed from another thread"""
+
+import time
+import threading
+
+from flaskr.server_error import ExecutionCancelledError
+
+
+class ExecutionControl:
+    """
+    Cooperative control of a running program.
+    The interpreter checks it at every block boundary and inside the timers,
+    the motor controller inside its stepping loops; they only read the attribute 'interrupted',
+    which is true as soon as the program is paused or cancelled
+    """
+
+    def __init__(self) -> None:
+        self.__condition: threading.Condition = threading.Condition()
+        self.__cancelled: bool = False
+        self.__paused: bool = False
+        self.interrupted: bool = False
+
+    def cancel(self) -> None:
+        """cancels the program, also if it is paused at the moment"""
+        with self.__condition:
+            self.__cancelled = True
+            self.interrupted = True
+            self.__condition.notify_all()
+
+    def pause(self) -> None:
+        """pauses the program at the next block boundary, timer wait or step"""
+        with self.__condition:
+            if not self.__cancelled:
+                self.__paused = True
+                self.interrupted = True
+
+    def resume(self) -> None:
+        """continues a paused program where it was paused"""
+        with self.__condition:
+            self.__paused = False
+            self.interrupted = self.__cancelled
+            self.__condition.notify_all()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__cancelled
+
+    @property
+    def paused(self) -> bool:
+        return self.__paused
+
+    def wait_while_paused(self) -> bool:
+        """
+        blocks as long as the program is paused
+        returns:
+            bool: false if the program was cancelled
+        """
+        with self.__condition:
+            while self.__paused and not self.__cancelled:
+                self.__condition.wait()
+            return not self.__cancelled
+
+    def checkpoint(self) -> None:
+        """
+        called at every block boundary, waits while the program is paused
+        raises:
+            ExecutionCancelledError: if the program was cancelled
+        """
+        if self.interrupted and not self.wait_while_paused():
+            raise ExecutionCancelledError("The program was cancelled")
+
+    def wait(self, seconds: float) -> None:
+        """
+        waits the given time, but wakes up immediately if the program is cancelled;
+        the time in which the program is paused does not count
+        args:
+            seconds (float): time to wait
+        raises:
+            ExecutionCancelledError: if the program was cancelled
+        """
+        deadline: float = time.monotonic() + seconds
+        with self.__condition:
+            while True:
+                if self.__cancelled:
+                    raise ExecutionCancelledError("The program was cancelled")
+
+                if self.__paused:
+                    paused_at: float = time.monotonic()
+                    while self.__paused and not self.__cancelled:
+                        self.__condition.wait()
+                    deadline += time.monotonic() - paused_at
+                    continue
+
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self.__condition.wait(remaining)
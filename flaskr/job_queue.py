@@ -0,0 +1,206 @@
+"""A module that queues the submitted programs and executes them one after another on a single worker thread"""
+
+import time
+import heapq
+import itertools
+import threading
+from typing import Callable
+
+from flaskr.server_error import ServerError, ExecutionCancelledError
+from flaskr.execution_control import ExecutionControl
+
+
+class Job:
+    """
+    a submitted program together with its priority, status and timing
+    """
+    QUEUED: str = "queued"
+    RUNNING: str = "running"
+    PAUSED: str = "paused"
+    FINISHED: str = "finished"
+    FAILED: str = "failed"
+    CANCELLED: str = "cancelled"
+
+    def __init__(self, job_id: int, program: list[dict], priority: int) -> None:
+        self.job_id: int = job_id
+        self.program: list[dict] = program
+        self.priority: int = priority
+        self.status: str = Job.QUEUED
+        self.error: dict = None
+        self.control: ExecutionControl = ExecutionControl()
+
+        self.submitted_at: float = time.time()
+        self.started_at: float = None
+        self.finished_at: float = None
+
+    def is_done(self) -> bool:
+        """
+        returns:
+            bool: true if the job will not run (anymore)
+        """
+        return self.status in (Job.FINISHED, Job.FAILED, Job.CANCELLED)
+
+    def to_dict(self) -> dict:
+        """
+        returns:
+            dict: the job in a form that can be sent to the client, without the program itself
+        """
+        now: float = time.time()
+        wait_end: float = self.started_at or self.finished_at or now
+        return {
+            "id": self.job_id,
+            "priority": self.priority,
+            "status": Job.PAUSED if self.status == Job.RUNNING and self.control.paused else self.status,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_time": wait_end - self.submitted_at,
+            "run_time": (self.finished_at or now) - self.started_at if self.started_at else None,
+        }
+
+
+class JobQueue:
+    """
+    priority queue of jobs, which are executed one after another by one worker thread that lives as long as the server;
+    a lower number is a higher priority, jobs with the same priority run in the order they were submitted
+    """
+    PRIORITY_MANUAL: int = 0
+    PRIORITY_PROGRAM: int = 10
+
+    def __init__(self, executor: Callable[[Job], None], max_history: int = 100) -> None:
+        """
+        args:
+            executor (Callable[[Job], None]): executes the program of a job, raises an exception if it fails
+            max_history (int): number of finished jobs that are kept so that their status can still be read
+        """
+        self.__executor: Callable[[Job], None] = executor
+        self.__max_history: int = max_history
+
+        self.__jobs: dict[int, Job] = {}
+        self.__heap: list[tuple[int, int, Job]] = []
+        self.__ids: itertools.count = itertools.count(1)
+        self.__condition: threading.Condition = threading.Condition()
+        self.__current: Job = None
+
+        self.__worker: threading.Thread = threading.Thread(target=self.__work, daemon=True)
+        self.__worker.start()
+
+    def submit(self, program: list[dict], priority: int = PRIORITY_PROGRAM) -> Job:
+        """
+        adds a program to the queue
+        args:
+            program (list[dict]): the program, as it was sent by the client
+            priority (int): the priority of the job
+        returns:
+            Job: the new job
+        """
+        with self.__condition:
+            job: Job = Job(next(self.__ids), program, priority)
+            self.__jobs[job.job_id] = job
+            heapq.heappush(self.__heap, (priority, job.job_id, job))
+            self.__forget_old_jobs()
+            self.__condition.notify()
+        return job
+
+    def cancel(self, job_id: int) -> Job | None:
+        """
+        cancels a job, a running job stops at its next block boundary, timer wait or step
+        args:
+            job_id (int): the id of the job
+        returns:
+            Job | None: the job, None if there is no job with this id
+        """
+        with self.__condition:
+            job: Job = self.__jobs.get(job_id)
+            if job is not None and job.status == Job.QUEUED:
+                # the worker skips it when it comes to it
+                job.status = Job.CANCELLED
+                job.finished_at = time.time()
+            elif job is not None and job.status == Job.RUNNING:
+                job.control.cancel()
+            return job
+
+    def pause(self, job_id: int) -> Job | None:
+        """
+        pauses a running job, it keeps its whole state and can be resumed
+        args:
+            job_id (int): the id of the job
+        returns:
+            Job | None: the job, None if there is no job with this id
+        """
+        job: Job = self.get(job_id)
+        if job is not None and job.status == Job.RUNNING:
+            job.control.pause()
+        return job
+
+    def resume(self, job_id: int) -> Job | None:
+        """
+        resumes a paused job
+        args:
+            job_id (int): the id of the job
+        returns:
+            Job | None: the job, None if there is no job with this id
+        """
+        job: Job = self.get(job_id)
+        if job is not None:
+            job.control.resume()
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        with self.__condition:
+            return self.__jobs.get(job_id)
+
+    @property
+    def jobs(self) -> list[Job]:
+        with self.__condition:
+            return list(self.__jobs.values())
+
+    @property
+    def current(self) -> Job | None:
+        return self.__current
+
+    def __forget_old_jobs(self) -> None:
+        """
+        removes the oldest finished jobs if more than max_history are kept
+        """
+        done: list[Job] = [job for job in self.__jobs.values() if job.is_done()]
+        for job in done[:max(0, len(done) - self.__max_history)]:
+            del self.__jobs[job.job_id]
+
+    def __next_job(self) -> Job:
+        """
+        waits for the next job that was not cancelled
+        """
+        with self.__condition:
+            while True:
+                while not self.__heap:
+                    self.__condition.wait()
+                _, _, job = heapq.heappop(self.__heap)
+                if job.status == Job.QUEUED:
+                    job.status = Job.RUNNING
+                    job.started_at = time.time()
+                    self.__current = job
+                    return job
+
+    def __work(self) -> None:
+        """
+        the loop of the worker thread
+        """
+        while True:
+            job: Job = self.__next_job()
+            try:
+                self.__executor(job)
+                job.status = Job.FINISHED
+            except ExecutionCancelledError:
+                job.status = Job.CANCELLED
+            except ServerError as e:
+                job.status = Job.FAILED
+                job.error = {"error": e.message, "block_id": e.block_id, "error_code": e.error_code}
+            except Exception as e:
+                # the worker has to survive every error, otherwise no job would run anymore
+                job.status = Job.FAILED
+                job.error = {"error": f"Internal Server Error: {str(e)}", "block_id": None, "error_code": "InternalError"}
+            finally:
+                job.finished_at = time.time()
+                self.__current = None
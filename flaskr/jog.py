@@ -0,0 +1,163 @@
+"""A module that moves the robot by hand: the jog commands of the manual control go straight to a persistent worker thread"""
+
+import time
+import queue
+import threading
+
+from flask_socketio import SocketIO
+
+from flaskr.server_error import ErrorManager, ExecutionCancelledError
+from flaskr.execution_control import ExecutionControl
+from flaskr.robot_movement.robot import Robot
+
+
+class JogWorker:
+    """
+    a single worker thread that drives the jog commands of the manual control, without a program, loader or job.
+    A click moves an axis by a number of steps, holding a button moves the axis towards its limit until it is released;
+    the release cancels the move, so the motors brake at once.
+    The worker shares a lock with the job queue, so it never moves the robot while a program runs
+    """
+    # a held button has to repeat its command within this time, otherwise the axis stops (e.g. the connection is lost)
+    HOLD_TIMEOUT: float = 0.5
+    # clicks that are queued while the robot moves, more are dropped
+    MAX_PENDING: int = 16
+
+    def __init__(self, robot: Robot, motion_lock: threading.Lock, socket_io: SocketIO) -> None:
+        """
+        args:
+            robot (Robot): the robot that is moved
+            motion_lock (threading.Lock): held by everything that moves the robot
+            socket_io (SocketIO): to tell a client that the robot is busy
+        """
+        self.__robot: Robot = robot
+        self.__motion_lock: threading.Lock = motion_lock
+        self.__socket_io: SocketIO = socket_io
+        self.__commands: queue.Queue = queue.Queue(JogWorker.MAX_PENDING)
+
+        self.__condition: threading.Condition = threading.Condition()
+        # axis and direction of the button that is held, None if no button is held
+        self.__hold: tuple[str, int] = None
+        # session id of the client that holds the button
+        self.__holder: str = None
+        self.__deadline: float = 0.0
+        # control of the move that runs at the moment
+        self.__control: ExecutionControl = None
+
+        threading.Thread(target=self.__work, daemon=True).start()
+        threading.Thread(target=self.__watch, daemon=True).start()
+
+    def jog(self, axis: str, delta: int, speed: float = 100, sid: str = None) -> bool:
+        """
+        moves one axis by the given number of steps, clicks during a move are driven after it
+        args:
+            axis (str): 'X', 'Y' or 'Z'
+            delta (int): number of steps, the sign gives the direction
+            speed (float): percentage of the maximum speed
+            sid (str): session id of the client that clicked, it is told if the robot is busy
+        returns:
+            bool: false if too many clicks are waiting and this one was dropped
+        """
+        try:
+            self.__commands.put_nowait((axis, delta, speed, sid))
+            return True
+        except queue.Full:
+            return False
+
+    def start(self, axis: str, direction: int, speed: float = 100, sid: str = None) -> None:
+        """
+        starts to move the axis towards its limit, the client repeats it while the button is held
+        args:
+            axis (str): 'X', 'Y' or 'Z'
+            direction (int): 1 or -1
+            speed (float): percentage of the maximum speed
+            sid (str): session id of the client that holds the button
+        """
+        hold: tuple[str, int] = (axis, 1 if direction > 0 else -1)
+        with self.__condition:
+            self.__deadline = time.monotonic() + JogWorker.HOLD_TIMEOUT
+            if self.__hold == hold and self.__holder == sid:
+                return
+            self.__stop_hold()
+            self.__hold = hold
+            self.__holder = sid
+            self.__condition.notify_all()
+        try:
+            self.__commands.put_nowait((axis, None, speed, sid))
+        except queue.Full:
+            self.stop()
+
+    def stop(self, sid: str = None) -> None:
+        """
+        stops the held axis, the motors brake within a few milliseconds
+        args:
+            sid (str): only the button held by this client is released, e.g. when it disconnects; any button if None
+        """
+        with self.__condition:
+            if sid is None or sid == self.__holder:
+                self.__stop_hold()
+
+    def __stop_hold(self) -> None:
+        """called with the condition held"""
+        if self.__hold is not None:
+            self.__hold = None
+            self.__holder = None
+            if self.__control is not None:
+                self.__control.cancel()
+
+    def __watch(self) -> None:
+        """
+        stops a held axis if the client does not repeat its command in time
+        """
+        with self.__condition:
+            while True:
+                while self.__hold is None:
+                    self.__condition.wait()
+                remaining: float = self.__deadline - time.monotonic()
+                if remaining <= 0:
+                    print("[DEBUG] jog: the held button was not repeated in time, stopping")
+                    self.__stop_hold()
+                else:
+                    self.__condition.wait(remaining)
+
+    def __work(self) -> None:
+        """
+        the loop of the worker thread
+        """
+        while True:
+            axis, delta, speed, sid = self.__commands.get()
+            if not self.__motion_lock.acquire(blocking=False):
+                self.__socket_io.emit("jog_busy", {"data": "The robot can not be moved by hand while a program runs"}, to=sid)
+                continue
+
+            control: ExecutionControl = ExecutionControl()
+            try:
+                with self.__condition:
+                    if delta is None:
+                        if self.__hold is None or self.__hold[0] != axis:
+                            # the button was released before the move started
+                            continue
+                        delta = self.__distance_to_limit(axis, self.__hold[1])
+                    self.__control = control
+                self.__robot.control = control
+                if delta != 0:
+                    self.__robot.move_on_axis(axis, delta, speed)
+            except ExecutionCancelledError:
+                pass
+            except Exception as e:
+                ErrorManager.report(e)
+            finally:
+                with self.__condition:
+                    self.__control = None
+                self.__robot.control = None
+                self.__robot.sync_position()
+                self.__motion_lock.release()
+
+    def __distance_to_limit(self, axis: str, direction: int) -> int:
+        """
+        returns:
+            int: the steps from the current position to the limit of the axis in the given direction
+        """
+        min_limit, max_limit = Robot.LIMITS[axis]
+        position: int = getattr(self.__robot, axis.lower())
+        return (max_limit if direction > 0 else min_limit) - position
@@ -0,0 +1,47 @@
+"""Module with an emulation of the GPIO pins of the robot, so the motor controller can run and be measured without a Raspberry Pi"""
+from flaskr.robot_movement.motor_controller import MotorController
+from flaskr.robot_movement.pulse_backend import HIGH, LOW, RecordingBackend
+
+
+class GpioEmulator(RecordingBackend):
+    """
+    backend that records every edge like the RecordingBackend and moves a virtual axis with every pulse,
+    the endstop input of an axis closes when the axis reaches its endstop and opens again when it leaves it
+    """
+    def __init__(self, distances:dict[str, int], motors:dict[str, dict] = None) -> None:
+        """
+        args:
+            distances (dict[str, int]): the distance of every axis from its endstop in steps, 0 is at the endstop
+            motors (dict[str, dict]): the pins of every motor, those of the MotorController if none are given
+        """
+        super().__init__()
+        motors = motors or MotorController.MOTORS
+        self.distances:dict[str, int] = {axis: distances.get(axis, 0) for axis in motors}
+        # axis, direction pin, endstop pin and the level of the direction pin towards the endstop of every pulse pin
+        self.__axes:dict[int, tuple[str, int, int, int]] = {
+            pins["PUL"]: (
+                axis, pins["DIR"], pins["STOP"],
+                MotorController.DIR_TO_ENDSTOP if not pins["INVERT_DIR"] else MotorController.DIR_BACK
+            )
+            for axis, pins in motors.items()
+        }
+        for axis, pins in motors.items():
+            self.inputs[pins["STOP"]] = LOW if self.distances[axis] <= 0 else HIGH
+
+    def output(self, pin:int, level:int) -> None:
+        super().output(pin, level)
+        if level == HIGH and pin in self.__axes:
+            self.__step(pin)
+
+    def _write(self, pins:tuple[int, ...], level:int) -> None:
+        super()._write(pins, level)
+        if level == HIGH:
+            for pin in pins:
+                if pin in self.__axes:
+                    self.__step(pin)
+
+    def __step(self, pin:int) -> None:
+        """moves the axis of a pulse pin one step in the direction its direction pin is set to"""
+        axis, direction_pin, stop_pin, to_endstop = self.__axes[pin]
+        self.distances[axis] += -1 if self.levels.get(direction_pin) == to_endstop else 1
+        self.set_input(stop_pin, LOW if self.distances[axis] <= 0 else HIGH)
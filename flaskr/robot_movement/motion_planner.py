@@ -0,0 +1,162 @@
+"""Module that buffers the moves of a program and merges them before the robot drives them"""
+from flaskr.server_error import VariableNoneTyeError, RobotPositionError
+from flaskr.robot_movement.robot import Robot
+
+
+class MotionPlanner:
+    """
+    sits between the blocks and the robot and offers the same moves.
+    A move is not driven at once but kept as the pending move, the following moves are merged into it
+    as long as the path of the robot stays the same: a move on the same axis and in the same direction
+    as the pending move adds up with it, any other move drives the pending move first.
+    With merge_axes, X and Y moves one after another become one move in which both axes run together,
+    and X and Y moves that cancel out are not driven at all; the Z axis is never merged with another axis
+    and a Z move back is always driven, e.g. lifting before a move over the plate or dipping into a well.
+    The pending move is driven as soon as that is no longer possible, when the speed changes and before anything
+    observes the robot: reading the position (a condition, a calculation or a measurement with X, Y or Z),
+    a timer, a debug output and the end of the program
+    """
+    # the axes that may run together in one merged move, a diagonal move of them does not change the height
+    PLANAR_AXES:tuple[str, ...] = ("X", "Y")
+
+    def __init__(self, robot:Robot, merge_axes:bool = False) -> None:
+        """
+        args:
+            robot (Robot): the robot that drives the moves
+            merge_axes (bool): whether X and Y moves are merged into one diagonal move and may cancel out
+        """
+        self.__robot:Robot = robot
+        self.__merge_axes:bool = merge_axes
+        # steps of every axis of the move that is not driven yet, in the order the axes joined it
+        self.__pending:dict[str, int] = {}
+        self.__last_axis:str = None
+        self.__speed:float = 100
+
+        self.__requested_moves:int = 0
+        self.__requested_steps:int = 0
+        self.__moves:int = 0
+        self.__steps:int = 0
+
+    def move_on_axis(self, axis:str, value:int, speed:float = 100) -> None:
+        """
+        see Robot.move_on_axis, the move is driven later
+        raises:
+            RobotPositionError: if the move leaves the limits, the moves before it are driven first
+        """
+        if value is None:
+            raise VariableNoneTyeError("Variable is not defined, it's None")
+        axis = axis.upper()
+        self.__check_limits(axis, value)
+        self.__requested_moves += 1
+        self.__requested_steps += abs(value)
+
+        if self.__pending and not self.__joins(axis, value, speed):
+            self.flush()
+        self.__pending[axis] = self.__pending.get(axis, 0) + value
+        self.__last_axis = axis
+        self.__speed = speed
+
+    def __joins(self, axis:str, value:int, speed:float) -> bool:
+        """
+        args:
+            axis (str): the axis of the next move
+            value (int): the steps of the next move
+            speed (float): the speed of the next move
+        returns:
+            bool: whether the next move can be merged into the pending move without changing the path of the robot
+        """
+        if speed != self.__speed:
+            return False
+        planar:bool = self.__merge_axes and axis in MotionPlanner.PLANAR_AXES
+        if axis == self.__last_axis:
+            # a move back is a move of its own, unless X and Y may cancel out
+            return self.__pending[axis] * value >= 0 or planar
+        return planar and axis not in self.__pending and all(
+            pending in MotionPlanner.PLANAR_AXES for pending in self.__pending
+        )
+
+    def move_to_position(self, p_x:int, p_y:int, p_z:int, speed:float = 100) -> None:
+        """
+        see Robot.move_to_position, the move starts after the pending move and is driven later
+        """
+        for target in (p_x, p_y, p_z):
+            if target is None:
+                raise VariableNoneTyeError("Variable is not defined, it's None")
+        self.flush()
+        deltas:dict[str, int] = {"X": p_x - self.__robot.x, "Y": p_y - self.__robot.y, "Z": p_z - self.__robot.z}
+        for axis, value in deltas.items():
+            self.__check_limits(axis, value)
+        self.__requested_moves += 1
+        self.__requested_steps += sum(abs(value) for value in deltas.values())
+
+        self.__pending = deltas
+        # no other move can be merged into this one, because it already uses every axis
+        self.__last_axis = None
+        self.__speed = speed
+
+    def reset_pos(self) -> None:
+        self.flush()
+        self.__robot.reset_pos()
+
+    def flush(self) -> None:
+        """
+        drives the pending move
+        """
+        if not self.__pending:
+            return
+        deltas:dict[str, int] = {axis: value for axis, value in self.__pending.items() if value != 0}
+        self.__pending = {}
+        self.__last_axis = None
+        # moves that cancelled out are not driven at all
+        if deltas:
+            self.__moves += 1
+            self.__steps += sum(abs(value) for value in deltas.values())
+            self.__robot.move_axes(deltas, self.__speed)
+
+    def __check_limits(self, axis:str, value:int) -> None:
+        """
+        checks the target of a move from the position the robot will have after the pending move
+        raises:
+            RobotPositionError: if the target is not within the limits, after the pending move was driven
+        """
+        if axis not in Robot.AXIS_ATTRIBUTES:
+            raise ValueError("Axis must be one of 'X', 'Y', or 'Z'")
+
+        new_value:int = getattr(self.__robot, Robot.AXIS_ATTRIBUTES[axis]) + self.__pending.get(axis, 0) + value
+        min_limit, max_limit = Robot.LIMITS[axis]
+        if not min_limit <= new_value <= max_limit:
+            # the robot still gets as far as it did before the move that is not possible
+            self.flush()
+            raise RobotPositionError(
+                f"The value exceeds the limits of the possible movement of the robot ({axis}: {new_value})"
+            )
+
+    @property
+    def stats(self) -> dict:
+        """
+        returns:
+            dict: the moves and steps the program requested, the ones that were driven and how many were saved
+        """
+        return {
+            "requested_moves": self.__requested_moves,
+            "moves": self.__moves,
+            "moves_saved": self.__requested_moves - self.__moves,
+            "requested_steps": self.__requested_steps,
+            "steps": self.__steps,
+            "steps_saved": self.__requested_steps - self.__steps,
+        }
+
+    @property
+    def x(self) -> int:
+        self.flush()
+        return self.__robot.x
+
+    @property
+    def y(self) -> int:
+        self.flush()
+        return self.__robot.y
+
+    @property
+    def z(self) -> int:
+        self.flush()
+        return self.__robot.z
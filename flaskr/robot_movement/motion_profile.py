@@ -0,0 +1,176 @@
+"""Module that calculates the timing of the step pulses, so that the motors accelerate and brake instead of running at one fixed speed"""
+import functools
+import itertools
+import math
+
+# the fixed delay per half period that was used for every move, the motors reliably start from rest with it
+START_DELAY:float = 0.0001875
+
+
+class AxisLimits:
+    """
+    speed limits of one axis, all in steps per second
+    """
+    def __init__(self, start_speed:float, max_speed:float, acceleration:float) -> None:
+        """
+        args:
+            start_speed (float): speed the motor can start from and stop at without accelerating
+            max_speed (float): highest speed of the motor
+            acceleration (float): change of the speed per second, in steps per second squared
+        """
+        self.start_speed:float = start_speed
+        self.max_speed:float = max_speed
+        self.acceleration:float = acceleration
+
+
+START_SPEED:float = 1 / (2 * START_DELAY)
+
+# the limits of the axes, the Z axis carries the measuring head and moves slower
+AXIS_LIMITS:dict[str, AxisLimits] = {
+    "X": AxisLimits(START_SPEED, 4 * START_SPEED, 40000),
+    "Y": AxisLimits(START_SPEED, 4 * START_SPEED, 40000),
+    "Z": AxisLimits(START_SPEED, 2 * START_SPEED, 20000),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _ramp(start_speed:float, max_speed:float, acceleration:float) -> tuple[float, ...]:
+    """
+    the half period of every speed level until the maximum speed is reached, the same limits give the same ramp,
+    so it is only calculated for the first move with them
+    args:
+        start_speed (float): speed of the first level, in periods per second
+        max_speed (float): speed while cruising, in periods per second
+        acceleration (float): in periods per second squared
+    returns:
+        tuple[float, ...]: the half periods, in seconds
+    """
+    ramp:list[float] = []
+    speed:float = start_speed
+    while speed < max_speed:
+        ramp.append(1 / (2 * speed))
+        # the speed after one more period with constant acceleration: v² = v0² + 2a
+        speed = math.sqrt(speed * speed + 2 * acceleration)
+    return tuple(ramp)
+
+
+@functools.lru_cache(maxsize=256)
+def _ramp_times(start_speed:float, max_speed:float, acceleration:float) -> tuple[float, ...]:
+    """
+    args:
+        start_speed (float): speed of the first level, in periods per second
+        max_speed (float): speed while cruising, in periods per second
+        acceleration (float): in periods per second squared
+    returns:
+        tuple[float, ...]: the sum of the half periods of the first n levels at index n, so the duration of a move
+        does not have to add up its ramp
+    """
+    return tuple(itertools.accumulate(_ramp(start_speed, max_speed, acceleration), initial=0.0))
+
+
+class StepProfile:
+    """
+    trapezoidal velocity profile of one move: the move starts at the start speed, accelerates evenly up to the
+    maximum speed, cruises and brakes the same way down to the start speed at the end.
+    The profile is counted in step periods of the axis with the most steps; the speed level of a period is the
+    number of periods the motor has accelerated, it can brake from any level in as many periods
+    """
+    def __init__(self, start_speed:float, max_speed:float, acceleration:float) -> None:
+        """
+        args:
+            start_speed (float): speed of the first and the last period, in periods per second
+            max_speed (float): speed while cruising, in periods per second
+            acceleration (float): in periods per second squared
+        """
+        start_speed = min(start_speed, max_speed)
+
+        # half period of every speed level until the maximum speed is reached, the timing table of the move
+        self.ramp:tuple[float, ...] = _ramp(start_speed, max_speed, acceleration)
+        self.__ramp_times:tuple[float, ...] = _ramp_times(start_speed, max_speed, acceleration)
+        self.cruise:float = 1 / (2 * max_speed)
+
+    @property
+    def levels(self) -> int:
+        """the speed level at which the move cruises"""
+        return len(self.ramp)
+
+    def delay(self, level:int) -> float:
+        """
+        args:
+            level (int): the speed level, between 0 and levels
+        returns:
+            float: the duration of the high and of the low phase of the pulse at this level, in seconds
+        """
+        return self.ramp[level] if level < len(self.ramp) else self.cruise
+
+    def level(self, period:int, periods:int) -> int:
+        """
+        args:
+            period (int): a step period of a move that starts and ends at rest
+            periods (int): number of step periods of the move
+        returns:
+            int: the speed level of the period
+        """
+        return min(period, periods - period - 1, self.levels)
+
+    def delays(self, periods:int) -> list[float]:
+        """
+        the timing table of a move that starts and ends at rest
+        args:
+            periods (int): number of step periods of the move
+        returns:
+            list[float]: the half period of every step period
+        """
+        ramp_levels:int = min(self.levels, periods // 2)
+        ramp:list[float] = list(self.ramp[:ramp_levels])
+        return ramp + [self.delay(ramp_levels)] * (periods - 2 * ramp_levels) + ramp[::-1]
+
+    def braking(self, level:int) -> list[float]:
+        """
+        args:
+            level (int): the speed level of the period in which the motors start to brake
+        returns:
+            list[float]: the half periods of the step periods it takes to get down to the start speed
+        """
+        return [self.delay(braking_level) for braking_level in range(level, -1, -1)]
+
+    def duration(self, periods:int) -> float:
+        """
+        args:
+            periods (int): number of step periods of the move
+        returns:
+            float: the time the move takes if it is not interrupted, in seconds
+        """
+        # the move accelerates and brakes over the same levels, a short move never reaches the maximum speed
+        ramp_levels:int = min(self.levels, periods // 2)
+        middle:float = self.delay(ramp_levels)
+        return 2 * (2 * self.__ramp_times[ramp_levels] + (periods - 2 * ramp_levels) * middle)
+
+
+def plan_move(steps:dict[str, int], speed:float = 100) -> tuple[int, StepProfile]:
+    """
+    calculates the profile of a move in which all axes run at the same time,
+    the limits of every axis are scaled to the periods of the axis with the most steps
+    args:
+        steps (dict[str, int]): number of steps of every axis
+        speed (float): percentage of the maximum speed, the feedrate requested by the program
+    returns:
+        tuple[int, StepProfile]: number of step periods and the profile of the move
+    """
+    periods:int = max(steps.values(), default=0)
+    start_speed:float = math.inf
+    max_speed:float = math.inf
+    acceleration:float = math.inf
+    for axis, axis_steps in steps.items():
+        if axis_steps == 0:
+            continue
+        # an axis that has fewer steps than the longest one gets fewer pulses per period
+        ratio:float = periods / axis_steps
+        limits:AxisLimits = AXIS_LIMITS[axis]
+        start_speed = min(start_speed, limits.start_speed * ratio)
+        max_speed = min(max_speed, limits.max_speed * ratio)
+        acceleration = min(acceleration, limits.acceleration * ratio)
+
+    if periods == 0:
+        return 0, StepProfile(START_SPEED, START_SPEED, 0)
+    return periods, StepProfile(start_speed, max_speed * speed / 100, acceleration)
@@ -1,38 +1,56 @@
 """Module that provides control of the motors"""
 from typing import Literal
 import time
-import threading
-import RPi.GPIO as GPIO
+from flaskr.execution_control import ExecutionControl
+from flaskr.robot_movement.motion_profile import AXIS_LIMITS, START_SPEED, StepProfile, plan_move
+from flaskr.robot_movement.pulse_backend import HIGH, LOW, PulseBackend, PulseTrain, GpioBackend
 
 class MotorController:
     """
-    it controls the individual motors and is the last step before it affects the hardware
+    it controls the individual motors and is the last step before it affects the hardware,
+    the pulses are put out by a backend (see pulse_backend)
     """
 
     #TODO See how it is with these variables, because they are defined twice
-    DIR_TO_ENDSTOP: Literal[1] = GPIO.HIGH
-    DIR_BACK: Literal[0] = GPIO.LOW
+    DIR_TO_ENDSTOP: Literal[1] = HIGH
+    DIR_BACK: Literal[0] = LOW
 
-    STEP_DELAY:float = 0.0001875
+    # the homing approaches the endstops at this part of the maximum speed, it stops without braking when one is reached
+    HOMING_APPROACH:float = 0.5
+    # steps the axes back off from the endstops before they probe them again, slowly, in steps per second
+    HOMING_BACKOFF:int = 200
+    HOMING_PROBE_SPEED:float = START_SPEED / 4
+    # pause after the endstops were reached
+    HOMING_PAUSE:float = 0.05
+    # the homing does not know how far the endstops are, its pulses are calculated in parts of this many step periods
+    HOMING_CHUNK:int = 4096
+    # steps every axis drives back from its endstop after the homing
+    HOME_POSITION:dict[str, int] = {"X": 800, "Y": 800, "Z": 30000}
 
-    def __init__(self):
+    # the pins of every motor, the GPIO emulator uses the same table
+    MOTORS:dict[str, dict] = {
+        "X": {"ENA": 22, "PUL": 16, "DIR": 18, "STOP": 11, "INVERT_DIR": False},
+        "Y": {"ENA": 33, "PUL": 32, "DIR": 31, "STOP": 13, "INVERT_DIR": True},
+        "Z": {"ENA": 37, "PUL": 36, "DIR": 35, "STOP": 15, "INVERT_DIR": False},
+    }
+
+    def __init__(self, backend:PulseBackend = None):
+        """
+        args:
+            backend (PulseBackend): puts out the pulses, the GPIO pins of the Raspberry Pi if none is given
+        """
         #TODO Encapsulate and type all variable types
-        GPIO.setmode(GPIO.BOARD)
-        GPIO.setwarnings(False)
+        self.__backend:PulseBackend = backend or GpioBackend()
 
         self.__positions:dict = {"X": 0, "Y": 0, "Z": 0}
 
-        self.motors = {
-            "X": {"ENA": 22, "PUL": 16, "DIR": 18, "STOP": 11, "INVERT_DIR": False},
-            "Y": {"ENA": 33, "PUL": 32, "DIR": 31, "STOP": 13, "INVERT_DIR": True},
-            "Z": {"ENA": 37, "PUL": 36, "DIR": 35, "STOP": 15, "INVERT_DIR": False},
-        }
+        self.motors = {axis: dict(pins) for axis, pins in MotorController.MOTORS.items()}
 
         for pins in self.motors.values():
-            GPIO.setup(pins["DIR"], GPIO.OUT)
-            GPIO.setup(pins["PUL"], GPIO.OUT)
-            GPIO.setup(pins["ENA"], GPIO.OUT)
-            GPIO.setup(pins["STOP"], GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            self.__backend.setup_output(pins["DIR"])
+            self.__backend.setup_output(pins["PUL"])
+            self.__backend.setup_output(pins["ENA"])
+            self.__backend.setup_input(pins["STOP"])
 
     @property
     def positions(self) -> dict:
@@ -42,121 +60,297 @@ class MotorController:
     def positions(self, positions:dict):
         self.__positions = positions
 
-    def step_motor(self, steps:int, axis:str, direction:int):
+    @property
+    def progress(self) -> int:
+        """
+        can be read by another thread while a move runs, see pulses for the steps of every axis
+        returns:
+            int: the step periods of the running or last move that were put out so far
+        """
+        return self.__backend.progress[0]
+
+    def reset_progress(self) -> None:
+        """
+        sets the progress back to 0, called before a move starts
+        """
+        self.__backend.progress[0] = 0
+
+    def step_motor(self, steps:int, axis:str, direction:int, control:ExecutionControl = None, speed:float = 100) -> int:
         """
         moves the motor a given number of steps along the specified axis and updates its position
         args:
             steps (int): number of steps to move the motor
             axis (str): axis identifier (e.g. 'x', 'y', 'z')
             direction (int): direction of movement, 1 is to endstop, o in the other direction
+            control (ExecutionControl): checked before every step, the motor holds while paused and stops if cancelled
+            speed (float): percentage of the maximum speed
+        returns:
+            int: the number of steps that were driven, less than steps if the move was cancelled
         """
-        pins = self.motors[axis]
-        GPIO.output(pins["ENA"], MotorController.DIR_BACK)
-        GPIO.output(pins["DIR"], direction)
-
-        for _ in range(steps):
-            GPIO.output(pins["PUL"], MotorController.DIR_TO_ENDSTOP)
-            time.sleep(self.STEP_DELAY)
-            GPIO.output(pins["PUL"], MotorController.DIR_BACK)
-            time.sleep(self.STEP_DELAY)
-
-            #Turning back to saved positions might differ in terms of direction depending on the used modele
-            if axis == "Y":
-                if direction == (self.DIR_BACK if not pins["INVERT_DIR"] else MotorController.DIR_TO_ENDSTOP):
-                    self.__positions[axis] += 1
-                else:
-                    self.__positions[axis] -= 1
-            else:
-                if direction == (self.DIR_BACK if not pins["INVERT_DIR"] else MotorController.DIR_TO_ENDSTOP):
-                    self.__positions[axis] -= 1
-                else:
-                    self.__positions[axis] += 1
+        return self.move_axes({axis: (steps, direction)}, control, speed)[axis]
 
-        GPIO.output(pins["ENA"], MotorController.DIR_TO_ENDSTOP)
+    def move_axes(self, moves:dict[str, tuple[int, int]], control:ExecutionControl = None, speed:float = 100) -> dict[str, int]:
+        """
+        moves several axes at the same time; like the points of a line in the Bresenham algorithm,
+        the axis with the most steps gets a pulse in every step period and the other axes evenly distributed in between,
+        so the move takes as many step periods as the longest axis needs and all axes arrive together.
+        The motors accelerate and brake along a trapezoidal profile (see motion_profile),
+        the pulses of the whole move are calculated before the backend plays them
+        args:
+            moves (dict[str, tuple[int, int]]): number of steps and direction (1 is to endstop) of each axis
+            control (ExecutionControl): checked before every step period, the motors brake and hold while paused
+                                        and brake and stop if cancelled
+            speed (float): percentage of the maximum speed
+        returns:
+            dict[str, int]: the number of steps that were driven on each axis, less than requested if the move was cancelled
+        """
+        control = control or ExecutionControl()
+        driven:dict[str, int] = {axis: 0 for axis in moves}
+        # (axis, steps, direction, pulse pin) of every axis that has to move
+        axes:list[tuple[str, int, int, int]] = [
+            (axis, steps, direction, self.motors[axis]["PUL"]) for axis, (steps, direction) in moves.items() if steps > 0
+        ]
+        periods, profile = plan_move({axis: steps for axis, steps, _, _ in axes}, speed)
+
+        for axis, _, direction, _ in axes:
+            self.__backend.output(self.motors[axis]["ENA"], MotorController.DIR_BACK)
+            self.__backend.output(self.motors[axis]["DIR"], direction)
+
+        period:int = 0
+        while period < periods:
+            if control.interrupted and not control.wait_while_paused():
+                break
+            # the rest of the move, after a pause the motors start from rest again
+            remaining:int = periods - period
+            train:PulseTrain = self.__pulse_train(axes, periods, period, profile.delays(remaining))
+            played:int = self.__backend.play(train, control)
+            period = self.__count_steps(axes, periods, period, played, driven)
+
+            if played < remaining:
+                # braking takes as many periods as the motors have accelerated, so no step is lost
+                braking:list[float] = profile.braking(profile.level(played, remaining))[:periods - period]
+                train = self.__pulse_train(axes, periods, period, braking)
+                period = self.__count_steps(axes, periods, period, self.__backend.play(train), driven)
+
+        for axis, _, _, _ in axes:
+            self.__backend.output(self.motors[axis]["ENA"], MotorController.DIR_TO_ENDSTOP)
+        return driven
 
-    def _drive_single_axis(self, axis:str):
+    @staticmethod
+    def pulses(steps:int, periods:int, period:int) -> int:
         """
-        drives a single motor axis to its endstop, sets it as reference, and moves it back slightly
         args:
-            axis (str): axis identifier to drive (e.g. 'x', 'y', 'z')
+            steps (int): steps of an axis in the whole move
+            periods (int): number of step periods of the move
+            period (int): a step period of the move
+        returns:
+            int: the number of pulses the axis gets before this period, the error term of the Bresenham algorithm
+                 starts in the middle, that spreads the steps evenly
         """
-        pins = self.motors[axis]
-        GPIO.output(pins["ENA"], MotorController.DIR_BACK)
-        GPIO.output(pins["DIR"], MotorController.DIR_TO_ENDSTOP if not pins["INVERT_DIR"] else self.DIR_BACK)
+        return (periods // 2 + steps * period) // periods
+
+    def __pulse_train(self, axes:list[tuple[str, int, int, int]], periods:int, first:int, delays:list[float]) -> PulseTrain:
+        """
+        calculates which axes get a pulse in which step period
+        args:
+            axes (list[tuple[str, int, int, int]]): axis, steps, direction and pulse pin of every moving axis
+            periods (int): number of step periods of the whole move
+            first (int): the step period of the move at which the train starts
+            delays (list[float]): half period of every step period of the train
+        returns:
+            PulseTrain: the pulses
+        """
+        pins:list[int] = [pin for _, _, _, pin in axes]
+        # the group of a step period is the bit mask of the axes that get a pulse
+        train:PulseTrain = PulseTrain([
+            tuple(pin for i, pin in enumerate(pins) if mask >> i & 1) for mask in range(1 << len(pins))
+        ])
+        train.delays.extend(delays)
+        train.first = first
 
-        # Drive until limit switch
-        while GPIO.input(pins["STOP"]) == MotorController.DIR_TO_ENDSTOP:
-            GPIO.output(pins["PUL"], MotorController.DIR_TO_ENDSTOP)
-            time.sleep(self.STEP_DELAY)
-            GPIO.output(pins["PUL"], MotorController.DIR_BACK)
-            time.sleep(self.STEP_DELAY)
+        if all(steps == periods for _, steps, _, _ in axes):
+            # every axis gets a pulse in every period
+            train.groups.frombytes(bytes([(1 << len(pins)) - 1]) * len(delays))
+            return train
 
-        # Set reference point
-        self.__positions[axis] = 0
-        time.sleep(0.2)
+        steps:list[int] = [axis_steps for _, axis_steps, _, _ in axes]
+        errors:list[int] = [(periods // 2 + axis_steps * first) % periods for axis_steps in steps]
+        groups:bytearray = bytearray(len(delays))
+        for period in range(len(delays)):
+            mask:int = 0
+            for i, axis_steps in enumerate(steps):
+                errors[i] += axis_steps
+                if errors[i] >= periods:
+                    errors[i] -= periods
+                    mask |= 1 << i
+            groups[period] = mask
+        train.groups.frombytes(bytes(groups))
+        return train
 
-        # Drive back a bit
-        GPIO.output(pins["DIR"], self.DIR_BACK if not pins["INVERT_DIR"] else MotorController.DIR_TO_ENDSTOP)
-        steps_back = 30000 if axis == "Z" else 800
-        for _ in range(steps_back):
-            GPIO.output(pins["PUL"], MotorController.DIR_TO_ENDSTOP)
-            time.sleep(self.STEP_DELAY)
-            GPIO.output(pins["PUL"], MotorController.DIR_BACK)
-            time.sleep(self.STEP_DELAY)
-            self.__positions[axis] -= 1
+    def __count_steps(self, axes:list[tuple[str, int, int, int]], periods:int, first:int, played:int,
+                      driven:dict[str, int]) -> int:
+        """
+        updates the positions and the driven steps after a pulse train was played
+        args:
+            axes (list[tuple[str, int, int, int]]): axis, steps, direction and pulse pin of every moving axis
+            periods (int): number of step periods of the whole move
+            first (int): the step period of the move at which the train started
+            played (int): number of step periods that were played
+            driven (dict[str, int]): steps driven on each axis, updated in place
+        returns:
+            int: the step period after the last one that was played
+        """
+        for axis, steps, direction, _ in axes:
+            count:int = self.pulses(steps, periods, first + played) - self.pulses(steps, periods, first)
+            self.__count_step(axis, direction, count)
+            driven[axis] += count
+        return first + played
 
-        GPIO.output(pins["ENA"], MotorController.DIR_TO_ENDSTOP)
+    def __count_step(self, axis:str, direction:int, count:int = 1) -> None:
+        """
+        updates the position of an axis after steps in one direction
+        args:
+            axis (str): axis identifier (e.g. 'x', 'y', 'z')
+            direction (int): direction of the steps, 1 is to endstop
+            count (int): number of steps
+        """
+        pins = self.motors[axis]
+        #Turning back to saved positions might differ in terms of direction depending on the used modele
+        if axis == "Y":
+            if direction == (self.DIR_BACK if not pins["INVERT_DIR"] else MotorController.DIR_TO_ENDSTOP):
+                self.__positions[axis] += count
+            else:
+                self.__positions[axis] -= count
+        else:
+            if direction == (self.DIR_BACK if not pins["INVERT_DIR"] else MotorController.DIR_TO_ENDSTOP):
+                self.__positions[axis] -= count
+            else:
+                self.__positions[axis] += count
 
-    def drive_all_to_endstops(self, axes:list[str]):
+    def drive_all_to_endstops(self, axes:list[str], control:ExecutionControl = None) -> bool:
         """
-        drives all specified motor axes to their endstops using parallel threads
+        drives all specified motor axes to their endstops at the same time, sets them as reference and moves them back.
+        The axes approach the endstops fast, back off a little and probe them again slowly, so the reference
+        does not depend on the speed at which the endstop was hit; the endstops are detected by their edge
         args:
             axes (list): list of axis identifiers to drive (e.g. ['x', 'y', 'z'])
+            control (ExecutionControl): checked before every step period
+        returns:
+            bool: false if the homing was cancelled or an endstop was not found again
         """
-        #threads:list[threading.Thread] = []
+        control = control or ExecutionControl()
+        speeds:dict[str, float] = {axis: AXIS_LIMITS[axis].max_speed * MotorController.HOMING_APPROACH for axis in axes}
+        if not self.__approach(speeds, None, control):
+            return False
+        time.sleep(MotorController.HOMING_PAUSE)
+
+        backoff:int = MotorController.HOMING_BACKOFF
+        self.move_axes({axis: (backoff, self.__direction_back(axis)) for axis in axes}, control)
+        probe:dict[str, float] = {axis: MotorController.HOMING_PROBE_SPEED for axis in axes}
+        if not self.__approach(probe, 2 * backoff, control):
+            return False
+
+        # Set reference point
         for axis in axes:
-            self._drive_single_axis(axis)
-            #t = threading.Thread(target=self._drive_single_axis, args=(axis,))
-            #threads.append(t)
-            #t.start()
+            self.__positions[axis] = 0
+        time.sleep(MotorController.HOMING_PAUSE)
 
-        # wait until all threads are finished.
-        #for t in threads:
-        #    t.join()
+        # Drive back to the home position, all axes together and accelerated
+        driven:dict[str, int] = self.move_axes(
+            {axis: (MotorController.HOME_POSITION[axis], self.__direction_back(axis)) for axis in axes}, control
+        )
+        for axis in axes:
+            self.__positions[axis] = -driven[axis]
+        return True
+
+    def __direction_back(self, axis:str) -> int:
+        """the direction away from the endstop"""
+        return MotorController.DIR_BACK if not self.motors[axis]["INVERT_DIR"] else MotorController.DIR_TO_ENDSTOP
 
-    def move_all_axes_simultaneously(self, target_pos:dict):
+    def __approach(self, speeds:dict[str, float], limit:int | None, control:ExecutionControl) -> bool:
         """
-        moves all motor axes simultaneously to their target positions using threading
+        drives the axes towards their endstops until every endstop was reached, all axes in one pulse train;
+        the fastest axis gets a pulse in every step period, the others as often as their speed allows.
+        An axis stops as soon as the falling edge of its endstop is detected, an axis that already is at
+        its endstop does not move
+        args:
+            speeds (dict[str, float]): the axes and their speed in steps per second
+            limit (int | None): the number of step periods after which an endstop that was not reached counts as lost
+            control (ExecutionControl): checked before every step period, the axes stop while paused
+        returns:
+            bool: false if the homing was cancelled or an endstop was not reached within the limit
+        """
+        pending:list[str] = [axis for axis in speeds if self.__backend.input(self.motors[axis]["STOP"]) == HIGH]
+        for axis in pending:
+            self.__backend.watch_edge(self.motors[axis]["STOP"])
+            self.__backend.output(self.motors[axis]["ENA"], MotorController.DIR_BACK)
+            self.__backend.output(
+                self.motors[axis]["DIR"],
+                MotorController.DIR_TO_ENDSTOP if not self.motors[axis]["INVERT_DIR"] else self.DIR_BACK
+            )
+
+        fastest:float = max(speeds.values(), default=START_SPEED)
+        # the axes accelerate together, the acceleration of an axis that gets fewer pulses is scaled down
+        profile:StepProfile = StepProfile(
+            START_SPEED, fastest, min(AXIS_LIMITS[axis].acceleration * fastest / speeds[axis] for axis in speeds)
+        ) if speeds else None
+
+        chunk:int = MotorController.HOMING_CHUNK
+        period:int = 0
+        # step periods since the axes started from rest
+        accelerated:int = 0
+        try:
+            while pending and (limit is None or period < limit):
+                if control.interrupted:
+                    if not control.wait_while_paused():
+                        return False
+                    accelerated = 0
+
+                # (axis, pulses per chunk, direction, pulse pin), like a move of the chunk in which every axis runs at its speed
+                axes:list[tuple[str, int, int, int]] = [
+                    (axis, max(1, round(chunk * speeds[axis] / fastest)), 0, self.motors[axis]["PUL"]) for axis in pending
+                ]
+                periods:int = chunk if limit is None else min(chunk, limit - period)
+                delays:list[float] = [profile.delay(level) for level in range(accelerated, accelerated + periods)]
+                played, reached = self.__backend.play_until_edges(
+                    self.__pulse_train(axes, chunk, 0, delays), tuple(self.motors[axis]["STOP"] for axis in pending), control
+                )
+                period += played
+                accelerated += played
+                pending = [axis for i, axis in enumerate(pending) if not reached >> i & 1]
+        finally:
+            for axis in speeds:
+                self.__backend.unwatch_edge(self.motors[axis]["STOP"])
+                self.__backend.output(self.motors[axis]["ENA"], MotorController.DIR_TO_ENDSTOP)
+
+        for axis in pending:
+            print(f"[ERROR] the endstop of the {axis} axis was not reached")
+        return not pending
+
+    def move_all_axes_simultaneously(self, target_pos:dict, control:ExecutionControl = None, speed:float = 100) -> dict[str, int]:
+        """
+        moves all motor axes simultaneously to their target positions, see move_axes
         args:
             target_pos (dict): dictionary containing target positions for each axis
+            control (ExecutionControl): checked before every step period
+            speed (float): percentage of the maximum speed
+        returns:
+            dict[str, int]: the number of steps that were driven on each axis
         """
-        #TODO real parallel movement of the motors, but it could also be that this is a hardware problem
-        threads:list[threading.Thread] = []
         current_pos:dict = self.__positions.copy()
 
         print(f"[DEBUG] target_pos: {target_pos}, Type: {type(target_pos)}")
 
+        moves:dict[str, tuple[int, int]] = {}
         for axis in ["X", "Y", "Z"]:
             diff = target_pos[axis] - current_pos[axis]
-            if diff == 0:
-                continue
-
-            if diff > 0:
-                direction = MotorController.DIR_TO_ENDSTOP
-            else:
-                direction = self.DIR_BACK
-
-            #direction = MotorController.DIR_TO_ENDSTOP if diff > 0 else self.DIR_BACK
-            steps = abs(diff)
-            t = threading.Thread(target=self.step_motor, args=(axis, steps, direction))
-            threads.append(t)
-            t.start()
+            direction = MotorController.DIR_TO_ENDSTOP if diff > 0 else self.DIR_BACK
+            moves[axis] = (abs(diff), direction)
 
-        for t in threads:
-            t.join()
+        return self.move_axes(moves, control, speed)
 
     def cleanup(self):
         """
         cleans up all gpio resources
         """
-        GPIO.cleanup()
+        self.__backend.cleanup()
@@ -1,36 +1,164 @@
 """Module that offers permanent storage of positions"""
 import json
+import os
+import struct
+import time
+import zlib
 from pathlib import Path
 
+# sequence number and position of every axis, followed by the CRC32 of these fields
+RECORD:struct.Struct = struct.Struct("<Q3q")
+CHECKSUM:struct.Struct = struct.Struct("<I")
+RECORD_SIZE:int = RECORD.size + CHECKSUM.size
+
+
 class PositionManager:
     """
-    It saves and manages the positions so that, for example, they are not reset after a restart, 
+    It saves and manages the positions so that, for example, they are not reset after a restart,
     because the robot does not automatically reset its motors.
+
+    Every save appends a small record to a journal next to the JSON file instead of rewriting the file.
+    The journal is synced to the disk at most every sync_interval seconds, and once it holds enough records
+    its last position is written into the JSON file, which is replaced atomically, and the journal starts anew.
+    After a power cut, load takes the last complete record of the journal, a torn record at its end is dropped
     """
-    def __init__(self, filepath: str):
+    # seconds between two syncs of the journal, 0 syncs every save
+    SYNC_INTERVAL:float = 0.5
+    # number of records after which the position is written into the JSON file and the journal is emptied
+    COMPACT_AFTER:int = 4096
+
+    def __init__(self, filepath: str, sync_interval: float = SYNC_INTERVAL, compact_after: int = COMPACT_AFTER):
+        """
+        args:
+            filepath (str): the JSON file with the positions, the journal has the same name with the suffix .journal
+            sync_interval (float): seconds between two syncs of the journal to the disk
+            compact_after (int): number of records in the journal after which it is compacted into the JSON file
+        """
         self.__filepath = Path(filepath)
+        self.__journal_path = self.__filepath.with_suffix(".journal")
+        self.__sync_interval: float = sync_interval
+        self.__compact_after: int = compact_after
+
+        self.__journal: int = None
+        self.__records: int = 0
+        self.__sequence: int = 0
+        self.__last_sync: float = 0.0
+        self.__unsynced: bool = False
+
         self.__x: int = None
         self.__y: int = None
         self.__z: int = None
         self.load()
 
     def load(self) -> None:
-        """Load x, y, z from JSON if the file exists, otherwise use default values."""
+        """
+        Load x, y, z from the JSON file and the journal if they exist, otherwise use default values.
+        A record of the journal that is newer than the JSON file wins, a torn record at the end of the journal is cut off.
+        """
+        self.close()
+        found: bool = False
+        self.__x, self.__y, self.__z, self.__sequence = 0, 0, 0, 0
+
         if self.__filepath.exists():
-            with open(self.__filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            try:
+                with open(self.__filepath, "r", encoding="utf-8") as f:
+                    data = json.load(f)
                 self.__x = data.get("X", 0)
                 self.__y = data.get("Y", 0)
                 self.__z = data.get("Z", 0)
-        else:
+                # files written before the journal existed have no sequence number
+                self.__sequence = data.get("sequence", 0)
+                found = True
+            except (OSError, ValueError):
+                print("[ERROR] position file is corrupt, the positions are taken from the journal")
+
+        valid: int = 0
+        self.__records = 0
+        if self.__journal_path.exists():
+            content: bytes = self.__journal_path.read_bytes()
+            for offset in range(0, len(content) - RECORD_SIZE + 1, RECORD_SIZE):
+                fields: bytes = content[offset:offset + RECORD.size]
+                (checksum,) = CHECKSUM.unpack_from(content, offset + RECORD.size)
+                if zlib.crc32(fields) != checksum:
+                    break
+                sequence, x, y, z = RECORD.unpack(fields)
+                valid = offset + RECORD_SIZE
+                self.__records += 1
+                # records from before the last compaction are older than the JSON file
+                if sequence > self.__sequence:
+                    self.__x, self.__y, self.__z, self.__sequence = x, y, z, sequence
+                    found = True
+            if valid < len(content):
+                print(f"[ERROR] dropped {len(content) - valid} bytes of damaged records at the end of the position journal")
+
+        if not found:
             print("[ERROR] fail to load positions from file")
-            self.__x, self.__y, self.__z = 0, 0, 0
+
+        self.__journal = os.open(self.__journal_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        os.ftruncate(self.__journal, valid)
+        os.lseek(self.__journal, valid, os.SEEK_SET)
+        self.__last_sync = time.monotonic()
 
     def save(self) -> None:
-        """Save x, y, z into the JSON file."""
-        data = {"X": self.__x, "Y": self.__y, "Z": self.__z}
-        with open(self.__filepath, "w", encoding="utf-8") as f:
+        """
+        Appends x, y, z to the journal, it is synced to the disk if the last sync is longer ago than the sync interval
+        """
+        self.__sequence += 1
+        fields: bytes = RECORD.pack(self.__sequence, self.__x, self.__y, self.__z)
+        os.write(self.__journal, fields + CHECKSUM.pack(zlib.crc32(fields)))
+        self.__records += 1
+        self.__unsynced = True
+
+        if self.__records >= self.__compact_after:
+            self.compact()
+        elif time.monotonic() - self.__last_sync >= self.__sync_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Syncs the records of the journal that are not yet on the disk."""
+        if self.__unsynced:
+            os.fsync(self.__journal)
+            self.__unsynced = False
+        self.__last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """
+        Save x, y, z into the JSON file and empty the journal.
+        The file is written next to the old one and then replaces it, so there is always a complete file
+        """
+        data = {"X": self.__x, "Y": self.__y, "Z": self.__z, "sequence": self.__sequence}
+        temporary: Path = self.__filepath.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.__filepath)
+        self.__sync_directory()
+
+        # a crash before the journal is emptied does no harm, its records are not newer than the file
+        os.ftruncate(self.__journal, 0)
+        os.lseek(self.__journal, 0, os.SEEK_SET)
+        self.__records = 0
+        self.__unsynced = True
+        self.flush()
+
+    def close(self) -> None:
+        """Syncs and closes the journal."""
+        if self.__journal is not None:
+            self.flush()
+            os.close(self.__journal)
+            self.__journal = None
+
+    def __sync_directory(self) -> None:
+        """makes the replacement of the JSON file durable, not every system can open a directory"""
+        try:
+            directory: int = os.open(self.__filepath.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
 
     @property
     def x(self) -> int:
@@ -39,7 +167,7 @@ class PositionManager:
     @x.setter
     def x(self, value: int):
         self.__x = value
-    
+
     @property
     def y(self) -> int:
         return self.__y
@@ -0,0 +1,346 @@
+"""Module with the backends that put out the step pulses, the motor controller plays precomputed pulse trains on them"""
+import math
+import statistics
+import time
+from abc import ABC, abstractmethod
+from array import array
+
+from flaskr.execution_control import ExecutionControl
+
+HIGH:int = 1
+LOW:int = 0
+
+
+def percentiles(values:list[float], percents:tuple[int, ...] = (50, 90, 99)) -> dict[int, float]:
+    """
+    args:
+        values (list[float]): e.g. the periods of the pulses
+        percents (tuple[int, ...]): the percentiles
+    returns:
+        dict[int, float]: the value below which the given percentage of the values lie
+    """
+    if len(values) < 2:
+        return {percent: values[0] if values else math.nan for percent in percents}
+    cuts:list[float] = statistics.quantiles(values, n=100)
+    return {percent: cuts[percent - 1] for percent in percents}
+
+
+class PulseTrain:
+    """
+    the precomputed edges of a move: for every step period the duration of its high and its low phase
+    and the group of pulse pins that get a pulse in it
+    """
+    def __init__(self, pin_groups:list[tuple[int, ...]]) -> None:
+        """
+        args:
+            pin_groups (list[tuple[int, ...]]): every combination of pulse pins that occurs in the train
+        """
+        self.pin_groups:list[tuple[int, ...]] = pin_groups
+        # the step period of the whole move at which the train starts
+        self.first:int = 0
+        # half period of every step period, in seconds
+        self.delays:array = array("d")
+        # index into pin_groups for every step period
+        self.groups:array = array("B")
+
+    def append(self, delay:float, group:int) -> None:
+        self.delays.append(delay)
+        self.groups.append(group)
+
+    def __len__(self) -> int:
+        return len(self.delays)
+
+
+class PulseBackend(ABC):
+    """
+    puts out the pulse trains of the motor controller and reads its inputs.
+    The edges are timed with absolute deadlines and a busy-wait instead of time.sleep,
+    whose granularity and the scheduling of the threads make the steps irregular and far slower than planned.
+    Subclasses only write and read the pins, a backend without one of them can not be created
+    """
+    # an edge that is later than this is late, the following edges are timed from it
+    LATE_TOLERANCE:float = 0.00002
+
+    def __init__(self) -> None:
+        # the step periods of the move that were put out so far, written by play and read by other threads or processes;
+        # the stepper process replaces it with shared memory
+        self.progress = array("q", [0])
+
+    @abstractmethod
+    def setup_output(self, pin:int) -> None:
+        """makes the pin an output"""
+
+    @abstractmethod
+    def setup_input(self, pin:int) -> None:
+        """makes the pin an input with pull-up, like the endstops need it"""
+
+    @abstractmethod
+    def output(self, pin:int, level:int) -> None:
+        """sets the pin to HIGH or LOW"""
+
+    @abstractmethod
+    def input(self, pin:int) -> int:
+        """returns: int: the level of the pin, HIGH or LOW"""
+
+    def cleanup(self) -> None:
+        pass
+
+    def _write(self, pins:tuple[int, ...], level:int) -> None:
+        """
+        sets several pins at once, called at the edges of the pulses
+        args:
+            pins (tuple[int, ...]): the pins
+            level (int): HIGH or LOW
+        """
+        for pin in pins:
+            self.output(pin, level)
+
+    def play(self, train:PulseTrain, control:ExecutionControl = None) -> int:
+        """
+        puts out the pulses of a train, every step period is a high phase followed by a low phase of the pulse pins
+        args:
+            train (PulseTrain): the precomputed pulses
+            control (ExecutionControl): checked before every step period, the train stops as soon as it is interrupted
+        returns:
+            int: the number of step periods that were played, less than the length of the train if it was interrupted
+        """
+        delays:array = train.delays
+        groups:array = train.groups
+        pin_groups:list[tuple[int, ...]] = train.pin_groups
+        wait_until = self._wait_until
+        write = self._write
+        progress = self.progress
+        # a step period counts as put out as soon as its pulse is high
+        offset:int = train.first + 1
+
+        edge:float = time.perf_counter()
+        for period, delay in enumerate(delays):
+            if control is not None and control.interrupted:
+                return period
+            pins:tuple[int, ...] = pin_groups[groups[period]]
+            write(pins, HIGH)
+            # written while the pulse is high, the busy-wait until the next edge absorbs the time it takes
+            progress[0] = offset + period
+            edge = wait_until(edge + delay)
+            write(pins, LOW)
+            edge = wait_until(edge + delay)
+        return len(delays)
+
+    def watch_edge(self, pin:int) -> None:
+        """
+        starts to detect the falling edge of an input, e.g. of an endstop that closes
+        args:
+            pin (int): the input
+        """
+
+    def edge_detected(self, pin:int) -> bool:
+        """
+        args:
+            pin (int): an input that is watched
+        returns:
+            bool: whether the input fell since it is watched; without edge detection the level is read instead
+        """
+        return self.input(pin) == LOW
+
+    def unwatch_edge(self, pin:int) -> None:
+        """
+        stops the detection of the edges of an input
+        args:
+            pin (int): the input
+        """
+
+    def play_until_edges(self, train:PulseTrain, stop_pins:tuple[int, ...], control:ExecutionControl = None) -> tuple[int, int]:
+        """
+        puts out the pulses of a train like play, but a pulse pin gets no more pulses as soon as the edge of its stop pin
+        was detected, the train ends when every stop pin was reached
+        args:
+            train (PulseTrain): the precomputed pulses, bit i of a group is the pin with the stop pin stop_pins[i]
+            stop_pins (tuple[int, ...]): the watched input of every pulse pin, e.g. the endstops
+            control (ExecutionControl): checked before every step period, the train stops as soon as it is interrupted
+        returns:
+            tuple[int, int]: the number of step periods that were played and the bit mask of the stop pins that were reached
+        """
+        delays:array = train.delays
+        groups:array = train.groups
+        pin_groups:list[tuple[int, ...]] = train.pin_groups
+        wait_until = self._wait_until
+        write = self._write
+        edge_detected = self.edge_detected
+
+        everything:int = (1 << len(stop_pins)) - 1
+        reached:int = 0
+        edge:float = time.perf_counter()
+        for period, delay in enumerate(delays):
+            for i, stop_pin in enumerate(stop_pins):
+                if not reached >> i & 1 and edge_detected(stop_pin):
+                    reached |= 1 << i
+            if reached == everything or (control is not None and control.interrupted):
+                return period, reached
+            pins:tuple[int, ...] = pin_groups[groups[period] & ~reached]
+            write(pins, HIGH)
+            edge = wait_until(edge + delay)
+            write(pins, LOW)
+            edge = wait_until(edge + delay)
+        return len(delays), reached
+
+    @staticmethod
+    def _wait_until(deadline:float) -> float:
+        """
+        waits until the deadline, the edges are timed from one deadline to the next,
+        so the time spent between them does not add up
+        args:
+            deadline (float): time.perf_counter() value of the next edge
+        returns:
+            float: the time of the edge, a late edge is not made up for by shorter pulses afterwards
+        """
+        now:float = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        # the few hundred nanoseconds the last check takes are not lateness, the schedule keeps its deadlines
+        return now if now - deadline > PulseBackend.LATE_TOLERANCE else deadline
+
+
+class GpioBackend(PulseBackend):
+    """
+    puts out the pulses on the GPIO pins of the Raspberry Pi
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        # RPi.GPIO can only be imported on a Raspberry Pi
+        from RPi import GPIO
+        self.__gpio = GPIO
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setwarnings(False)
+
+    def setup_output(self, pin:int) -> None:
+        self.__gpio.setup(pin, self.__gpio.OUT)
+
+    def setup_input(self, pin:int) -> None:
+        self.__gpio.setup(pin, self.__gpio.IN, pull_up_down=self.__gpio.PUD_UP)
+
+    def output(self, pin:int, level:int) -> None:
+        self.__gpio.output(pin, level)
+
+    def input(self, pin:int) -> int:
+        return self.__gpio.input(pin)
+
+    def watch_edge(self, pin:int) -> None:
+        # the edge is latched by the driver, so it is not missed between two step periods
+        self.__gpio.remove_event_detect(pin)
+        self.__gpio.add_event_detect(pin, self.__gpio.FALLING)
+
+    def edge_detected(self, pin:int) -> bool:
+        return self.__gpio.event_detected(pin)
+
+    def unwatch_edge(self, pin:int) -> None:
+        self.__gpio.remove_event_detect(pin)
+
+    def cleanup(self) -> None:
+        self.__gpio.cleanup()
+
+
+class RecordingBackend(PulseBackend):
+    """
+    backend without hardware, it records the time of every edge, so the achieved step rate
+    and the jitter of the pulses can be checked without a Raspberry Pi
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        # (time.perf_counter(), pin, level) of every output
+        self.edges:list[tuple[float, int, int]] = []
+        # level of the inputs, an input that is not set is HIGH like an open endstop with pull-up
+        self.inputs:dict[int, int] = {}
+        self.levels:dict[int, int] = {}
+        # whether a falling edge was detected on every watched input
+        self.__edges:dict[int, bool] = {}
+
+    def setup_output(self, pin:int) -> None:
+        self.levels[pin] = LOW
+
+    def setup_input(self, pin:int) -> None:
+        self.inputs.setdefault(pin, HIGH)
+
+    def output(self, pin:int, level:int) -> None:
+        self.levels[pin] = level
+        self.edges.append((time.perf_counter(), pin, level))
+
+    def input(self, pin:int) -> int:
+        return self.inputs.get(pin, HIGH)
+
+    def set_input(self, pin:int, level:int) -> None:
+        """
+        changes the level of an input, like an endstop that closes or opens
+        args:
+            pin (int): the input
+            level (int): HIGH or LOW
+        """
+        if pin in self.__edges and level == LOW and self.input(pin) == HIGH:
+            self.__edges[pin] = True
+        self.inputs[pin] = level
+
+    def watch_edge(self, pin:int) -> None:
+        self.__edges[pin] = False
+
+    def edge_detected(self, pin:int) -> bool:
+        return self.__edges.get(pin, False)
+
+    def unwatch_edge(self, pin:int) -> None:
+        self.__edges.pop(pin, None)
+
+    def _write(self, pins:tuple[int, ...], level:int) -> None:
+        now:float = time.perf_counter()
+        for pin in pins:
+            self.levels[pin] = level
+            self.edges.append((now, pin, level))
+
+    def rising_edges(self, pin:int) -> list[float]:
+        """
+        returns:
+            list[float]: the times at which the pin went HIGH
+        """
+        return [edge_time for edge_time, edge_pin, level in self.edges if edge_pin == pin and level == HIGH]
+
+    def pulse_widths(self, pin:int) -> list[float]:
+        """
+        returns:
+            list[float]: the duration of every high phase of the pin, in seconds
+        """
+        widths:list[float] = []
+        rising:float | None = None
+        for edge_time, edge_pin, level in self.edges:
+            if edge_pin != pin:
+                continue
+            if level == HIGH:
+                rising = edge_time
+            elif rising is not None:
+                widths.append(edge_time - rising)
+                rising = None
+        return widths
+
+    def timing(self, pin:int) -> dict:
+        """
+        summary of the pulses of one pin
+        args:
+            pin (int): the pulse pin
+        returns:
+            dict: number of pulses, achieved rate in steps per second, mean, standard deviation, percentiles and maximum
+                  of the periods and percentiles of the pulse widths
+        """
+        rising:list[float] = self.rising_edges(pin)
+        periods:list[float] = [b - a for a, b in zip(rising, rising[1:])]
+        if not periods:
+            return {"pulses": len(rising), "rate": 0.0, "mean_period": math.nan, "jitter": math.nan, "max_period": math.nan}
+        mean:float = statistics.fmean(periods)
+        summary:dict = {
+            "pulses": len(rising),
+            "rate": 1 / mean,
+            "mean_period": mean,
+            "jitter": statistics.pstdev(periods),
+            "max_period": max(periods),
+        }
+        for name, values in (("period", periods), ("width", self.pulse_widths(pin))):
+            summary.update({f"{name}_p{percent}": value for percent, value in percentiles(values).items()})
+        return summary
+
+    def clear(self) -> None:
+        self.edges.clear()
@@ -1,13 +1,12 @@
 """Module that provides control of the robot"""
 
 from flask_socketio import SocketIO
-from flaskr.server_error import VariableNoneTyeError, RobotPositionError
+from flaskr.server_error import VariableNoneTyeError, RobotPositionError, HomingError
 from flaskr.robot_movement.positions_manager import PositionManager
-
-try:
-    from flaskr.robot_movement.motor_controller import MotorController
-except (ImportError, RuntimeError):
-    print("[DEBUG] No RPi available")
+from flaskr.execution_control import ExecutionControl
+from flaskr.robot_movement.motor_controller import MotorController
+from flaskr.robot_movement.stepper_process import StepperProcess
+from flaskr.robot_movement.telemetry import Telemetry
 
 
 class Robot():
@@ -23,9 +22,18 @@ class Robot():
     MAX_Z:int = 0
     MIN_Z:int = -100000
 
+    # Mapping for each axis to its attribute and limits
+    AXIS_ATTRIBUTES:dict[str, str] = {"X": "_x", "Y": "_y", "Z": "_z"}
+    LIMITS:dict[str, tuple[int, int]] = {
+        "X": (MIN_X, MAX_X),
+        "Y": (MIN_Y, MAX_Y),
+        "Z": (MIN_Z, MAX_Z),
+    }
+
     def __init__(self, gpio_avialable:bool, socket_io: SocketIO, position_file_path:str):
         if gpio_avialable:
-            self.__controller = MotorController()
+            # the motors are driven by their own process, so the web server can not disturb the step timing
+            self.__controller = StepperProcess()
 
         self._position_manager = PositionManager(position_file_path)
         self._position_manager.load()
@@ -37,95 +45,182 @@ class Robot():
         self._axis_lst:list = ["X","Y","Z"]
 
         self._socket_io:SocketIO = socket_io
+        # start position and steps of every axis of the running move, the position is sampled from them during the move
+        self._moving:dict[str, tuple[int, int]] = None
+        self._telemetry:Telemetry = Telemetry(socket_io, self.position)
+        # control of the program that moves the robot at the moment, set by the app for every job
+        self.control:ExecutionControl = None
 
         #self.__steps_per_click = 500
 
         print(f"[DEBUG] init pos -> X: {self._x}, Y: {self._y}, Z: {self._z}")
 
-    def move_on_axis(self, axis: str, value: int) -> None:
+    def move_on_axis(self, axis: str, value: int, speed: float = 100) -> None:
         """
         Moves the robot along the given axis ('X', 'Y' or 'Z') by the given value if within limits.
         Args:
             axis (str): Axis to move along ('X', 'Y', or 'Z')
             value (int): Distance to move along the axis
+            speed (float): percentage of the maximum speed
         """
-        if value is None:
-            raise VariableNoneTyeError("Variable is not defined, it's None")
+        self.move_axes({axis: value}, speed)
 
-        axis = axis.upper()
+    def move_axes(self, deltas: dict[str, int], speed: float = 100) -> None:
+        """
+        Moves several axes at the same time, each by its value, the move only starts if all targets are within limits.
+        The axes arrive together, so a diagonal move takes as long as the longest axis needs.
+        Args:
+            deltas (dict[str, int]): distance to move along each axis ('X', 'Y', or 'Z')
+            speed (float): percentage of the maximum speed
+        """
+        moves: dict[str, int] = {}
+        targets: dict[str, int] = {}
+        for axis, value in deltas.items():
+            if value is None:
+                raise VariableNoneTyeError("Variable is not defined, it's None")
+            axis = axis.upper()
+            targets[axis] = self._check_limits(axis, value)
+            moves[axis] = value
+
+        self._set_positions(targets)
+        interrupted: dict[str, int] = {}
+        try:
+            driven: dict[str, int] = self._move_axes({axis: value for axis, value in moves.items() if value != 0}, speed)
+
+            for axis, value in moves.items():
+                if driven.get(axis, 0) < abs(value):
+                    # the move was cancelled, only the steps that were driven count
+                    interrupted[axis] = targets[axis] - value + (driven[axis] if value >= 0 else -driven[axis])
+            if interrupted:
+                self._set_positions(interrupted)
+        finally:
+            # only now the positions are right again, until here they are sampled from the motors
+            self._moving = None
+            self._telemetry.set_moving(False)
+        if interrupted and self.control is not None:
+            self.control.checkpoint()
+
+        for axis, value in moves.items():
+            print(f"[DEBUG] Move {value} on {axis} axis, position on {axis.lower()}: {targets[axis]}")
+
+    def _set_positions(self, positions: dict[str, int]) -> None:
+        """
+        sets the position on the given axes and saves them
+        args:
+            positions (dict[str, int]): the new position of each axis ('X', 'Y', or 'Z')
+        """
+        for axis, value in positions.items():
+            setattr(self, Robot.AXIS_ATTRIBUTES[axis], value)
+            setattr(self._position_manager, axis.lower(), value)
+        self._position_manager.save()
 
-        # Mapping for each axis to its attribute and limits
-        axis_map = {
-            "X": ("_x", "MIN_X", "MAX_X"),
-            "Y": ("_y", "MIN_Y", "MAX_Y"),
-            "Z": ("_z", "MIN_Z", "MAX_Z"),
-        }
 
-        if axis not in axis_map:
+    def _check_limits(self, axis: str, value: int) -> int:
+        """
+        checks whether a move of the given value on the axis stays within the limits of the robot
+        args:
+            axis (str): axis to move along ('X', 'Y', or 'Z')
+            value (int): distance to move along the axis
+        raises:
+            RobotPositionError: if the new position would exceed the limits
+        returns:
+            int: the new position on the axis
+        """
+        if axis not in Robot.AXIS_ATTRIBUTES:
             raise ValueError("Axis must be one of 'X', 'Y', or 'Z'")
 
-        attr_name, min_attr, max_attr = axis_map[axis]
-
-        # Get current position and limits dynamically
-        current_value = getattr(self, attr_name)
-        min_limit = getattr(Robot, min_attr)
-        max_limit = getattr(Robot, max_attr)
-
-        if not min_limit <= current_value + value <= max_limit:
-            raise RobotPositionError("The value exceeds the limits of the possible movement of the robot")
+        new_value = getattr(self, Robot.AXIS_ATTRIBUTES[axis]) + value
+        min_limit, max_limit = Robot.LIMITS[axis]
 
-        new_value = current_value + value
-        setattr(self, attr_name, new_value)
+        if not min_limit <= new_value <= max_limit:
+            raise RobotPositionError(
+                f"The value exceeds the limits of the possible movement of the robot ({axis}: {new_value})"
+            )
+        return new_value
 
-        setattr(self._position_manager, axis.lower(), new_value)
-        self._position_manager.save()
-
-        self._move(abs(value), axis, value >= 0)
-
-        print(f"[DEBUG] Move {value} on {axis} axis, position on {axis.lower()}: {new_value}")
-
-
-    def move_to_position(self, p_x:int, p_y:int, p_z:int):
+    def move_to_position(self, p_x:int, p_y:int, p_z:int, speed:float = 100):
         """
-        moves the robot to the specified x y and z coordinates
+        moves the robot to the specified x y and z coordinates, all axes move at the same time
         args:
             p_x (int): target x coordinate
             p_y (int): target y coordinate
             p_z (int): target z coordinate
+            speed (float): percentage of the maximum speed
         """
-        self.move_on_axis("X", p_x-(self._x))
-        self.move_on_axis("Y", p_y-(self._y))
-        self.move_on_axis("Z", p_z-(self._z))
+        for target in (p_x, p_y, p_z):
+            if target is None:
+                raise VariableNoneTyeError("Variable is not defined, it's None")
+        self.move_axes({"X": p_x - self._x, "Y": p_y - self._y, "Z": p_z - self._z}, speed)
 
-    def _move(self, value:int, axis:str, direction:bool) -> None:
+    def _move_axes(self, deltas: dict[str, int], speed: float) -> dict[str, int]:
         """
-        moves the specified axis by a given value in a given direction
+        moves the specified axes at the same time, each by its value
         args:
-            value (int): number of steps to move
-            axis (str): axis identifier (e.g. 'x', 'y', 'z')
-            direction (bool): movement direction
-        """
-        if axis == "Y": #switch direction, because hardware
-            if direction:
-                direction = False
-            else:
-                direction = True
-        direction:int = self.__controller.DIR_TO_ENDSTOP if direction else self.__controller.DIR_BACK
-        self.__controller.step_motor(steps=value, axis=axis, direction=direction)
+            deltas (dict[str, int]): number of steps for each axis, the sign gives the direction
+            speed (float): percentage of the maximum speed
+        returns:
+            dict[str, int]: the number of steps that were driven on each axis
+        """
+        moves: dict[str, tuple[int, int]] = {}
+        for axis, value in deltas.items():
+            direction: bool = value >= 0
+            if axis == "Y": #switch direction, because hardware
+                direction = not direction
+            moves[axis] = (abs(value), self.__controller.DIR_TO_ENDSTOP if direction else self.__controller.DIR_BACK)
+
+        # the progress is reset before the move is announced, so a sample never mixes it with the last move
+        self.__controller.reset_progress()
+        self._moving = {axis: (getattr(self, Robot.AXIS_ATTRIBUTES[axis]) - value, value) for axis, value in deltas.items()}
+        self._telemetry.set_moving(True)
+        driven: dict[str, int] = self.__controller.move_axes(moves, self.control, speed)
         self.inform_about_move()
+        return driven
+
+    def sync_position(self) -> None:
+        """
+        writes the positions that were saved since the last sync to the disk, called when a program ends
+        """
+        self._position_manager.flush()
 
     def inform_about_move(self) -> None:
         """
-        emits the current robot coordinates via socket io
+        sends the current robot coordinates via socket io, updates that follow each other quickly are sent together
+        """
+        self._telemetry.publish()
+
+    @property
+    def telemetry_stats(self) -> dict:
+        return self._telemetry.stats
+
+    def position(self) -> dict[str, int]:
+        """
+        can be called from another thread, during a move it returns the position the motors have reached so far
+        returns:
+            dict[str, int]: the position on the axes 'x', 'y' and 'z'
         """
-        self._socket_io.emit('coords', {'data': f'X: {self._x}, Y: {self._y}, Z: {self._z} '})
+        moving: dict[str, tuple[int, int]] = self._moving
+        position: dict[str, int] = {"x": self._x, "y": self._y, "z": self._z}
+        if moving:
+            period: int = self.__controller.progress
+            periods: int = max(abs(value) for _, value in moving.values())
+            for axis, (start, value) in moving.items():
+                steps: int = MotorController.pulses(abs(value), periods, min(period, periods))
+                position[axis.lower()] = start + (steps if value >= 0 else -steps)
+        return position
 
 
     def reset_pos(self) -> None:
         """
         resets all axes to their endstops and updates stored positions
+        raises:
+            ExecutionCancelledError: if the homing was cancelled
+            HomingError: if an endstop was not found again, the stored positions are kept
         """
-        self.__controller.drive_all_to_endstops(self._axis_lst)
+        if not self.__controller.drive_all_to_endstops(self._axis_lst, self.control):
+            # the reference is lost, so the positions are not taken over
+            if self.control is not None:
+                self.control.checkpoint()
+            raise HomingError("An endstop was not found again while homing, the positions were not reset")
 
         pos_dict:dict = self.__controller.positions
         self._x = pos_dict["X"]
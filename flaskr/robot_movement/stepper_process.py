@@ -0,0 +1,240 @@
+"""
+Module that runs the motor controller in its own process, so the step timing does not depend on the
+web server, the socket and the measurements, which share the GIL of the main process
+"""
+import multiprocessing
+import os
+import struct
+import time
+
+from flaskr.execution_control import ExecutionControl
+from flaskr.server_error import StepperProcessError
+from flaskr.robot_movement.motor_controller import MotorController
+from flaskr.robot_movement.pulse_backend import PulseBackend, GpioBackend
+
+AXES:tuple[str, ...] = ("X", "Y", "Z")
+
+# operation, speed, steps and direction of every axis; for a homing the steps are 1 for the axes to home
+COMMAND:struct.Struct = struct.Struct("<id3q3b")
+# steps driven on every axis, positions of the motor controller afterwards, success (False if a homing was cancelled)
+RESULT:struct.Struct = struct.Struct("<3q3q?")
+
+# flags that the main process writes and the stepper process polls during a move, at the start of the shared memory
+FLAG_PAUSED:int = 0
+FLAG_CANCELLED:int = 1
+FLAGS_SIZE:int = 8
+# the mailbox behind the flags, it holds one command and then its result
+MAILBOX:int = FLAGS_SIZE
+MAILBOX_SIZE:int = COMMAND.size + RESULT.size
+
+MOVE:int = 1
+HOME:int = 2
+STOP:int = 3
+
+
+class SharedControl:
+    """
+    takes the place of the ExecutionControl in the stepper process, it reads the flags the main process
+    copies from the control of the running program into the shared memory
+    """
+    # how often the stepper process looks at the flags while it is paused
+    POLL_INTERVAL:float = 0.001
+
+    def __init__(self, memory) -> None:
+        self.__memory = memory
+
+    @property
+    def interrupted(self) -> bool:
+        return bool(self.__memory[FLAG_PAUSED] or self.__memory[FLAG_CANCELLED])
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self.__memory[FLAG_CANCELLED])
+
+    def wait_while_paused(self) -> bool:
+        """
+        returns:
+            bool: False if the program was cancelled, True once it is resumed
+        """
+        while self.__memory[FLAG_PAUSED] and not self.__memory[FLAG_CANCELLED]:
+            time.sleep(SharedControl.POLL_INTERVAL)
+        return not self.__memory[FLAG_CANCELLED]
+
+
+class StepperProcess:
+    """
+    proxy of a MotorController that runs in its own process.
+    A command is written into a mailbox in shared memory and the stepper process writes its result into the
+    same mailbox, semaphores signal when it is free, written and done, so nothing is pickled.
+    The robot waits for the result of every command before it sends the next one, so the mailbox holds one command.
+    The stepper process is pinned to one CPU and, if the server may do that and has more than one CPU,
+    gets a real-time priority
+    """
+    DIR_TO_ENDSTOP:int = MotorController.DIR_TO_ENDSTOP
+    DIR_BACK:int = MotorController.DIR_BACK
+
+    # how often the flags of the running program are copied while the main process waits for a result
+    SYNC_INTERVAL:float = 0.001
+
+    def __init__(self, backend:type[PulseBackend] = GpioBackend, cpu:int | None = None, realtime_priority:int | None = 50) -> None:
+        """
+        args:
+            backend (type[PulseBackend]): class of the backend, it is created in the stepper process
+            cpu (int | None): the CPU the stepper process is pinned to, the last one if None
+            realtime_priority (int | None): SCHED_FIFO priority of the stepper process, None to keep the normal scheduling
+        """
+        context = multiprocessing.get_context("spawn")
+        self.__memory = context.RawArray("B", FLAGS_SIZE + MAILBOX_SIZE)
+        # the step periods of the running move that were put out, the backend writes it during the move
+        self.__progress = context.RawArray("q", 1)
+        self.__written = context.Semaphore(0)
+        self.__free = context.Semaphore(1)
+        self.__done = context.Semaphore(0)
+
+        self.__positions:dict[str, int] = {axis: 0 for axis in AXES}
+
+        self.__process = context.Process(
+            target=run_stepper,
+            args=(self.__memory, self.__progress, self.__written, self.__done, backend, cpu, realtime_priority),
+            name="stepper",
+            daemon=True,
+        )
+        self.__process.start()
+
+    @property
+    def positions(self) -> dict:
+        return self.__positions.copy()
+
+    @property
+    def progress(self) -> int:
+        """
+        see MotorController.progress
+        """
+        return self.__progress[0]
+
+    def reset_progress(self) -> None:
+        """
+        see MotorController.reset_progress, the stepper process is idle between two commands of the robot
+        """
+        self.__progress[0] = 0
+
+    def move_axes(self, moves:dict[str, tuple[int, int]], control:ExecutionControl = None, speed:float = 100) -> dict[str, int]:
+        """
+        see MotorController.move_axes
+        """
+        steps:list[int] = [moves.get(axis, (0, 0))[0] for axis in AXES]
+        directions:list[int] = [moves.get(axis, (0, 0))[1] for axis in AXES]
+        driven, _ = self.__execute(MOVE, speed, steps, directions, control)
+        return {axis: driven[AXES.index(axis)] for axis in moves}
+
+    def drive_all_to_endstops(self, axes:list[str], control:ExecutionControl = None) -> bool:
+        """
+        see MotorController.drive_all_to_endstops
+        """
+        _, success = self.__execute(HOME, 0, [int(axis in axes) for axis in AXES], [0, 0, 0], control)
+        return success
+
+    def cleanup(self) -> None:
+        """
+        stops the stepper process, the process cleans up the GPIO pins
+        """
+        if self.__process.is_alive():
+            self.__submit(STOP, 0, [0, 0, 0], [0, 0, 0], None)
+            self.__process.join(timeout=1)
+
+    def __submit(self, operation:int, speed:float, steps:list[int], directions:list[int], control:ExecutionControl) -> None:
+        self.__check_alive()
+        self.__sync(control)
+        self.__free.acquire()
+        COMMAND.pack_into(self.__memory, MAILBOX, operation, speed, *steps, *directions)
+        self.__written.release()
+
+    def __execute(self, operation:int, speed:float, steps:list[int], directions:list[int],
+                  control:ExecutionControl) -> tuple[list[int], bool]:
+        """
+        writes a command into the mailbox and waits for its result, the flags of the control are copied meanwhile
+        raises:
+            StepperProcessError: if the stepper process has stopped, so the job does not wait forever for the result
+        returns:
+            tuple[list[int], bool]: the steps driven on every axis and whether the command succeeded
+        """
+        self.__submit(operation, speed, steps, directions, control)
+        while not self.__done.acquire(timeout=StepperProcess.SYNC_INTERVAL):
+            if not self.__process.is_alive():
+                # the result may have been written just before the process stopped
+                if self.__done.acquire(block=False):
+                    break
+                self.__check_alive()
+            self.__sync(control)
+
+        result:tuple = RESULT.unpack_from(self.__memory, MAILBOX + COMMAND.size)
+        self.__free.release()
+
+        self.__positions = dict(zip(AXES, result[3:6]))
+        return list(result[0:3]), result[6]
+
+    def __check_alive(self) -> None:
+        """
+        raises:
+            StepperProcessError: if the stepper process has stopped
+        """
+        if not self.__process.is_alive():
+            raise StepperProcessError(
+                f"The stepper process has stopped (exit code {self.__process.exitcode}), "
+                "the robot can not be moved until the server is restarted"
+            )
+
+    def __sync(self, control:ExecutionControl) -> None:
+        """copies the flags of the control into the shared memory"""
+        self.__memory[FLAG_PAUSED] = control is not None and control.paused
+        self.__memory[FLAG_CANCELLED] = control is not None and control.cancelled
+
+
+def run_stepper(memory, progress, written, done, backend:type[PulseBackend], cpu:int | None,
+                realtime_priority:int | None) -> None:
+    """
+    main function of the stepper process, it executes the commands of the mailbox one after another
+    args:
+        memory: the shared memory with the flags and the mailbox
+        progress: shared memory in which the backend counts the step periods of the running move
+        written: semaphore that is released when a command was written
+        done: semaphore that is released when its result was written
+        backend (type[PulseBackend]): class of the backend
+        cpu (int | None): the CPU the process is pinned to, the last one if None
+        realtime_priority (int | None): SCHED_FIFO priority, None to keep the normal scheduling
+    """
+    cpus:list[int] = sorted(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, {cpu if cpu is not None else cpus[-1]})
+    # the pulses are timed with a busy-wait, with a real-time priority on the only CPU nothing else would run anymore
+    if realtime_priority is not None and len(cpus) > 1:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime_priority))
+        except PermissionError:
+            print("[DEBUG] stepper process runs without real-time priority")
+
+    pulse_backend:PulseBackend = backend()
+    pulse_backend.progress = progress
+    controller:MotorController = MotorController(pulse_backend)
+    control:SharedControl = SharedControl(memory)
+    while True:
+        written.acquire()
+        operation, speed, *fields = COMMAND.unpack_from(memory, MAILBOX)
+        steps, directions = fields[0:3], fields[3:6]
+
+        driven:list[int] = [0, 0, 0]
+        success:bool = True
+        if operation == STOP:
+            controller.cleanup()
+            return
+        if operation == MOVE:
+            moves:dict[str, tuple[int, int]] = {
+                axis: (steps[i], directions[i]) for i, axis in enumerate(AXES) if steps[i] > 0
+            }
+            result:dict[str, int] = controller.move_axes(moves, control, speed)
+            driven = [result.get(axis, 0) for axis in AXES]
+        elif operation == HOME:
+            success = controller.drive_all_to_endstops([axis for i, axis in enumerate(AXES) if steps[i]], control)
+
+        positions:dict[str, int] = controller.positions
+        RESULT.pack_into(memory, MAILBOX + COMMAND.size, *driven, *(positions[axis] for axis in AXES), success)
+        done.release()
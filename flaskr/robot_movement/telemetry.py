@@ -0,0 +1,90 @@
+"""Module that sends the position of the robot to the clients, at most a fixed number of times per second"""
+import threading
+import time
+from typing import Callable
+
+from flask_socketio import SocketIO
+
+
+class Telemetry:
+    """
+    publishes the position of the robot on its own thread.
+    Updates that come in faster than the maximum rate are coalesced, only the newest position is sent;
+    while the robot moves, the thread samples the position itself, so the clients see long moves as they happen.
+    The payload is numeric: {"x": int, "y": int, "z": int, "moving": bool}
+    """
+    MAX_RATE:float = 20.0
+
+    def __init__(self, socket_io:SocketIO, sample:Callable[[], dict], max_rate:float = MAX_RATE) -> None:
+        """
+        args:
+            socket_io (SocketIO): the socket the position is sent on
+            sample (Callable[[], dict]): returns the position of the robot, also while it moves
+            max_rate (float): the most updates that are sent per second
+        """
+        self.__socket_io:SocketIO = socket_io
+        self.__sample:Callable[[], dict] = sample
+        self.__interval:float = 1 / max_rate
+
+        self.__condition:threading.Condition = threading.Condition()
+        self.__changed:bool = False
+        self.__moving:bool = False
+        self.__sent:int = 0
+        self.__published:int = 0
+
+        threading.Thread(target=self.__run, daemon=True).start()
+
+    def publish(self) -> None:
+        """
+        tells the thread that the position changed, it is sent with the next update
+        """
+        with self.__condition:
+            self.__changed = True
+            self.__published += 1
+            self.__condition.notify()
+
+    def set_moving(self, moving:bool) -> None:
+        """
+        while the robot moves, the position is sent with the maximum rate
+        args:
+            moving (bool): whether a move starts or ended
+        """
+        with self.__condition:
+            self.__moving = moving
+            self.__changed = True
+            self.__condition.notify()
+
+    @property
+    def stats(self) -> dict:
+        """
+        returns:
+            dict: the number of updates that were published and sent
+        """
+        return {"published": self.__published, "sent": self.__sent}
+
+    def __run(self) -> None:
+        """
+        the loop of the thread, it sends at most one update per interval
+        """
+        last:dict = None
+        sent_at:float = -self.__interval
+        while True:
+            with self.__condition:
+                while not self.__changed and not self.__moving:
+                    self.__condition.wait()
+                # a published update is always sent, e.g. for a client that just connected
+                changed:bool = self.__changed
+                self.__changed = False
+
+            remaining:float = sent_at + self.__interval - time.monotonic()
+            if remaining > 0:
+                # the updates that come in meanwhile are sent together with this one
+                time.sleep(remaining)
+
+            payload:dict = {**self.__sample(), "moving": self.__moving}
+            sent_at = time.monotonic()
+            # while the robot moves, samples in which it did not get further are left out
+            if changed or payload != last:
+                self.__socket_io.emit("coords", payload)
+                self.__sent += 1
+                last = payload
@@ -7,19 +7,12 @@ class TestRobot(Robot):
     The movement will simply output
     """
 
-    def _move(self, value:int, axis:str, direction:int) -> None:
-        if axis == "Y": #switch direction, because hardware
-            if direction:
-                direction = False
-            else:
-                direction = True
-
-        if direction:
-            print(f"[DEBUG Move {value} on the {axis}-axis")
-        else:
-            print(f"[DEBUG] Move {value*-1} on the {axis}-axis")
+    def _move_axes(self, deltas: dict[str, int], speed: float) -> dict[str, int]:
+        for axis, value in deltas.items():
+            print(f"[DEBUG] Move {value} on the {axis}-axis")
 
         self.inform_about_move()
+        return {axis: abs(value) for axis, value in deltas.items()}
 
 
     def reset_pos(self) -> None:
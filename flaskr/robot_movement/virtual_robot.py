@@ -0,0 +1,149 @@
+"""A module that offers a robot which only calculates its movements, used to check programs before they run"""
+from flaskr.server_error import VariableNoneTyeError
+from flaskr.robot_movement.robot import Robot
+from flaskr.robot_movement.motion_profile import AXIS_LIMITS, plan_move
+from flaskr.robot_movement.motor_controller import MotorController
+
+class VirtualClock:
+    """
+    time of a simulation in seconds, it does not run by itself but is advanced by the moves and the timers
+    """
+    def __init__(self) -> None:
+        self.__now:float = 0.0
+
+    def advance(self, seconds:float) -> None:
+        self.__now += seconds
+
+    @property
+    def now(self) -> float:
+        return self.__now
+
+
+class Timeline:
+    """
+    what happened when in a simulation: the position of the robot at the start and the end of every move
+    (it moves in a straight line in between) and the positions of the measurements
+    """
+    # a long program stops being recorded after this many entries, the simulation itself goes on
+    MAX_ENTRIES:int = 10000
+
+    def __init__(self) -> None:
+        # [time, X, Y, Z]
+        self.positions:list[list] = []
+        self.measurements:list[list] = []
+        self.truncated:bool = False
+
+    def add_position(self, time:float, position:tuple) -> None:
+        # a move that directly follows another one starts where and when the other one ended
+        if self.positions and self.positions[-1] == [time, *position]:
+            return
+        self.__add(self.positions, time, position)
+
+    def add_measurement(self, time:float, position:tuple) -> None:
+        self.__add(self.measurements, time, position)
+
+    def __add(self, entries:list[list], time:float, position:tuple) -> None:
+        if len(self.positions) + len(self.measurements) >= Timeline.MAX_ENTRIES:
+            self.truncated = True
+            return
+        entries.append([time, *position])
+
+    def to_dict(self) -> dict:
+        return {"positions": self.positions, "measurements": self.measurements, "truncated": self.truncated}
+
+
+class VirtualRobot(Robot):
+    """
+    Robot without hardware, position file or socket.
+    It checks the limits like the real robot and sums up the steps and the time the real movements would take;
+    a virtual clock advances by that time at once, and the timeline records where the robot was when
+    """
+    def __init__(self, x:int = 0, y:int = 0, z:int = 0) -> None:
+        self._x:int = x
+        self._y:int = y
+        self._z:int = z
+        self._axis_lst:list = ["X","Y","Z"]
+
+        self.__steps:dict[str, int] = {"X": 0, "Y": 0, "Z": 0}
+        self.__moves:int = 0
+        self.__motion_time:float = 0.0
+
+        self.clock:VirtualClock = VirtualClock()
+        self.timeline:Timeline = Timeline()
+        self.timeline.add_position(0.0, (x, y, z))
+
+    def move_axes(self, deltas: dict[str, int], speed: float = 100) -> None:
+        moves: dict[str, int] = {}
+        targets: dict[str, int] = {}
+        for axis, value in deltas.items():
+            if value is None:
+                raise VariableNoneTyeError("Variable is not defined, it's None")
+            axis = axis.upper()
+            targets[axis] = self._check_limits(axis, value)
+            moves[axis] = value
+
+        # the robot stood still since the last move or was waiting
+        self.timeline.add_position(self.clock.now, (self._x, self._y, self._z))
+        for axis, target in targets.items():
+            setattr(self, Robot.AXIS_ATTRIBUTES[axis], target)
+        self._move_axes({axis: value for axis, value in moves.items() if value != 0}, speed)
+        self.timeline.add_position(self.clock.now, (self._x, self._y, self._z))
+
+    def _move_axes(self, deltas: dict[str, int], speed: float) -> dict[str, int]:
+        steps: dict[str, int] = {axis: abs(value) for axis, value in deltas.items()}
+        for axis, value in steps.items():
+            self.__steps[axis] += value
+        self.__moves += 1
+        # the axes move at the same time and accelerate like the motor controller drives them
+        periods, profile = plan_move(steps, speed)
+        duration:float = profile.duration(periods)
+        self.__motion_time += duration
+        self.clock.advance(duration)
+        return steps
+
+    def reset_pos(self) -> None:
+        # the axes approach the endstops at 0 together, back off, probe them again and drive back to the home position
+        backoff:int = MotorController.HOMING_BACKOFF
+        approach:float = max(
+            abs(getattr(self, Robot.AXIS_ATTRIBUTES[axis])) / (AXIS_LIMITS[axis].max_speed * MotorController.HOMING_APPROACH)
+            for axis in self._axis_lst
+        )
+        periods, profile = plan_move({axis: backoff for axis in self._axis_lst})
+        home_periods, home_profile = plan_move(MotorController.HOME_POSITION)
+        homing_time:float = (
+            approach + profile.duration(periods) + backoff / MotorController.HOMING_PROBE_SPEED
+            + home_profile.duration(home_periods) + 2 * MotorController.HOMING_PAUSE
+        )
+        self.__motion_time += homing_time
+
+        self.timeline.add_position(self.clock.now, (self._x, self._y, self._z))
+        self.clock.advance(homing_time)
+        for axis in self._axis_lst:
+            self.__steps[axis] += abs(getattr(self, Robot.AXIS_ATTRIBUTES[axis])) + 2 * backoff + MotorController.HOME_POSITION[axis]
+            setattr(self, Robot.AXIS_ATTRIBUTES[axis], -MotorController.HOME_POSITION[axis])
+        self.timeline.add_position(self.clock.now, (self._x, self._y, self._z))
+        self.__moves += 1
+
+    def measure(self) -> None:
+        """
+        records a measurement at the current position and time
+        """
+        self.timeline.add_measurement(self.clock.now, (self._x, self._y, self._z))
+
+    def inform_about_move(self) -> None:
+        pass
+
+    def sync_position(self) -> None:
+        pass
+
+    @property
+    def steps(self) -> dict[str, int]:
+        return self.__steps.copy()
+
+    @property
+    def moves(self) -> int:
+        return self.__moves
+
+    @property
+    def motion_time(self) -> float:
+        return self.__motion_time
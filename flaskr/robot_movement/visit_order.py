@@ -0,0 +1,157 @@
+"""Module that plans a short order in which the robot visits a set of positions"""
+import math
+
+from flaskr.robot_movement.motion_profile import AXIS_LIMITS, AxisLimits
+
+AXES:tuple[str, ...] = ("X", "Y", "Z")
+
+# number of closest positions that the 2-opt tries to connect every position with
+NEIGHBOURS:int = 10
+# the 2-opt stops after this many passes over all positions, even if it could still improve the tour a little
+MAX_PASSES:int = 50
+
+
+def axis_time(steps:int, limits:AxisLimits) -> float:
+    """
+    the time an axis needs for a move from rest to rest, it accelerates evenly up to its maximum speed
+    args:
+        steps (int): number of steps of the move
+        limits (AxisLimits): the limits of the axis
+    returns:
+        float: the time in seconds
+    """
+    if steps == 0:
+        return 0.0
+    v0:float = limits.start_speed
+    v:float = limits.max_speed
+    a:float = limits.acceleration
+    # steps it takes to accelerate from the start to the maximum speed, the same again to brake
+    ramp:float = (v * v - v0 * v0) / (2 * a)
+    if steps >= 2 * ramp:
+        return 2 * (v - v0) / a + (steps - 2 * ramp) / v
+    # a short move brakes before it reaches the maximum speed
+    peak:float = math.sqrt(v0 * v0 + a * steps)
+    return 2 * (peak - v0) / a
+
+
+def move_time(start:tuple[int, int, int], target:tuple[int, int, int]) -> float:
+    """
+    the cost of a move between two positions: the axes run at the same time, so the slowest axis decides,
+    an axis weighs as much as the time it needs for its distance
+    args:
+        start (tuple[int, int, int]): X, Y and Z of the start
+        target (tuple[int, int, int]): X, Y and Z of the target
+    returns:
+        float: the estimated time of the move in seconds
+    """
+    return max(axis_time(abs(b - a), AXIS_LIMITS[axis]) for axis, a, b in zip(AXES, start, target))
+
+
+def path_time(start:tuple[int, int, int], positions:list[tuple[int, int, int]], order:list[int]) -> float:
+    """
+    args:
+        start (tuple[int, int, int]): the position of the robot before the first move
+        positions (list[tuple[int, int, int]]): the positions
+        order (list[int]): the indices of the positions in the order they are visited
+    returns:
+        float: the estimated time of all moves
+    """
+    points:list[tuple[int, int, int]] = [start] + [positions[i] for i in order]
+    return sum(move_time(a, b) for a, b in zip(points, points[1:]))
+
+
+def plan_visit_order(start:tuple[int, int, int], positions:list[tuple[int, int, int]]) -> list[int]:
+    """
+    plans a short order in which the robot visits all positions, starting from where it is and without returning;
+    a nearest neighbour tour is improved by 2-opt, which reverses parts of the tour as long as that makes it shorter.
+    The 2-opt only tries to connect a position with its closest positions, so a few hundred positions take a fraction
+    of a second
+    args:
+        start (tuple[int, int, int]): the position of the robot
+        positions (list[tuple[int, int, int]]): X, Y and Z of every position
+    returns:
+        list[int]: the indices of the positions in the order they should be visited
+    """
+    # node 0 is the start, node i + 1 is positions[i]
+    points:list[tuple[int, int, int]] = [start] + list(positions)
+    count:int = len(points)
+    if count <= 2:
+        return list(range(len(positions)))
+
+    # the time every axis needs to get from one point to any other, the slowest axis decides
+    costs:list[list[float]] = [[0.0] * count for _ in range(count)]
+    for i in range(count):
+        row:list[float] = costs[i]
+        for j in range(i + 1, count):
+            row[j] = costs[j][i] = move_time(points[i], points[j])
+
+    path:list[int] = nearest_neighbour(costs)
+    two_opt(path, costs)
+    return [node - 1 for node in path[1:]]
+
+
+def nearest_neighbour(costs:list[list[float]]) -> list[int]:
+    """
+    args:
+        costs (list[list[float]]): the cost between every two points
+    returns:
+        list[int]: a path that starts at point 0 and always goes on to the closest point that was not visited yet
+    """
+    unvisited:set[int] = set(range(1, len(costs)))
+    path:list[int] = [0]
+    while unvisited:
+        row:list[float] = costs[path[-1]]
+        closest:int = min(unvisited, key=row.__getitem__)
+        unvisited.remove(closest)
+        path.append(closest)
+    return path
+
+
+def two_opt(path:list[int], costs:list[list[float]]) -> None:
+    """
+    improves an open path that starts at path[0] in place: two of its edges are replaced by two shorter ones
+    by reversing the part of the path in between, the start stays where it is
+    args:
+        path (list[int]): the points in the order they are visited
+        costs (list[list[float]]): the cost between every two points
+    """
+    count:int = len(path)
+    neighbours:list[list[int]] = [
+        sorted((j for j in range(count) if j != i), key=costs[i].__getitem__)[:NEIGHBOURS] for i in range(count)
+    ]
+    index:list[int] = [0] * count
+    for i, node in enumerate(path):
+        index[node] = i
+
+    def reverse(first:int, last:int) -> None:
+        """reverses path[first:last + 1]"""
+        path[first:last + 1] = path[first:last + 1][::-1]
+        for i in range(first, last + 1):
+            index[path[i]] = i
+
+    for _ in range(MAX_PASSES):
+        improved:bool = False
+        for a in range(count):
+            for c in neighbours[a]:
+                i:int = index[a]
+                j:int = index[c]
+                if j > i + 1:
+                    # the edges a-b and c-e become a-c and b-e, e does not exist at the end of the path
+                    b:int = path[i + 1]
+                    e:int | None = path[j + 1] if j + 1 < count else None
+                    gain:float = costs[a][b] - costs[a][c]
+                    if e is not None:
+                        gain += costs[c][e] - costs[b][e]
+                    if gain > 1e-9:
+                        reverse(i + 1, j)
+                        improved = True
+                elif j < i - 1:
+                    # the edges c-d and p-a become c-p and d-a, with p in front of a and d behind c
+                    p:int = path[i - 1]
+                    d:int = path[j + 1]
+                    gain = costs[c][d] + costs[p][a] - costs[c][p] - costs[d][a]
+                    if gain > 1e-9:
+                        reverse(j + 1, i - 1)
+                        improved = True
+        if not improved:
+            break
@@ -37,6 +37,16 @@ class RobotPositionError(ServerError):
     if the specified value exceed the physical possibilities of the robot's movement
     """
 
+class HomingError(ServerError):
+    """
+    if an endstop was not found again while the robot was homing, the reference of the axes is lost
+    """
+
+class StepperProcessError(ServerError):
+    """
+    if the process that drives the motors has stopped, e.g. because the GPIO pins could not be opened
+    """
+
 class DiviceNotFoundError(ServerError):
     """
     if no device is found
@@ -47,9 +57,29 @@ class NoDeviceConnected(ServerError):
     when no device is connected
     """
 
-class ExecutionStartedError(ServerError):
+class ExecutionCancelledError(ServerError):
+    """
+    when the running program was cancelled by the user
+    """
+
+class BreakOutsideLoopError(ServerError):
+    """
+    if a break block is used outside of a loop
+    """
+
+class SpeedOutOfRangeError(ServerError):
+    """
+    if the requested speed is not a percentage between 0 and 100
+    """
+
+class MalformedProgramError(ServerError):
+    """
+    if the program sent by the client does not have the shape of a program, e.g. a block without a type
+    """
+
+class DryRunLimitError(ServerError):
     """
-    when the program is already running, but an attempt is made to run the program again even though it has not yet finished
+    if the dry run executes more blocks than allowed, e.g. because a while loop never breaks
     """
 
 class ErrorManager:
@@ -10,23 +10,15 @@ copyButtons.forEach(function (c) {
     });
 });
 
-function extractInteger(str) {
-    const match = str.match(/-?\d+/);
-    return match ? parseInt(match[0], 10) : null;
-}
-
 function copyButton(position) {
-    let X = document.getElementById("x-axis-label").innerHTML;
-    let Y = document.getElementById("y-axis-label").innerHTML;
-    let Z = document.getElementById("z-axis-label").innerHTML;
-
-    document.getElementById("pos" + position + "-x").value = extractInteger(X);
-    document.getElementById("pos" + position + "-y").value = extractInteger(Y);
-    document.getElementById("pos" + position + "-z").value = extractInteger(Z);
+    if (robotPosition === null) {
+        return;
+    }
 
-    localStorage.setItem("pos" + position + "-x", extractInteger(X));
-    localStorage.setItem("pos" + position + "-y", extractInteger(Y));
-    localStorage.setItem("pos" + position + "-z", extractInteger(Z));
+    for (const axis of ["x", "y", "z"]) {
+        document.getElementById("pos" + position + "-" + axis).value = robotPosition[axis];
+        localStorage.setItem("pos" + position + "-" + axis, robotPosition[axis]);
+    }
 }
 
 function loadPosition(position)
@@ -1,7 +1,38 @@
+// a press that is shorter than this is a click, a longer press moves the axis until the button is released
+const HOLD_DELAY = 250;
+// the server stops a held axis if it does not hear from the client within 500 ms
+const HOLD_REPEAT = 150;
+
 function setMoveButton(id, dir, axis) {
-    document.getElementById(id).onclick = function () {
-        send(() => moveJSON(dir, axis));
-    };
+    const button = document.getElementById(id);
+    let holdTimer = null;
+    let repeatTimer = null;
+
+    button.addEventListener("pointerdown", function (e) {
+        button.setPointerCapture(e.pointerId);
+        holdTimer = setTimeout(function () {
+            holdTimer = null;
+            socket.emit("jog_start", { axis: axis, direction: Math.sign(dir) });
+            repeatTimer = setInterval(() => socket.emit("jog_start", { axis: axis, direction: Math.sign(dir) }), HOLD_REPEAT);
+        }, HOLD_DELAY);
+    });
+
+    function release() {
+        if (holdTimer !== null) {
+            // released before the hold started: a click
+            clearTimeout(holdTimer);
+            holdTimer = null;
+            socket.emit("jog", { axis: axis, delta: dir });
+        } else if (repeatTimer !== null) {
+            clearInterval(repeatTimer);
+            repeatTimer = null;
+            socket.emit("jog_stop");
+        }
+    }
+
+    button.addEventListener("pointerup", release);
+    button.addEventListener("pointercancel", release);
+    window.addEventListener("blur", release);
 }
 
 setMoveButton("x-up", 100, "x");
@@ -10,13 +41,17 @@ setMoveButton("y-up", 100, "y");
 setMoveButton("y-down", -100, "y");
 setMoveButton("z-up", 100, "z");
 setMoveButton("z-down", -100, "z");
-setMoveButton("reset-manuel", 0, "r")
+
+// homing takes a while, so it is queued as a job like a program
+document.getElementById("reset-manuel").onclick = function () {
+    send(() => moveJSON(0, "r"));
+};
 
 function moveJSON(value, axis) {
     if (axis == "x" || axis == "y" || axis == "z") {
         return [
             {
-                "id": "block-steps-" + axis + "-1761750547079",
+                "id": "block-steps-1761750547079",
                 "type": "block-move",
                 "text": "Go  steps on the  axis " + axis,
                 "variables": [
@@ -35,17 +70,25 @@ function moveJSON(value, axis) {
     }
 }
 
-function send(getJSON) {
+// queues the program as a job on the server, manual control jobs run before the other programs
+function send(getJSON, priority = "manual") {
     const contents = getJSON();
     console.log(contents);
 
-    fetch('/',
+    return fetch('/jobs',
         {
             method: 'POST',
             headers:
             {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify(contents)
+            body: JSON.stringify({ program: contents, priority: priority })
+        })
+        .then(response => response.json())
+        .then(job => {
+            if (priority !== "manual") {
+                logMessage("Job " + job.id + " queued", "info");
+            }
+            return job;
         });
 }
\ No newline at end of file
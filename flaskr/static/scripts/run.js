@@ -157,12 +157,13 @@ function getWorkspaceContents() {
   return topLevelBlocks;
 }
 
-//send it to the server
+//checks the program with a dry run first and only sends it to the server if it stays within the limits;
+//a program that runs longer than the dry run checks (e.g. an endless while loop) can be started after a confirmation
 function run() {
   const contents = getWorkspaceContents();
   console.log(JSON.stringify(contents, null, 2));
 
-  fetch('/',
+  fetch('/dry-run',
     {
       method: 'POST',
       headers:
@@ -170,5 +171,57 @@ function run() {
         'Content-Type': 'application/json'
       },
       body: JSON.stringify(contents)
+    })
+    .then(response => response.json())
+    .then(result => {
+      if (result.error && result.error.error_code === "DryRunLimitError") {
+        logMessage("Dry run: " + result.error.error, "warn");
+        if (!confirm("The dry run stopped after " + result.executed_blocks + " blocks, so the program could only be"
+          + " checked up to there. It can still be cancelled while it runs. Start it anyway?")) {
+          logMessage("The program was not started", "warn");
+          return;
+        }
+      } else if (result.error) {
+        logMessage("Dry run failed, the program was not started:", "error");
+        logMessage("Message: " + (result.error.error ?? result.error), "error");
+        logMessage("Block ID: " + result.error.block_id, "error");
+        return;
+      } else {
+        logMessage("Dry run: " + result.moves + " moves, steps X: " + result.steps.X + ", Y: " + result.steps.Y
+          + ", Z: " + result.steps.Z + ", estimated time: " + result.estimated_time.toFixed(1) + " s", "info");
+      }
+      send(() => contents, "program").then(job => { currentJobId = job.id; });
+    });
+}
+
+// the job of the program that was started last
+let currentJobId = null;
+
+function controlJob(method, action) {
+  if (currentJobId === null) {
+    logMessage("No program was started", "warn");
+    return Promise.resolve(null);
+  }
+  return fetch('/jobs/' + currentJobId + action, { method: method })
+    .then(response => response.json())
+    .then(job => {
+      logMessage("Job " + job.id + ": " + job.status, "info");
+      return job;
     });
-}
\ No newline at end of file
+}
+
+function stop() {
+  controlJob('DELETE', '');
+}
+
+function pauseOrResume() {
+  const button = document.getElementById("pause");
+  const resume = button.dataset.paused === "true";
+
+  controlJob('POST', resume ? '/resume' : '/pause').then(job => {
+    if (job === null) return;
+    const paused = job.status === "paused";
+    button.dataset.paused = paused;
+    button.innerText = paused ? "▶︎ Resume" : "⏸ Pause";
+  });
+}
@@ -7,19 +7,34 @@ socket.on("execution_error", function (data) {
     logMessage("Error Code: " + data.error_code, "error");
 });
 
-// receives the sent data from the backend
-socket.on('update', function (msg) {
-    logMessage(msg.data, "debug")
+// the console output of the programs comes in numbered batches, after a (re)connect the server sends its last lines again
+let consoleStream = null;
+let consoleNext = 0;
+
+socket.on('console', function (batch) {
+    if (batch.stream !== consoleStream) {
+        // the server was restarted, its lines are numbered from 0 again
+        consoleStream = batch.stream;
+        consoleNext = 0;
+    }
+    batch.lines.forEach(function (line, i) {
+        if (batch.first + i >= consoleNext) {
+            logMessage(line, "debug");
+        }
+    });
+    consoleNext = Math.max(consoleNext, batch.first + batch.lines.length);
 });
 
-socket.on('coords', function (msg) {
-    let data = msg.data.split(",");
+// the last position of the robot, the position is sent at most 20 times per second, also while the robot moves
+let robotPosition = null;
 
-    let spanX = document.getElementById("x-axis-label");
-    let spanY = document.getElementById("y-axis-label");
-    let spanZ = document.getElementById("z-axis-label");
+socket.on('coords', function (msg) {
+    robotPosition = { x: msg.x, y: msg.y, z: msg.z };
+    document.getElementById("x-axis-label").textContent = "X: " + msg.x;
+    document.getElementById("y-axis-label").textContent = "Y: " + msg.y;
+    document.getElementById("z-axis-label").textContent = "Z: " + msg.z;
+});
 
-    spanX.innerHTML = data[0];
-    spanY.innerHTML = data[1];
-    spanZ.innerHTML = data[2];
-});
\ No newline at end of file
+socket.on("jog_busy", function (msg) {
+    logMessage(msg.data, "warn");
+});
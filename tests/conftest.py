@@ -0,0 +1,35 @@
+"""Helpers of the tests, they run the programs headless on a virtual robot"""
+import pytest
+
+from flaskr.compiler.blocks.block import walk_blocks
+from flaskr.compiler.context import Context
+from flaskr.compiler.dry_run import ConsoleRecorder
+from flaskr.compiler.interpreter import Interpreter
+from flaskr.compiler.loader import Loader
+from flaskr.execution_control import ExecutionControl
+from flaskr.robot_movement.virtual_robot import VirtualRobot
+from benchmarks.programs import ProgramBuilder
+
+
+def execute(loader: Loader, robot: VirtualRobot = None, control: ExecutionControl = None) -> list[str]:
+    """
+    compiles and executes a loaded program like the app does, but on a virtual robot
+    args:
+        loader (Loader): the loaded program
+        robot (VirtualRobot): the robot that is moved, a new one at 0, 0, 0 if none is given
+        control (ExecutionControl): the control of the execution
+    returns:
+        list[str]: the lines the program printed to the console
+    """
+    console: ConsoleRecorder = ConsoleRecorder()
+    context: Context = Context(loader.variables, robot or VirtualRobot(), None, console, control)
+    for block in walk_blocks(loader.blocks):
+        block.compile(context)
+    Interpreter(loader.blocks, context).run()
+    context.flush_moves()
+    return console.lines
+
+
+@pytest.fixture
+def builder() -> ProgramBuilder:
+    return ProgramBuilder()
@@ -0,0 +1,37 @@
+"""Tests of the dry run, which checks a program on a virtual robot before it is started"""
+import time
+
+from flaskr.compiler.dry_run import DryRun
+from flaskr.compiler.loader import Loader
+from flaskr.robot_movement.virtual_robot import VirtualRobot
+from benchmarks.programs import ProgramBuilder
+
+
+def test_limit_violation_points_at_the_block(builder: ProgramBuilder) -> None:
+    move: dict = builder.move("x", builder.literal(1))
+    result: dict = DryRun(Loader([move]), VirtualRobot()).run()
+
+    assert result["error"]["error_code"] == "RobotPositionError"
+    assert result["error"]["block_id"] == move["id"]
+
+
+def test_endless_loop_stops_at_the_block_limit(builder: ProgramBuilder) -> None:
+    program: list[dict] = [builder.while_loop([builder.wait(builder.literal(1))])]
+    result: dict = DryRun(Loader(program), VirtualRobot(), max_blocks=1000).run()
+
+    assert result["error"]["error_code"] == "DryRunLimitError"
+
+
+def test_many_moves_are_simulated_quickly(builder: ProgramBuilder) -> None:
+    # 20000 moves, the dry run used to build the acceleration ramp of every move and needed seconds for them
+    moves: list[dict] = [builder.move("x", builder.literal(-1)), builder.move("x", builder.literal(1))]
+    program: list[dict] = [
+        builder.reset(),
+        builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(10000), moves),
+    ]
+    start: float = time.perf_counter()
+    result: dict = DryRun(Loader(program), VirtualRobot()).run()
+
+    assert result["error"] is None
+    assert result["moves"] == 20001
+    assert time.perf_counter() - start < 2
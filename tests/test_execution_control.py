@@ -0,0 +1,84 @@
+"""Tests of cancelling, pausing and resuming a running program"""
+import threading
+
+from flaskr.compiler.loader import Loader
+from flaskr.execution_control import ExecutionControl
+from flaskr.server_error import ExecutionCancelledError
+from benchmarks.programs import ProgramBuilder
+from tests.conftest import execute
+
+TIMEOUT: float = 2.0
+
+
+class ProgramThread(threading.Thread):
+    """executes a program in the background like the job queue does, the result or the error is kept"""
+
+    def __init__(self, program: list[dict], control: ExecutionControl) -> None:
+        super().__init__(daemon=True)
+        self.__loader: Loader = Loader(program)
+        self.__control: ExecutionControl = control
+        self.lines: list[str] = None
+        self.error: Exception = None
+
+    def run(self) -> None:
+        try:
+            self.lines = execute(self.__loader, control=self.__control)
+        except Exception as e:
+            self.error = e
+
+
+def test_cancel_stops_endless_loop(builder: ProgramBuilder) -> None:
+    control: ExecutionControl = ExecutionControl()
+    thread: ProgramThread = ProgramThread([builder.while_loop([builder.move("x", builder.literal(-1))])], control)
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    control.cancel()
+    thread.join(TIMEOUT)
+
+    assert not thread.is_alive()
+    assert isinstance(thread.error, ExecutionCancelledError)
+
+
+def test_cancel_ends_wait_at_once(builder: ProgramBuilder) -> None:
+    control: ExecutionControl = ExecutionControl()
+    thread: ProgramThread = ProgramThread([builder.wait(builder.literal(60))], control)
+    thread.start()
+    thread.join(0.05)
+
+    control.cancel()
+    thread.join(TIMEOUT)
+
+    assert not thread.is_alive()
+    assert isinstance(thread.error, ExecutionCancelledError)
+
+
+def test_paused_program_continues_after_resume(builder: ProgramBuilder) -> None:
+    control: ExecutionControl = ExecutionControl()
+    control.pause()
+    program: list[dict] = [
+        builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(3), [
+            builder.debug([builder.variable("i")]),
+        ])
+    ]
+    thread: ProgramThread = ProgramThread(program, control)
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    control.resume()
+    thread.join(TIMEOUT)
+
+    assert not thread.is_alive()
+    assert thread.error is None
+    assert thread.lines == ["[DEBUG] 0", "[DEBUG] 1", "[DEBUG] 2"]
+
+
+def test_cancel_ends_paused_program() -> None:
+    control: ExecutionControl = ExecutionControl()
+    control.pause()
+    control.cancel()
+
+    assert control.interrupted
+    assert not control.wait_while_paused()
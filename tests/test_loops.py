@@ -0,0 +1,80 @@
+"""Tests of the loops, the break and the repeated execution of a loaded program"""
+import pytest
+
+from flaskr.compiler.dry_run import DryRun
+from flaskr.compiler.loader import Loader
+from flaskr.compiler.program_cache import ProgramCache
+from flaskr.robot_movement.virtual_robot import VirtualRobot
+from flaskr.server_error import BreakOutsideLoopError
+from benchmarks.programs import ProgramBuilder
+from tests.conftest import execute
+
+
+def nested_break_program(builder: ProgramBuilder) -> list[dict]:
+    """an inner loop that breaks at j == 2, the outer loop prints i after it"""
+    return [
+        builder.for_loop(builder.variable("i"), builder.literal(0), builder.literal(3), [
+            builder.for_loop(builder.variable("j"), builder.literal(0), builder.literal(5), [
+                builder.condition(builder.variable("j"), "==", builder.literal(2), [builder.breaks()]),
+                builder.move("x", builder.literal(-1)),
+                builder.debug([builder.variable("i"), builder.variable("j")]),
+            ]),
+            builder.debug([builder.variable("i")]),
+        ])
+    ]
+
+
+def test_inner_break_keeps_outer_loop_running(builder: ProgramBuilder) -> None:
+    robot: VirtualRobot = VirtualRobot()
+    lines: list[str] = execute(Loader(nested_break_program(builder)), robot)
+
+    assert lines == [
+        "[DEBUG] 0 | 0", "[DEBUG] 0 | 1", "[DEBUG] 0",
+        "[DEBUG] 1 | 0", "[DEBUG] 1 | 1", "[DEBUG] 1",
+        "[DEBUG] 2 | 0", "[DEBUG] 2 | 1", "[DEBUG] 2",
+    ]
+    assert robot.x == -6
+
+
+def test_break_ends_while_loop(builder: ProgramBuilder) -> None:
+    program: list[dict] = [
+        builder.while_loop([
+            builder.calculation(builder.variable("n"), builder.variable("n"), "{", builder.literal(1)),
+            builder.condition(builder.variable("n"), ">=", builder.literal(4), [builder.breaks()]),
+        ]),
+        builder.debug([builder.variable("n")]),
+    ]
+
+    assert execute(Loader(program)) == ["[DEBUG] 4"]
+
+
+def test_reset_program_runs_again_with_the_same_output(builder: ProgramBuilder) -> None:
+    loader: Loader = Loader(nested_break_program(builder))
+    first: list[str] = execute(loader)
+    loader.reset()
+
+    assert execute(loader) == first
+
+
+def test_cached_program_runs_again_with_the_same_result(builder: ProgramBuilder) -> None:
+    program: list[dict] = nested_break_program(builder)
+    cache: ProgramCache = ProgramCache()
+
+    key, loader = cache.checkout(program)
+    first: dict = DryRun(loader, VirtualRobot()).run()
+    cache.checkin(key, loader)
+    key, cached = cache.checkout(program)
+    second: dict = DryRun(cached, VirtualRobot()).run()
+
+    assert cached is loader
+    assert first["error"] is None
+    assert second == first
+
+
+def test_break_outside_loop_is_rejected(builder: ProgramBuilder) -> None:
+    program: list[dict] = [
+        builder.condition(builder.literal(1), "==", builder.literal(1), [builder.breaks()]),
+    ]
+
+    with pytest.raises(BreakOutsideLoopError):
+        Loader(program)
@@ -0,0 +1,46 @@
+"""Tests of the merging of consecutive moves in the motion planner"""
+from flaskr.robot_movement.motion_planner import MotionPlanner
+from flaskr.robot_movement.virtual_robot import VirtualRobot
+
+
+class RecordingRobot(VirtualRobot):
+    """a virtual robot that keeps every move it was asked to drive"""
+
+    def __init__(self) -> None:
+        super().__init__(-1000, -1000, -1000)
+        self.driven: list[dict[str, int]] = []
+
+    def move_axes(self, deltas: dict[str, int], speed: float = 100) -> None:
+        self.driven.append(dict(deltas))
+        super().move_axes(deltas, speed)
+
+
+def drive(moves: list[tuple[str, int]], merge_axes: bool = False) -> list[dict[str, int]]:
+    robot: RecordingRobot = RecordingRobot()
+    planner: MotionPlanner = MotionPlanner(robot, merge_axes)
+    for axis, value in moves:
+        planner.move_on_axis(axis, value)
+    planner.flush()
+    return robot.driven
+
+
+def test_moves_on_the_same_axis_and_direction_add_up() -> None:
+    assert drive([("X", -10), ("X", -20), ("x", -5)]) == [{"X": -35}]
+
+
+def test_moves_on_different_axes_keep_their_order() -> None:
+    assert drive([("Z", 100), ("X", -10), ("Y", -10)]) == [{"Z": 100}, {"X": -10}, {"Y": -10}]
+
+
+def test_move_back_is_driven() -> None:
+    assert drive([("Z", -100), ("Z", 100)]) == [{"Z": -100}, {"Z": 100}]
+
+
+def test_merge_axes_merges_x_and_y_but_not_z() -> None:
+    moves: list[tuple[str, int]] = [("Z", 100), ("X", -10), ("Y", -20), ("Y", 15), ("Z", -100), ("Z", 100)]
+
+    assert drive(moves, merge_axes=True) == [{"Z": 100}, {"X": -10, "Y": -5}, {"Z": -100}, {"Z": 100}]
+
+
+def test_merge_axes_drops_x_and_y_moves_that_cancel_out() -> None:
+    assert drive([("X", -10), ("X", 10)], merge_axes=True) == []
@@ -0,0 +1,109 @@
+"""Tests of the position journal, the positions have to survive a restart and a power cut while a record is written"""
+import json
+import zlib
+from pathlib import Path
+
+import pytest
+
+from flaskr.robot_movement.positions_manager import CHECKSUM, RECORD, RECORD_SIZE, PositionManager
+
+
+@pytest.fixture
+def position_file(tmp_path: Path) -> Path:
+    return tmp_path / "position.json"
+
+
+def record(sequence: int, x: int, y: int, z: int) -> bytes:
+    fields: bytes = RECORD.pack(sequence, x, y, z)
+    return fields + CHECKSUM.pack(zlib.crc32(fields))
+
+
+def save(manager: PositionManager, x: int, y: int, z: int) -> None:
+    manager.x, manager.y, manager.z = x, y, z
+    manager.save()
+
+
+def positions(manager: PositionManager) -> tuple[int, int, int]:
+    return manager.x, manager.y, manager.z
+
+
+def test_torn_last_record_is_dropped(position_file: Path) -> None:
+    manager: PositionManager = PositionManager(str(position_file))
+    save(manager, 1, 2, 3)
+    save(manager, 4, 5, 6)
+    manager.close()
+    journal: Path = position_file.with_suffix(".journal")
+    # the power was cut while the third record was written
+    with open(journal, "ab") as f:
+        f.write(record(3, 7, 8, 9)[:RECORD_SIZE // 2])
+
+    restarted: PositionManager = PositionManager(str(position_file))
+    restarted.close()
+
+    assert positions(restarted) == (4, 5, 6)
+    assert journal.stat().st_size == 2 * RECORD_SIZE
+
+
+def test_last_record_with_bad_checksum_is_dropped(position_file: Path) -> None:
+    manager: PositionManager = PositionManager(str(position_file))
+    save(manager, 1, 2, 3)
+    save(manager, 4, 5, 6)
+    manager.close()
+    journal: Path = position_file.with_suffix(".journal")
+    content: bytearray = bytearray(journal.read_bytes())
+    content[-RECORD_SIZE] ^= 0xFF
+    journal.write_bytes(bytes(content))
+
+    restarted: PositionManager = PositionManager(str(position_file))
+    restarted.close()
+
+    assert positions(restarted) == (1, 2, 3)
+    assert journal.stat().st_size == RECORD_SIZE
+
+
+def test_records_older_than_the_file_are_ignored(position_file: Path) -> None:
+    # a crash after the file was replaced, but before the journal was emptied
+    position_file.write_text(json.dumps({"X": 10, "Y": 20, "Z": 30, "sequence": 5}), encoding="utf-8")
+    position_file.with_suffix(".journal").write_bytes(record(4, 1, 2, 3) + record(5, 4, 5, 6))
+
+    manager: PositionManager = PositionManager(str(position_file))
+    manager.close()
+
+    assert positions(manager) == (10, 20, 30)
+
+
+def test_file_without_sequence_is_loaded(position_file: Path) -> None:
+    # a file written before the journal existed
+    position_file.write_text(json.dumps({"X": 10, "Y": 20, "Z": 30}), encoding="utf-8")
+
+    manager: PositionManager = PositionManager(str(position_file))
+    assert positions(manager) == (10, 20, 30)
+    save(manager, 11, 21, 31)
+    manager.close()
+
+    restarted: PositionManager = PositionManager(str(position_file))
+    restarted.close()
+
+    assert positions(restarted) == (11, 21, 31)
+
+
+def test_restart_after_compaction(position_file: Path) -> None:
+    manager: PositionManager = PositionManager(str(position_file), compact_after=2)
+    save(manager, 1, 2, 3)
+    save(manager, 4, 5, 6)
+    manager.close()
+    journal: Path = position_file.with_suffix(".journal")
+
+    assert json.loads(position_file.read_text(encoding="utf-8")) == {"X": 4, "Y": 5, "Z": 6, "sequence": 2}
+    assert journal.stat().st_size == 0
+
+    restarted: PositionManager = PositionManager(str(position_file), compact_after=2)
+    assert positions(restarted) == (4, 5, 6)
+    # the sequence goes on from the file, so the new record is newer than it
+    save(restarted, 7, 8, 9)
+    restarted.close()
+
+    again: PositionManager = PositionManager(str(position_file), compact_after=2)
+    again.close()
+
+    assert positions(again) == (7, 8, 9)
@@ -0,0 +1,84 @@
+"""Tests of the pulse timing of the backends and of the motor controller on the GPIO emulator"""
+import contextlib
+import io
+
+import pytest
+
+from flaskr.execution_control import ExecutionControl
+from flaskr.robot_movement.gpio_emulator import GpioEmulator
+from flaskr.robot_movement.motion_profile import plan_move
+from flaskr.robot_movement.motor_controller import MotorController
+from flaskr.robot_movement.pulse_backend import PulseBackend, PulseTrain, RecordingBackend
+
+PIN: int = 16
+DELAY: float = 0.0002
+PERIODS: int = 200
+# the busy-wait keeps the deadlines, but a busy test machine may preempt it, so the medians are compared
+# and the tolerance is generous
+TOLERANCE: float = 0.25
+
+
+def constant_train(periods: int = PERIODS, delay: float = DELAY) -> PulseTrain:
+    train: PulseTrain = PulseTrain([(PIN,)])
+    for _ in range(periods):
+        train.append(delay, 0)
+    return train
+
+
+def test_play_puts_out_every_pulse_at_its_rate() -> None:
+    backend: RecordingBackend = RecordingBackend()
+    backend.setup_output(PIN)
+
+    assert backend.play(constant_train()) == PERIODS
+
+    timing: dict = backend.timing(PIN)
+    assert timing["pulses"] == PERIODS
+    assert timing["period_p50"] == pytest.approx(2 * DELAY, rel=TOLERANCE)
+    assert timing["width_p50"] == pytest.approx(DELAY, rel=TOLERANCE)
+    assert backend.progress[0] == PERIODS
+
+
+def test_play_stops_when_interrupted() -> None:
+    backend: RecordingBackend = RecordingBackend()
+    control: ExecutionControl = ExecutionControl()
+    control.cancel()
+
+    assert backend.play(constant_train(), control) == 0
+    assert backend.rising_edges(PIN) == []
+
+
+def test_move_drives_the_planned_steps_in_the_planned_time() -> None:
+    emulator: GpioEmulator = GpioEmulator({"X": 10000, "Y": 10000, "Z": 10000})
+    controller: MotorController = MotorController(emulator)
+    moves: dict[str, int] = {"X": 2000, "Z": 1000}
+
+    driven: dict[str, int] = controller.move_axes({axis: (steps, MotorController.DIR_BACK) for axis, steps in moves.items()})
+
+    assert driven == moves
+    assert emulator.distances == {"X": 12000, "Y": 10000, "Z": 11000}
+    rising: list[float] = emulator.rising_edges(MotorController.MOTORS["X"]["PUL"])
+    periods, profile = plan_move(moves)
+    assert rising[-1] - rising[0] == pytest.approx(profile.duration(periods), rel=TOLERANCE)
+
+
+def test_homing_stops_at_the_endstop_and_drives_home() -> None:
+    emulator: GpioEmulator = GpioEmulator({"X": 3000})
+    controller: MotorController = MotorController(emulator)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert controller.drive_all_to_endstops(["X"])
+
+    assert emulator.distances["X"] == MotorController.HOME_POSITION["X"]
+    assert controller.positions["X"] == -MotorController.HOME_POSITION["X"]
+
+
+def test_incomplete_backend_can_not_be_created() -> None:
+    class OutputOnlyBackend(PulseBackend):
+        def setup_output(self, pin: int) -> None:
+            pass
+
+        def output(self, pin: int, level: int) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        OutputOnlyBackend()
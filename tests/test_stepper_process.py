@@ -0,0 +1,32 @@
+"""Tests of the stepper process, the motors are driven by a recording backend in the child process"""
+import pytest
+
+from flaskr.robot_movement.motor_controller import MotorController
+from flaskr.robot_movement.pulse_backend import RecordingBackend
+from flaskr.robot_movement.stepper_process import StepperProcess
+from flaskr.server_error import StepperProcessError
+
+
+class BrokenBackend(RecordingBackend):
+    """a backend whose pins can not be opened, like RPi.GPIO on a machine that is no Raspberry Pi"""
+
+    def setup_output(self, pin: int) -> None:
+        raise RuntimeError("no GPIO pins")
+
+
+def test_move_is_driven_in_the_stepper_process() -> None:
+    stepper: StepperProcess = StepperProcess(RecordingBackend, realtime_priority=None)
+    try:
+        assert stepper.move_axes({"X": (100, MotorController.DIR_BACK)}) == {"X": 100}
+        assert stepper.positions["X"] == -100
+    finally:
+        stepper.cleanup()
+
+
+def test_stopped_stepper_process_fails_the_move() -> None:
+    stepper: StepperProcess = StepperProcess(BrokenBackend, realtime_priority=None)
+
+    with pytest.raises(StepperProcessError):
+        stepper.move_axes({"X": (100, MotorController.DIR_BACK)})
+    with pytest.raises(StepperProcessError):
+        stepper.move_axes({"X": (100, MotorController.DIR_BACK)})
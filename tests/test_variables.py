@@ -0,0 +1,26 @@
+"""Tests of the parsing of the values of the variables"""
+import pytest
+
+from flaskr.compiler.blocks.variables import Variable
+from flaskr.compiler.loader import Loader
+from flaskr.server_error import FalseTypeError
+from benchmarks.programs import ProgramBuilder
+
+
+@pytest.mark.parametrize("raw, parsed", [("12", 12), ("-3", -3), ("2.5", 2.5), ("1e3", 1000.0), (None, None)])
+def test_numbers_are_parsed(raw: str, parsed: int | float | None) -> None:
+    assert Variable.parse(raw) == parsed
+    assert type(Variable.parse(raw)) is type(parsed)
+
+
+@pytest.mark.parametrize("raw", ["inf", "-Infinity", "nan", "1_000", "1_0.5", "abc", ""])
+def test_other_values_stay_strings(raw: str) -> None:
+    assert Variable.parse(raw) == raw
+
+
+@pytest.mark.parametrize("raw", ["inf", "nan", "1_000"])
+def test_move_by_non_finite_value_is_a_type_error(builder: ProgramBuilder, raw: str) -> None:
+    program: list[dict] = [builder.move("x", builder.variable("steps", raw))]
+
+    with pytest.raises(FalseTypeError):
+        Loader(program)
@@ -0,0 +1,61 @@
+"""Tests of the planning of the visit order and of the visit block that drives the stops in that order"""
+import random
+
+import pytest
+
+from flaskr.compiler.loader import Loader
+from flaskr.robot_movement.visit_order import move_time, nearest_neighbour, path_time, plan_visit_order, two_opt
+from benchmarks.programs import ProgramBuilder
+from tests.conftest import execute
+
+START: tuple[int, int, int] = (0, 0, 0)
+
+
+def random_positions(count: int, seed: int) -> list[tuple[int, int, int]]:
+    generator: random.Random = random.Random(seed)
+    return [
+        (generator.randint(-40000, 0), generator.randint(-40000, 0), generator.randint(-20000, 0)) for _ in range(count)
+    ]
+
+
+def costs_of(points: list[tuple[int, int, int]]) -> list[list[float]]:
+    return [[move_time(a, b) for b in points] for a in points]
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5, 60])
+def test_order_is_a_permutation_of_all_positions(count: int) -> None:
+    order: list[int] = plan_visit_order(START, random_positions(count, count))
+
+    assert sorted(order) == list(range(count))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_two_opt_keeps_the_start_and_is_not_longer_than_the_seed(seed: int) -> None:
+    points: list[tuple[int, int, int]] = [START] + random_positions(40, seed)
+    costs: list[list[float]] = costs_of(points)
+    seed_path: list[int] = nearest_neighbour(costs)
+    path: list[int] = list(seed_path)
+    two_opt(path, costs)
+
+    assert path[0] == 0
+    assert sorted(path) == list(range(len(points)))
+    # path_time counts from the start, the indices of the positions are the nodes minus one
+    positions: list[tuple[int, int, int]] = points[1:]
+    assert path_time(START, positions, [node - 1 for node in path]) <= (
+        path_time(START, positions, [node - 1 for node in seed_path]) + 1e-9
+    )
+
+
+def test_visit_runs_the_leading_blocks_and_then_the_stops_in_the_planned_order(builder: ProgramBuilder) -> None:
+    def stop(x: int) -> list[dict]:
+        # a stop is its Goto position block with the blocks behind it
+        return [
+            builder.go_to(f"p{-x}", builder.literal(x), builder.literal(0), builder.literal(0)),
+            builder.debug([builder.variable("X", None)]),
+        ]
+
+    # the leading blocks move the robot before the order is planned, so it is planned from -400
+    leading: list[dict] = [builder.move("x", builder.literal(-400)), builder.debug([builder.variable("X", None)])]
+    program: list[dict] = [builder.visit(leading + stop(-100) + stop(-300) + stop(-200))]
+
+    assert execute(Loader(program)) == ["[DEBUG] -400", "[DEBUG] -300", "[DEBUG] -200", "[DEBUG] -100"]